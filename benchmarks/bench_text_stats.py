@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Benchmark: vectorized text statistics vs. the dashboard's original approach
+
+Compares ``.str.len()`` + ``.str.split().str.len()`` with
+``chatbot_eda.text_stats.compute_text_stats`` (same two counts, then all
+four counts on one thread and on a thread pool) for every text column.
+Results must match exactly; peak memory is measured with tracemalloc.
+
+    python benchmarks/bench_text_stats.py [path/to/ai-medical-chatbot.csv]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot_eda.data_cache import DATA_FILE, dataset_info, load_dataset  # noqa: E402
+from chatbot_eda.text_stats import FIELDS, compute_text_stats  # noqa: E402
+
+
+def split_counts(texts):
+    """The original per-page computation"""
+    text_data = texts.fillna('').astype(str)
+    return text_data.str.len(), text_data.str.split().str.len()
+
+
+def measure(func, *args, repeat=3, **kwargs):
+    """Best wall time over ``repeat`` runs and peak traced memory of one run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak / 1024**2, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', nargs='?', default=DATA_FILE)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"  Text statistics benchmark: {args.path}")
+    print("=" * 78)
+    print(f"{'Column':<14}{'Method':<26}{'Best (s)':>10}{'Peak MB':>10}{'Speedup':>10}")
+    print("-" * 78)
+
+    for column in dataset_info(args.path)['text_columns']:
+        texts = load_dataset(args.path, columns=[column])[column]
+        base_time, base_mem, (chars, words) = measure(split_counts, texts, repeat=args.repeat)
+        print(f"{column:<14}{'str.split().str.len()':<26}{base_time:>10.3f}{base_mem:>10.1f}{'1.0x':>10}")
+
+        runs = (
+            ('chars+words, 1 thread', 1, ('chars', 'words')),
+            ('all 4 counts, 1 thread', 1, FIELDS),
+            ('all 4 counts, threads', None, FIELDS),
+        )
+        for label, workers, fields in runs:
+            elapsed, peak, stats = measure(compute_text_stats, texts, workers=workers,
+                                           fields=fields, repeat=args.repeat)
+            assert np.array_equal(stats.chars, chars.to_numpy()), "character counts differ"
+            assert np.array_equal(stats.words, words.to_numpy()), "word counts differ"
+            print(f"{'':<14}{label:<26}{elapsed:>10.3f}{peak:>10.1f}{base_time / elapsed:>9.1f}x")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
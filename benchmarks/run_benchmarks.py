@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+"""
+Benchmark suite: every dashboard page's computation on synthetic corpora
+
+For each scale (multiples of the real export, see ``synthetic.py``) the
+corpus is generated once, then each page's computation runs in a fresh
+process so its timing is cold and its peak memory is its own:
+
+    load        CSV -> columnar cache, then a full read
+    quality     row-level duplicate count and MinHash/LSH near-duplicates
+    stats       streaming profile (moments, length histograms) and numeric summary
+    domain      category tallies of the text columns
+    terms       medical term extraction and co-occurrence over every text column
+    boilerplate rolling-hash shingle templates of the answer column
+    nlp         text statistics and n-gram keyword frequencies
+    findings    full snapshot build and readiness score
+
+Every run appends one JSON line per benchmark to ``--results`` with the
+git commit, so results from earlier commits stay comparable; ``--compare``
+prints the change against the latest run of another commit on the same
+machine. Runs fully offline.
+
+    python benchmarks/run_benchmarks.py --scales 1 10 --compare
+    python benchmarks/run_benchmarks.py --rows 20000 --only load nlp
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chatbot_eda.boilerplate import detect_boilerplate  # noqa: E402
+from chatbot_eda.data_cache import build_cache, dataset_info, ensure_cache, load_dataset  # noqa: E402
+from chatbot_eda.duplicates import count_duplicates, detect_duplicates, row_hashes  # noqa: E402
+from chatbot_eda.keywords import FALLBACK_STOPWORDS, keyword_frequencies  # noqa: E402
+from chatbot_eda.medical_terms import extract_terms  # noqa: E402
+from chatbot_eda.profiler import stream_profile  # noqa: E402
+from chatbot_eda.report import peak_rss_mb, readiness  # noqa: E402
+from chatbot_eda.snapshot import build_snapshot, profile_numeric_stats, snapshot_from_profile  # noqa: E402
+from chatbot_eda.text_stats import compute_text_stats  # noqa: E402
+from synthetic import corpus_path, generate_corpus  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+RESULTS_FILE = os.path.join(BENCH_DIR, 'results.jsonl')
+REGRESSION_THRESHOLD = 0.25
+
+
+# ============================================================================
+# PAGE COMPUTATIONS
+# ============================================================================
+# Each takes (csv path, warm cache dir, scratch dir) and returns a small
+# summary, so a run can be sanity-checked against earlier ones.
+
+def bench_load(path, cache_dir, scratch):
+    cold_cache = os.path.join(scratch, 'cache')
+    build_cache(path, cold_cache)
+    return {'rows': len(load_dataset(path, cache_dir=cold_cache))}
+
+
+def bench_quality(path, cache_dir, scratch):
+    frame = load_dataset(path, cache_dir=cache_dir)
+    duplicates = count_duplicates(row_hashes(frame))
+    column = dataset_info(path, cache_dir)['text_columns'][-1]
+    report = detect_duplicates(frame[column])
+    return {'duplicate_rows': duplicates, 'near_clusters': len(report.near)}
+
+
+def bench_stats(path, cache_dir, scratch):
+    profile = stream_profile(path)
+    profile_numeric_stats(profile)
+    return {'rows': profile.rows}
+
+
+def bench_domain(path, cache_dir, scratch):
+    text_columns = dataset_info(path, cache_dir)['text_columns']
+    profile = stream_profile(path, usecols=text_columns)
+    categories = snapshot_from_profile(profile, 'bench', 0, [], {}).categories
+    return {'tallied_columns': sum(not c['approximate'] for c in categories.values())}
+
+
+def bench_terms(path, cache_dir, scratch):
+    terms = extract_terms(path, cache_dir=cache_dir)
+    return {'matched_rows': terms.matched_rows, 'terms': len(terms.terms)}
+
+
+def bench_boilerplate(path, cache_dir, scratch):
+    boilerplate = detect_boilerplate(path, cache_dir=cache_dir)
+    return {'templates': len(boilerplate.templates), 'boilerplate_rows': boilerplate.boilerplate_rows}
+
+
+def bench_nlp(path, cache_dir, scratch):
+    words = 0
+    for column in dataset_info(path, cache_dir)['text_columns']:
+        texts = load_dataset(path, columns=[column], cache_dir=cache_dir)[column]
+        words += int(compute_text_stats(texts).words.sum())
+        # Fixed stopword list: no NLTK download, identical results everywhere
+        keyword_frequencies(path, column, cache_dir=cache_dir, stopwords=FALLBACK_STOPWORDS)
+    return {'words': words}
+
+
+def bench_findings(path, cache_dir, scratch):
+    snapshot = build_snapshot(path, cache_dir)
+    return {'overall': round(readiness(snapshot)['overall'], 3)}
+
+
+BENCHMARKS = {
+    'load': bench_load,
+    'quality': bench_quality,
+    'stats': bench_stats,
+    'domain': bench_domain,
+    'terms': bench_terms,
+    'boilerplate': bench_boilerplate,
+    'nlp': bench_nlp,
+    'findings': bench_findings,
+}
+
+
+def _measure(name, path, cache_dir):
+    """Child process: wall time and peak RSS of one benchmark"""
+    baseline = peak_rss_mb()
+    scratch = tempfile.mkdtemp(prefix=f'bench-{name}-')
+    try:
+        start = time.perf_counter()
+        summary = BENCHMARKS[name](path, cache_dir, scratch)
+        seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    peak = peak_rss_mb()
+    return {'seconds': round(seconds, 3), 'peak_rss_mb': peak,
+            'rss_growth_mb': round(peak - baseline, 1) if peak is not None else None,
+            'summary': summary}
+
+
+def run_isolated(name, path, cache_dir):
+    # A fresh interpreter per benchmark: cold imports and caches, separate peak RSS
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_measure, name, path, cache_dir).result()
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def git_revision():
+    """(short commit hash, dirty flag) of the working tree, or (None, None) outside git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BENCH_DIR,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def machine_info():
+    return {'host': platform.node(), 'python': platform.python_version(),
+            'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+
+def load_results(results_file):
+    if not os.path.exists(results_file):
+        return []
+    with open(results_file, encoding='utf-8') as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def append_results(records, results_file):
+    with open(results_file, 'a', encoding='utf-8') as fh:
+        for record in records:
+            fh.write(json.dumps(record) + '\n')
+
+
+def previous_run(history, record):
+    """Latest earlier result of the same benchmark and corpus, from another commit on this machine"""
+    matches = [
+        old for old in history
+        if old['benchmark'] == record['benchmark'] and old['rows'] == record['rows']
+        and old['machine']['host'] == record['machine']['host'] and old['commit'] != record['commit']
+    ]
+    return matches[-1] if matches else None
+
+
+def compare(history, records, threshold):
+    """Print the change against the previous commit; returns the regressed records"""
+    regressions = []
+    print(f"{'Benchmark':<12}{'Rows':>12}{'Before (s)':>12}{'After (s)':>12}{'Change':>10}  Baseline")
+    print("-" * 78)
+    for record in records:
+        old = previous_run(history, record)
+        if old is None:
+            print(f"{record['benchmark']:<12}{record['rows']:>12,}{'-':>12}{record['seconds']:>12.2f}{'-':>10}  none")
+            continue
+        change = record['seconds'] / old['seconds'] - 1 if old['seconds'] else 0.0
+        flag = "  ⚠️ REGRESSION" if change > threshold else ""
+        print(f"{record['benchmark']:<12}{record['rows']:>12,}{old['seconds']:>12.2f}{record['seconds']:>12.2f}"
+              f"{change:>+10.0%}  {old['commit']}{flag}")
+        if change > threshold:
+            regressions.append(record)
+    return regressions
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=[1.0],
+                        help="corpus sizes as multiples of the real export (e.g. 1 10 100)")
+    parser.add_argument('--rows', type=int, default=None, help="exact corpus row count (overrides --scales)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--results', default=RESULTS_FILE)
+    parser.add_argument('--no-save', action='store_true', help="do not append to the results file")
+    parser.add_argument('--compare', action='store_true', help="compare with the previous commit's results")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="slowdown ratio reported as a regression (default 0.25)")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    commit, dirty = git_revision()
+    machine = machine_info()
+    names = args.only or list(BENCHMARKS)
+    sizes = [(None, args.rows)] if args.rows is not None else [(scale, None) for scale in args.scales]
+    history = load_results(args.results)
+    records = []
+
+    print("=" * 78)
+    print(f"  Benchmarks @ {commit or 'unknown commit'}{' (dirty)' if dirty else ''} on {machine['host']}")
+    print("=" * 78)
+    print(f"{'Benchmark':<12}{'Corpus':<30}{'Time (s)':>10}{'Peak MB':>10}{'Growth MB':>12}")
+    print("-" * 78)
+
+    for scale, rows in sizes:
+        path = corpus_path(args.data_dir, scale or 1.0, args.seed, rows)
+        if not path.exists():
+            print(f"Generating {path.name}...")
+            generate_corpus(path, scale or 1.0, args.seed, rows)
+        cache_dir = os.path.join(args.data_dir, '.eda_cache')
+        ensure_cache(str(path), cache_dir)
+        num_rows = dataset_info(str(path), cache_dir)['num_rows']
+
+        for name in names:
+            result = run_isolated(name, str(path), cache_dir)
+            print(f"{name:<12}{path.name:<30}{result['seconds']:>10.2f}"
+                  f"{result['peak_rss_mb'] or 0:>10.0f}{result['rss_growth_mb'] or 0:>12.0f}")
+            records.append({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'commit': commit, 'dirty': dirty, 'machine': machine,
+                'benchmark': name, 'corpus': path.name, 'scale': scale, 'rows': num_rows,
+                'seed': args.seed, **result,
+            })
+
+    print("=" * 78)
+    if not args.no_save:
+        append_results(records, args.results)
+        print(f"Results appended to {args.results}")
+
+    if args.compare or args.fail_on_regression:
+        print()
+        regressions = compare(history, records, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
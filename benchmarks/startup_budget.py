@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Startup and rerun budget for the Streamlit dashboard
+
+Drives ``streamlit_dashboard.py`` headlessly with Streamlit's AppTest and
+fails (exit status 1) when a budget is exceeded:
+
+    static   each static page cold-started in a fresh interpreter, in a
+             directory without the dataset: it must render without errors,
+             within --startup-budget, and without importing the dataset
+             layer or the charting stack (HEAVY_MODULES)
+    rerun    every page on a synthetic corpus: after a first run that warms
+             the caches, the median of --reruns reruns must stay within
+             --rerun-budget
+
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --rows 50000 --rerun-budget 0.5
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chatbot_eda.views import PAGE_TITLES, STATIC_PAGES  # noqa: E402
+
+DASHBOARD = os.path.join(ROOT, 'streamlit_dashboard.py')
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DATA_FILE = 'ai-medical-chatbot.csv'
+# pyarrow is not listed: st.dataframe itself serializes through Arrow
+HEAVY_MODULES = ('chatbot_eda.data_cache', 'chatbot_eda.charts', 'matplotlib')
+STARTUP_BUDGET = 3.0
+RERUN_BUDGET = 1.0
+RERUNS = 3
+APP_TIMEOUT = 600
+
+
+def _problems(app):
+    return [str(item.value) for item in list(app.exception) + list(app.error)]
+
+
+def _cold_start(page, workdir):
+    """Child process: first run of the dashboard on ``page``"""
+    from streamlit.testing.v1 import AppTest
+    os.chdir(workdir)
+    app = AppTest.from_file(DASHBOARD, default_timeout=APP_TIMEOUT)
+    app.session_state['page'] = page
+    start = time.perf_counter()
+    app.run()
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'problems': _problems(app),
+            'heavy': [name for name in HEAVY_MODULES if name in sys.modules]}
+
+
+def _reruns(pages, workdir, reruns):
+    """Child process: (first run, median rerun) seconds of each page"""
+    from streamlit.testing.v1 import AppTest
+    os.chdir(workdir)
+    app = AppTest.from_file(DASHBOARD, default_timeout=APP_TIMEOUT)
+    app.run()
+    results = {}
+    for page in pages:
+        start = time.perf_counter()
+        app.sidebar.radio[0].set_value(page).run()
+        first = time.perf_counter() - start
+        timings = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            app.run()
+            timings.append(time.perf_counter() - start)
+        results[page] = {'first': first, 'rerun': statistics.median(timings), 'problems': _problems(app)}
+    return results
+
+
+def run_isolated(func, *args):
+    # A fresh interpreter: cold imports and an empty Streamlit cache
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(func, *args).result()
+
+
+def prepare_corpus(data_dir, rows, seed):
+    """Working directory holding a synthetic corpus under the dashboard's file name"""
+    # Imported here so cold-start children do not inherit numpy and pandas
+    from synthetic import corpus_path, generate_corpus
+    path = corpus_path(data_dir, 1.0, seed, rows)
+    if not path.exists():
+        print(f"Generating {path.name}...")
+        generate_corpus(path, 1.0, seed, rows)
+    workdir = os.path.join(data_dir, f'dashboard-{path.stem}')
+    os.makedirs(workdir, exist_ok=True)
+    target = os.path.join(workdir, DATA_FILE)
+    if not os.path.exists(target):
+        os.symlink(path.resolve(), target)
+    return workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20_000, help="synthetic corpus rows for the rerun check")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET,
+                        help="seconds for a static page's cold start (default 3.0)")
+    parser.add_argument('--rerun-budget', type=float, default=RERUN_BUDGET,
+                        help="median seconds for a warm rerun of any page (default 1.0)")
+    parser.add_argument('--reruns', type=int, default=RERUNS)
+    parser.add_argument('--pages', nargs='+', default=PAGE_TITLES, help="pages for the rerun check")
+    args = parser.parse_args()
+
+    failures = []
+    print("=" * 78)
+    print(f"{'Static page (cold, no dataset)':<40}{'Time (s)':>10}  Heavy modules loaded")
+    print("-" * 78)
+    for page in STATIC_PAGES:
+        with tempfile.TemporaryDirectory(prefix='dashboard-static-') as workdir:
+            result = run_isolated(_cold_start, page, workdir)
+        print(f"{page:<40}{result['seconds']:>10.2f}  {', '.join(result['heavy']) or '-'}")
+        if result['problems']:
+            failures.append(f"{page}: {result['problems'][0]}")
+        if result['heavy']:
+            failures.append(f"{page}: imported {', '.join(result['heavy'])}")
+        if result['seconds'] > args.startup_budget:
+            failures.append(f"{page}: cold start {result['seconds']:.2f}s > {args.startup_budget:.2f}s")
+
+    workdir = prepare_corpus(args.data_dir, args.rows, args.seed)
+    print("=" * 78)
+    print(f"{'Page (' + str(args.rows) + ' rows)':<40}{'First (s)':>10}{'Rerun (s)':>12}")
+    print("-" * 78)
+    for page, result in run_isolated(_reruns, args.pages, workdir, args.reruns).items():
+        flag = "  ⚠️ OVER BUDGET" if result['rerun'] > args.rerun_budget else ""
+        print(f"{page:<40}{result['first']:>10.2f}{result['rerun']:>12.3f}{flag}")
+        if result['problems']:
+            failures.append(f"{page}: {result['problems'][0]}")
+        if flag:
+            failures.append(f"{page}: rerun {result['rerun']:.3f}s > {args.rerun_budget:.2f}s")
+    print("=" * 78)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Within budget")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
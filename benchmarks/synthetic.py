@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Deterministic synthetic Description/Patient/Doctor corpus
+
+Writes a CSV shaped like ai-medical-chatbot.csv: a short question title,
+a patient message and a doctor answer per row, with Zipf-distributed
+medical vocabulary, a small share of exact and near-duplicate rows and a
+few missing titles. ``scale=1`` matches the real export (256,916 rows,
+about 255 MB); 10 and 100 give the corpora the benchmarks scale to.
+
+Rows are generated in fixed-size chunks, each from its own seeded RNG,
+so the same (scale, seed) always produces a byte-identical file and
+memory stays bounded at any scale. Runs fully offline.
+
+    python benchmarks/synthetic.py --scale 10 --output benchmarks/data/synthetic-10x.csv
+"""
+
+import argparse
+import os
+from pathlib import Path
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_ROWS = 256_916
+GENERATOR_CHUNK_ROWS = 50_000
+DUPLICATE_RATE = 0.002
+NEAR_DUPLICATE_RATE = 0.003
+MISSING_RATE = 0.0005
+PATIENT_WORDS = (85, 35)
+DOCTOR_WORDS = (120, 50)
+TITLE_WORDS = (6, 2)
+
+MEDICAL_TERMS = """
+pain fever headache cough cold throat chest stomach back knee skin rash allergy infection
+blood pressure sugar diabetes heart tablet medicine dose doctor report test scan xray mri
+ultrasound ecg thyroid liver kidney urine period pregnancy sperm pcod acne hair fall itching
+swelling vomiting nausea diarrhea constipation acidity gas ulcer migraine anxiety depression
+sleep insomnia fatigue weakness dizziness vertigo asthma breathing wheezing sinus ear eye
+vision tooth gum jaw neck shoulder spine disc sciatica joint arthritis fracture sprain muscle
+cramp numbness tingling nerve vitamin deficiency calcium iron hemoglobin cholesterol weight
+obesity hypertension antibiotic paracetamol ibuprofen steroid cream ointment injection
+surgery biopsy tumor cyst lump cancer hepatitis jaundice typhoid malaria dengue covid
+""".split()
+
+COMMON_WORDS = """
+i have a the and my is it for with since last days weeks months what should do please
+help me am years old taking after this that not been feeling also any can you your it
+will which but there are some more than on in of to from was were be had
+""".split()
+
+PATIENT_OPENINGS = ["Hi doctor,", "Hello doctor,", "Hi,", "Dear doctor,", "Respected sir,"]
+PATIENT_CLOSINGS = ["Please help.", "What should I do?", "Is it serious?", "Kindly advise.", ""]
+DOCTOR_OPENINGS = ["Hello.", "Hi.", "Hello, welcome.", "Hi, thanks for your query."]
+DOCTOR_CLOSINGS = ["Take care.", "Hope this helps.", "Revert back with reports.", "Regards."]
+
+
+def vocabulary():
+    """Word list and Zipf-like sampling probabilities (frequent words first)"""
+    words = np.array(COMMON_WORDS + MEDICAL_TERMS, dtype=object)
+    weights = 1.0 / np.arange(1, len(words) + 1) ** 1.07
+    return words, weights / weights.sum()
+
+
+def _sentences(rng, words, probabilities, rows, length):
+    """``rows`` strings of roughly normally distributed word counts"""
+    counts = np.clip(rng.normal(*length, size=rows).round().astype(np.int64), 1, None)
+    drawn = words[rng.choice(len(words), size=int(counts.sum()), p=probabilities)]
+    ends = np.cumsum(counts)
+    return [' '.join(drawn[end - count:end]) for count, end in zip(counts, ends)]
+
+
+def _pick(rng, options, rows):
+    return np.array(options, dtype=object)[rng.integers(0, len(options), size=rows)]
+
+
+def _replace_middle_word(text, word):
+    parts = text.split(' ')
+    parts[len(parts) // 2] = word
+    return ' '.join(parts)
+
+
+def generate_chunk(index, rows, seed=0):
+    """Chunk ``index`` of a corpus; the same arguments always give the same frame"""
+    rng = np.random.default_rng([seed, index])
+    words, probabilities = vocabulary()
+    titles = _sentences(rng, words, probabilities, rows, TITLE_WORDS)
+    patient = _sentences(rng, words, probabilities, rows, PATIENT_WORDS)
+    doctor = _sentences(rng, words, probabilities, rows, DOCTOR_WORDS)
+    frame = pd.DataFrame({
+        'Description': ['Q. ' + title.capitalize() + '?' for title in titles],
+        'Patient': (_pick(rng, PATIENT_OPENINGS, rows) + ' ' + np.array(patient, dtype=object)
+                    + '. ' + _pick(rng, PATIENT_CLOSINGS, rows)),
+        'Doctor': (_pick(rng, DOCTOR_OPENINGS, rows) + ' ' + np.array(doctor, dtype=object)
+                   + '. ' + _pick(rng, DOCTOR_CLOSINGS, rows)),
+    })
+
+    # Exact duplicates copy an earlier row; near-duplicates change one word of the answer
+    duplicates = rng.random(rows) < DUPLICATE_RATE
+    duplicates[0] = False
+    sources = (rng.random(rows) * np.arange(rows)).astype(np.int64)
+    frame.iloc[np.flatnonzero(duplicates)] = frame.iloc[sources[duplicates]].to_numpy()
+    near = np.flatnonzero((rng.random(rows) < NEAR_DUPLICATE_RATE) & ~duplicates & (np.arange(rows) > 0))
+    edited = frame['Doctor'].to_numpy()[sources[near]]
+    replacements = words[rng.integers(0, len(words), size=len(near))]
+    frame.loc[near, 'Doctor'] = [_replace_middle_word(text, word) for text, word in zip(edited, replacements)]
+    frame.loc[rng.random(rows) < MISSING_RATE, 'Description'] = None
+    return frame
+
+
+def generate_corpus(output, scale=1.0, seed=0, rows=None, chunk_rows=GENERATOR_CHUNK_ROWS):
+    """Write a ``scale`` x corpus (or exactly ``rows`` rows) to ``output``; returns its path"""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    total = rows if rows is not None else int(round(BASE_ROWS * scale))
+    tmp_path = output.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as fh:
+        for index, start in enumerate(range(0, total, chunk_rows)):
+            chunk = generate_chunk(index, min(chunk_rows, total - start), seed)
+            chunk.to_csv(fh, index=False, header=index == 0)
+    os.replace(tmp_path, output)
+    return output
+
+
+def corpus_path(data_dir, scale=1.0, seed=0, rows=None):
+    """File name that identifies a generated corpus"""
+    size = f'{rows}rows' if rows is not None else f'{scale:g}x'
+    return Path(data_dir) / f'synthetic-{size}-seed{seed}.csv'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic medical chatbot corpus")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiple of the real export's row count")
+    parser.add_argument('--rows', type=int, default=None, help="exact row count (overrides --scale)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    output = args.output or corpus_path(Path(__file__).parent / 'data', args.scale, args.seed, args.rows)
+    start = time.perf_counter()
+    path = generate_corpus(output, args.scale, args.seed, args.rows)
+    print(f"Wrote {path} ({path.stat().st_size / 1024**2:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
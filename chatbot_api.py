@@ -0,0 +1,231 @@
+"""
+AI Medical Chatbot - Retrieval Serving API
+
+Answers a patient question with the closest questions from the medical
+Q&A corpus and their doctor answers. Concurrent requests are collected
+into micro-batches (up to MAX_BATCH requests or BATCH_WINDOW_MS) and
+scored together in a worker thread, so the event loop keeps accepting
+connections while a batch is being scored. The index is loaded once per
+worker process at startup; the index arrays and the question and answer
+text are memory-mapped, so every worker shares one copy of each.
+
+    python chatbot_api.py --port 8000 --workers 4
+    curl -X POST localhost:8000/ask -H 'Content-Type: application/json' \\
+         -d '{"question": "I have a headache and fever", "k": 3}'
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+import os
+import time
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from chatbot_eda.data_cache import DATA_FILE, dataset_version
+from chatbot_eda.retrieval import METHODS, load_or_build_index
+from chatbot_eda.shared_data import shared_column
+
+QUESTION_COLUMN = os.environ.get('CHATBOT_QUESTION_COLUMN', 'Patient')
+ANSWER_COLUMN = os.environ.get('CHATBOT_ANSWER_COLUMN', 'Doctor')
+DATA_PATH = os.environ.get('CHATBOT_DATA_FILE', DATA_FILE)
+BATCH_WINDOW_MS = float(os.environ.get('CHATBOT_BATCH_WINDOW_MS', 5))
+MAX_BATCH = int(os.environ.get('CHATBOT_MAX_BATCH', 32))
+MAX_K = 20
+LATENCY_WINDOW = 10_000
+
+
+class AskRequest(BaseModel):
+    question: str = Field(..., min_length=1)
+    k: int = Field(3, ge=1, le=MAX_K)
+    method: str = 'bm25'
+
+
+class Match(BaseModel):
+    doc_id: int
+    score: float
+    question: str
+    answer: str
+
+
+class AskResponse(BaseModel):
+    matches: list[Match]
+    latency_ms: float
+    batch_size: int
+
+
+class MicroBatcher:
+    """Collects concurrent queries and scores each batch in one call"""
+
+    def __init__(self, index, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH):
+        self.index = index
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def search(self, query, k, method):
+        """Queue one query and wait for its (result, batch size)"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((query, k, method, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score(self, batch):
+        # One scoring call per method; each request keeps its own k
+        results = [None] * len(batch)
+        by_method = defaultdict(list)
+        for position, (_, _, method, _) in enumerate(batch):
+            by_method[method].append(position)
+        for method, positions in by_method.items():
+            k = max(batch[p][1] for p in positions)
+            found = self.index.search_batch([batch[p][0] for p in positions], k, method)
+            for position, result in zip(positions, found):
+                results[position] = result
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batch_sizes.append(len(batch))
+            try:
+                results = await loop.run_in_executor(None, self._score, batch)
+            except Exception as exc:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, k, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result((result.doc_ids[:k], result.scores[:k], len(batch)))
+
+
+class ServiceState:
+    """Everything loaded once per worker process"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.version = None
+        self.questions = None
+        self.answers = None
+        self.batcher = None
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def load(self):
+        self.version = dataset_version(DATA_PATH)
+        self.questions = shared_column(DATA_PATH, QUESTION_COLUMN)
+        self.answers = shared_column(DATA_PATH, ANSWER_COLUMN)
+        self.batcher = MicroBatcher(load_or_build_index(QUESTION_COLUMN, DATA_PATH))
+
+
+state = ServiceState()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await asyncio.get_running_loop().run_in_executor(None, state.load)
+    state.batcher.start()
+    yield
+    await state.batcher.stop()
+
+
+app = FastAPI(title="AI Medical Chatbot API", lifespan=lifespan)
+
+
+@app.post("/ask", response_model=AskResponse)
+async def ask(request: AskRequest):
+    if request.method not in METHODS:
+        raise HTTPException(status_code=422, detail=f"method must be one of {list(METHODS)}")
+    start = time.perf_counter()
+    state.requests += 1
+    try:
+        doc_ids, scores, batch_size = await state.batcher.search(request.question, request.k, request.method)
+    except Exception:
+        state.errors += 1
+        raise
+    matches = [
+        Match(doc_id=int(doc), score=float(score),
+              question=str(state.questions.iloc[doc]), answer=str(state.answers.iloc[doc]))
+        for doc, score in zip(doc_ids, scores)
+    ]
+    latency_ms = (time.perf_counter() - start) * 1000
+    state.latencies.append(latency_ms)
+    return AskResponse(matches=matches, latency_ms=latency_ms, batch_size=batch_size)
+
+
+@app.get("/health")
+async def health():
+    ready = state.batcher is not None
+    return {
+        'status': 'ok' if ready else 'loading',
+        'dataset_version': state.version,
+        'documents': state.batcher.index.num_docs if ready else 0,
+        'pid': os.getpid(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    latencies = np.asarray(state.latencies) if state.latencies else np.zeros(1)
+    batch_sizes = state.batcher.batch_sizes if state.batcher else []
+    return {
+        'requests': state.requests,
+        'errors': state.errors,
+        'uptime_seconds': round(time.time() - state.started, 1),
+        'latency_ms': {
+            'p50': float(np.percentile(latencies, 50)),
+            'p95': float(np.percentile(latencies, 95)),
+            'p99': float(np.percentile(latencies, 99)),
+        },
+        'mean_batch_size': float(np.mean(batch_sizes)) if batch_sizes else 0.0,
+        'queue_depth': state.batcher.queue.qsize() if state.batcher else 0,
+        'pid': os.getpid(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Medical Chatbot retrieval API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (each loads the index once)")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Build the index once here; the workers then only memory-map it
+        load_or_build_index(QUESTION_COLUMN, DATA_PATH)
+    import uvicorn
+    uvicorn.run('chatbot_api:app', host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Analysis engine behind the AI Medical Chatbot EDA dashboard and notebook
+
+The names below are re-exported from ``chatbot_eda.data_cache`` on first
+access, so importing a light submodule (e.g. the dashboard's page
+registry) does not pull in pandas and pyarrow.
+"""
+
+import importlib
+
+__all__ = [
+    "CACHE_DIR",
+    "DATA_FILE",
+    "build_cache",
+    "dataset_info",
+    "dataset_version",
+    "load_dataset",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module('chatbot_eda.data_cache'), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,308 @@
+"""
+Boilerplate and template detection with rolling-hash shingles
+
+Doctor answers open and close with the same greetings and sign-offs,
+which inflates answer lengths. Every row is split into lowercase words,
+and each window of SHINGLE_WORDS consecutive words (a shingle) gets a
+Rabin-Karp rolling hash of its word hashes, computed for every window of
+a chunk at once. A shingle found in at least TEMPLATE_SHARE of the rows
+is boilerplate.
+
+The column is read once, in chunks, on a process pool (like
+``chatbot_eda.keywords``). Each chunk:
+
+- counts the rows containing each shingle; the counts are merged across
+  chunks into a Space-Saving summary, so memory stays bounded
+- strips the words covered by the shingles frequent within the chunk.
+  Boilerplate is frequent throughout the corpus, so this gives exact
+  per-row stripped lengths in the same pass, merged as histograms
+
+Templates are reported by chaining the frequent shingles that overlap by
+SHINGLE_WORDS - 1 words into the longest unambiguous spans.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, cache_paths, dataset_version, ensure_cache
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.jobs import process_pool
+from chatbot_eda.profiler import WORD_HIST_CAP, LengthHistogram
+from chatbot_eda.sketches import SpaceSaving, hash_values
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SHINGLE_WORDS = 5
+TEMPLATE_SHARE = 0.01
+MIN_TEMPLATE_ROWS = 20
+# Repetition noise ("i i i i i", "ha ha ha ha ha") is not a template
+MIN_DISTINCT_WORDS = 3
+SHINGLE_CAPACITY = 4_096
+TOP_TEMPLATES = 20
+BOILERPLATE_CHUNK_ROWS = 20_000
+WORD_PATTERN = r"[\w']+"
+WORD_SEPARATORS_RE2 = r"[^\p{L}\p{N}_']+"
+# Odd 64-bit multiplier of the rolling hash (arithmetic wraps modulo 2**64)
+HASH_BASE = np.uint64(0x100000001B3)
+ROW_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _words(texts):
+    """(row of each word, word hashes, distinct words, word codes) of a list of texts"""
+    if pa is None:
+        words = pd.Series(texts, dtype=object).fillna('').astype(str).str.lower().str.findall(WORD_PATTERN)
+        words = words.explode().dropna()
+        codes, uniques = pd.factorize(words.to_numpy(dtype=object))
+        rows = words.index.to_numpy(dtype=np.int64)
+    else:
+        split = pc.split_pattern_regex(pc.utf8_lower(pa.array(texts, type=pa.large_string())), WORD_SEPARATORS_RE2)
+        flat = pc.list_flatten(split)
+        # Leading and trailing separators leave empty strings
+        present = pc.greater(pc.binary_length(flat), 0)
+        rows = pc.filter(pc.list_parent_indices(split), present).to_numpy()
+        encoded = pc.dictionary_encode(pc.filter(flat, present))
+        codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+        uniques = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+    return rows, hash_values(uniques)[codes], uniques, codes
+
+
+def shingle_hashes(word_hashes, rows, width=SHINGLE_WORDS):
+    """Rolling hash of every window of ``width`` words, and whether it lies within one row"""
+    starts = word_hashes.size - width + 1
+    if starts <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=bool)
+    hashes = np.zeros(starts, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for offset in range(width):
+            hashes = hashes * HASH_BASE + word_hashes[offset:offset + starts]
+    return hashes, rows[:starts] == rows[width - 1:]
+
+
+def _map_chunk(texts, width, share, min_rows, capacity):
+    """Worker: shingle row counts, frequent shingle texts and stripped lengths of one chunk"""
+    rows, word_hashes, uniques, codes = _words(texts)
+    words = np.bincount(rows, minlength=len(texts))
+    hashes, within = shingle_hashes(word_hashes, rows, width)
+    starts = np.flatnonzero(within)
+    # Rows containing each shingle: one (row, shingle) key per occurrence, deduplicated by sorting
+    with np.errstate(over='ignore'):
+        keys = hashes[starts] ^ (rows[starts].astype(np.uint64) * ROW_MIX)
+    _, first = np.unique(keys, return_index=True)
+    shingles, row_counts = np.unique(hashes[starts[first]], return_counts=True)
+    counts = pd.Series(row_counts, index=shingles)
+
+    threshold = max(min_rows, share * np.count_nonzero(words))
+    candidates = shingles[row_counts >= threshold]
+    occurrences = starts[np.isin(hashes[starts], candidates)]
+    _, first = np.unique(hashes[occurrences], return_index=True)
+    shingle_texts = {}
+    for start in occurrences[first]:
+        shingle_words = tuple(uniques[codes[start:start + width]])
+        if len(set(shingle_words)) >= MIN_DISTINCT_WORDS:
+            shingle_texts[int(hashes[start])] = shingle_words
+    boiler = occurrences[np.isin(hashes[occurrences], np.fromiter(shingle_texts, dtype=np.uint64))]
+    # Words under at least one boilerplate shingle: +1 where each starts, -1 where it ends
+    depth = np.zeros(word_hashes.size + 1, dtype=np.int64)
+    np.add.at(depth, boiler, 1)
+    np.add.at(depth, boiler + width, -1)
+    covered = np.bincount(rows, weights=np.cumsum(depth[:-1]) > 0, minlength=len(texts)).astype(np.int64)
+
+    repeated = counts[counts.to_numpy() > 1]
+    summary = SpaceSaving.from_counts(repeated, capacity)
+    if len(repeated) < len(counts):
+        # Shingles of a single row are left out of the summary: they occurred at most once
+        summary.floor = max(summary.floor, 1)
+    return {
+        'rows': len(texts), 'nonempty_rows': int(np.count_nonzero(words)),
+        'words': int(words.sum()), 'covered_words': int(covered.sum()),
+        'boilerplate_rows': int(np.count_nonzero(covered)),
+        'summary': summary, 'texts': shingle_texts,
+        'word_hist': LengthHistogram(WORD_HIST_CAP).update(words).counts,
+        'stripped_hist': LengthHistogram(WORD_HIST_CAP).update(words - covered).counts,
+    }
+
+
+def assemble_templates(shingles):
+    """Chain overlapping shingles into templates
+
+    ``shingles`` maps a hash to (words, rows, error). Shingles whose last
+    words are exactly the next one's first words are joined while the
+    chain does not branch. Returns (words, rows, error) per template,
+    with the chain's smallest row count and largest error.
+    """
+    by_prefix = defaultdict(list)
+    for shingle, (words, _, _) in shingles.items():
+        by_prefix[words[:-1]].append(shingle)
+    successors = {shingle: by_prefix.get(words[1:], []) for shingle, (words, _, _) in shingles.items()}
+    predecessors = defaultdict(list)
+    for shingle, following in successors.items():
+        for successor in following:
+            predecessors[successor].append(shingle)
+
+    def continues(shingle):
+        # Joined to its only predecessor, whose only successor it is
+        before = predecessors[shingle]
+        return len(before) == 1 and len(successors[before[0]]) == 1
+
+    templates, visited = [], set()
+    # Chain starts first; what is left over are cycles, entered anywhere
+    for shingle in sorted(shingles, key=continues):
+        if shingle in visited:
+            continue
+        chain = [shingle]
+        visited.add(shingle)
+        while len(successors[chain[-1]]) == 1:
+            successor = successors[chain[-1]][0]
+            if successor in visited or not continues(successor):
+                break
+            chain.append(successor)
+            visited.add(successor)
+        words = list(shingles[chain[0]][0]) + [shingles[s][0][-1] for s in chain[1:]]
+        templates.append((' '.join(words), min(shingles[s][1] for s in chain),
+                          max(shingles[s][2] for s in chain)))
+    return templates
+
+
+@dataclass
+class Boilerplate:
+    """Templates of one text column and its word counts with and without them"""
+
+    column: str
+    rows: int = 0
+    nonempty_rows: int = 0
+    words: int = 0
+    covered_words: int = 0
+    boilerplate_rows: int = 0
+    templates: pd.DataFrame = None
+    word_hist: LengthHistogram = field(default_factory=lambda: LengthHistogram(WORD_HIST_CAP))
+    stripped_hist: LengthHistogram = field(default_factory=lambda: LengthHistogram(WORD_HIST_CAP))
+
+    @property
+    def covered_share(self):
+        """Share of all words that are boilerplate"""
+        return self.covered_words / self.words if self.words else 0.0
+
+    def to_dict(self):
+        return {
+            'column': self.column, 'rows': self.rows, 'nonempty_rows': self.nonempty_rows,
+            'words': self.words, 'covered_words': self.covered_words, 'boilerplate_rows': self.boilerplate_rows,
+            'templates': self.templates.to_dict('list'),
+            'word_hist': self.word_hist.to_dict(), 'stripped_hist': self.stripped_hist.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['column'], data['rows'], data['nonempty_rows'], data['words'], data['covered_words'],
+                   data['boilerplate_rows'], pd.DataFrame(data['templates']),
+                   LengthHistogram.from_dict(data['word_hist']), LengthHistogram.from_dict(data['stripped_hist']))
+
+
+def _template_frame(result, summary, texts, share, min_rows, top_n):
+    threshold = max(min_rows, share * result.nonempty_rows)
+    shingles = {shingle: (texts[shingle], int(count), int(error))
+                for shingle, count, error in zip(summary.counts.index.tolist(), summary.counts.to_numpy(),
+                                                 summary.errors.to_numpy())
+                if count >= threshold and shingle in texts}
+    templates = pd.DataFrame(assemble_templates(shingles), columns=['template', 'rows', 'error'])
+    templates.insert(1, 'words', templates['template'].str.count(' ') + 1)
+    # Ranked by the words they add to the column
+    order = (templates['rows'] * templates['words']).sort_values(ascending=False, kind='stable').index
+    return templates.loc[order].head(top_n).reset_index(drop=True)
+
+
+def _text_chunks(path, column, cache_dir, chunk_rows):
+    """(texts, rows read so far, total rows or None) per chunk"""
+    if pq is None:
+        read = 0
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=chunk_rows):
+            read += len(chunk)
+            yield chunk[column].tolist(), read, None
+        return
+    parquet_file = pq.ParquetFile(ensure_cache(path, cache_dir))
+    total, read = parquet_file.metadata.num_rows, 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=[column]):
+        read += batch.num_rows
+        yield batch.column(0).to_pylist(), read, total
+
+
+def detect_boilerplate(path=DATA_FILE, column='Doctor', workers=None, cache_dir=CACHE_DIR,
+                       chunk_rows=BOILERPLATE_CHUNK_ROWS, width=SHINGLE_WORDS, share=TEMPLATE_SHARE,
+                       min_rows=MIN_TEMPLATE_ROWS, capacity=SHINGLE_CAPACITY, top_n=TOP_TEMPLATES, progress=None):
+    """Top boilerplate templates of a text column and its word counts before and after stripping them
+
+    Chunks run on a process pool of ``workers`` processes (default: one per
+    CPU; ``workers=1`` runs in-process), at most ``2 * workers`` in flight.
+    ``progress(fraction, message, partial)`` receives the running
+    ``Boilerplate`` after each reduced chunk.
+    """
+    result = Boilerplate(column)
+    summary, texts = SpaceSaving(capacity), {}
+    args = (width, share, min_rows, capacity)
+    chunks = _text_chunks(path, column, cache_dir, chunk_rows)
+    workers = workers or os.cpu_count() or 1
+
+    def reduce(partial, read, total):
+        nonlocal texts
+        for name in ('rows', 'nonempty_rows', 'words', 'covered_words', 'boilerplate_rows'):
+            setattr(result, name, getattr(result, name) + partial[name])
+        result.word_hist.counts += partial['word_hist']
+        result.stripped_hist.counts += partial['stripped_hist']
+        summary.merge(partial['summary'])
+        texts.update(partial['texts'])
+        # Only the texts of shingles still in the summary are kept
+        kept = set(summary.counts.index.tolist())
+        texts = {shingle: words for shingle, words in texts.items() if shingle in kept}
+        if progress is not None:
+            result.templates = _template_frame(result, summary, texts, share, min_rows, top_n)
+            progress(read / total if total else 0.0, f"{read:,} rows shingled", result)
+
+    if workers == 1:
+        for chunk, read, total in chunks:
+            reduce(_map_chunk(chunk, *args), read, total)
+    else:
+        with process_pool(workers) as pool:
+            pending = []
+            for chunk, read, total in chunks:
+                pending.append((pool.submit(_map_chunk, chunk, *args), read, total))
+                if len(pending) >= 2 * workers:
+                    future, read, total = pending.pop(0)
+                    reduce(future.result(), read, total)
+            for future, read, total in pending:
+                reduce(future.result(), read, total)
+
+    result.templates = _template_frame(result, summary, texts, share, min_rows, top_n)
+    return result
+
+
+def boilerplate_path(column, path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """JSON file holding the cached boilerplate report for a column and dataset version"""
+    version = version or dataset_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.boilerplate-{column}-{version}.json')
+
+
+def load_or_detect_boilerplate(column, path=DATA_FILE, cache_dir=CACHE_DIR, workers=None, progress=None):
+    """Cached ``detect_boilerplate`` for a column"""
+    target = boilerplate_path(column, path, cache_dir)
+    count_cache(target.exists())
+    if target.exists():
+        with open(target, encoding='utf-8') as fh:
+            return Boilerplate.from_dict(json.load(fh))
+
+    result = detect_boilerplate(path, column, workers=workers, cache_dir=cache_dir, progress=progress)
+    tmp_path = target.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(result.to_dict(), fh)
+    os.replace(tmp_path, target)
+    return result
@@ -0,0 +1,249 @@
+"""
+Chart-data layer: compact aggregates and cached rendered figures
+
+Pages never hand raw Series to matplotlib. They draw from fixed-size
+aggregates (histogram bins, five-number summaries with a bounded outlier
+sample, top-N bars), so drawing costs the same for 20k or 20M rows.
+
+Rendering is cached too. ``ChartCache.png`` keys a figure by its chart
+function, the dataset version, the column and every drawing parameter,
+and keeps the PNG bytes in memory (LRU) and on disk under CACHE_DIR.
+Reruns and server restarts reuse the bytes and never redraw.
+"""
+
+from collections import OrderedDict
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import threading
+
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+import numpy as np
+
+from chatbot_eda.data_cache import CACHE_DIR
+from chatbot_eda.instrumentation import count_cache
+
+HIST_BINS = 40
+OUTLIER_SAMPLES = 50
+CHART_DPI = 100
+CHART_CACHE_ITEMS = 256
+
+
+# ============================================================================
+# AGGREGATES
+# ============================================================================
+
+def histogram_bins(hist, bins=HIST_BINS):
+    """Equal-width bins of an exact ``LengthHistogram`` as {'counts', 'edges'}"""
+    counts, edges = hist.rebin(bins)
+    return {'counts': counts.tolist(), 'edges': edges.tolist()}
+
+
+def _spread(values, limit):
+    """At most ``limit`` values spread evenly over a sorted array"""
+    if values.size <= limit:
+        return values
+    return values[np.linspace(0, values.size - 1, limit).round().astype(np.int64)]
+
+
+def five_number_summary(hist, outlier_samples=OUTLIER_SAMPLES):
+    """Matplotlib ``bxp`` statistics from an exact length histogram
+
+    Whiskers follow the 1.5 IQR rule. ``fliers`` is a sample of at most
+    ``outlier_samples`` distinct outlying values, spread over the range.
+    """
+    q1, median, q3 = (hist.quantile(q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    nonzero = np.flatnonzero(hist.counts)
+    low_bound, high_bound = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = (nonzero >= low_bound) & (nonzero <= high_bound)
+    fliers = _spread(nonzero[~inside], outlier_samples)
+    return {
+        'q1': q1, 'med': median, 'q3': q3,
+        'whislo': float(nonzero[inside][0]) if inside.any() else q1,
+        'whishi': float(nonzero[inside][-1]) if inside.any() else q3,
+        'fliers': fliers.astype(float).tolist(),
+        'outliers': int(hist.counts[nonzero[~inside]].sum()),
+    }
+
+
+def value_summary(values, outlier_samples=OUTLIER_SAMPLES):
+    """Matplotlib ``bxp`` statistics for an array of values (see ``five_number_summary``)"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return {'q1': 0.0, 'med': 0.0, 'q3': 0.0, 'whislo': 0.0, 'whishi': 0.0,
+                'fliers': [], 'outliers': 0}
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    mask = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    outlying = np.unique(values[~mask])
+    return {
+        'q1': float(q1), 'med': float(median), 'q3': float(q3),
+        'whislo': float(values[mask].min()), 'whishi': float(values[mask].max()),
+        'fliers': _spread(outlying, outlier_samples).tolist(),
+        'outliers': int((~mask).sum()),
+    }
+
+
+def top_n(counter, n=15):
+    """The ``n`` most common (label, count) pairs of a Counter as JSON-safe lists"""
+    return [[str(label), int(count)] for label, count in counter.most_common(n)]
+
+
+# ============================================================================
+# FIGURES
+# ============================================================================
+# Every chart function takes only JSON-serialisable parameters and returns
+# a Figure, so the parameters double as the cache key. Figures are created
+# without pyplot, so concurrent sessions never share global figure state.
+
+def _subplots(figsize):
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def _colors(cmap, n):
+    return matplotlib.colormaps[cmap](np.linspace(0, 1, n))
+
+
+def hist_chart(hist, title, xlabel, color='#3498db', mean=None, mean_label=None,
+               mean_color='red', figsize=(10, 5)):
+    """Bar chart of pre-binned counts, with an optional mean line"""
+    fig, ax = _subplots(figsize)
+    edges = np.asarray(hist['edges'])
+    if len(edges):
+        ax.bar(edges[:-1], hist['counts'], width=np.diff(edges), align='edge',
+               color=color, edgecolor='black', alpha=0.7)
+    if mean is not None:
+        ax.axvline(mean, color=mean_color, linestyle='--', linewidth=2, label=mean_label)
+        ax.legend()
+    ax.set_xlabel(xlabel, fontweight='bold')
+    ax.set_ylabel('Frequency', fontweight='bold')
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    return fig
+
+
+def box_chart(boxes, labels, colors, ylabel, title, figsize=(10, 5)):
+    """Box plot from precomputed ``bxp`` statistics (outliers are a sample)"""
+    fig, ax = _subplots(figsize)
+    stats = [dict(box, label=label) for box, label in zip(boxes, labels)]
+    bp = ax.bxp(stats, patch_artist=True, showfliers=True,
+                flierprops={'marker': 'o', 'markersize': 3, 'alpha': 0.5})
+    for patch, color in zip(bp['boxes'], colors):
+        patch.set_facecolor(color)
+    ax.set_ylabel(ylabel, fontweight='bold')
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
+    return fig
+
+
+def barh_chart(labels, values, title, xlabel, colors=None, cmap=None, invert=False,
+               label_chars=None, figsize=(10, 8)):
+    """Horizontal bars; ``cmap`` names a matplotlib colormap to color them"""
+    fig, ax = _subplots(figsize)
+    if cmap is not None:
+        colors = _colors(cmap, len(values))
+    positions = range(len(values))
+    ax.barh(positions, values, color=colors, edgecolor='black' if cmap else None)
+    ax.set_yticks(list(positions))
+    ax.set_yticklabels([label[:label_chars] if label_chars else label for label in labels],
+                       fontsize=9)
+    ax.set_xlabel(xlabel, fontweight='bold')
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    if invert:
+        ax.invert_yaxis()
+    return fig
+
+
+def pie_chart(values, labels, title, cmap='Set3', figsize=(8, 6)):
+    """Pie chart with percentage labels"""
+    fig, ax = _subplots(figsize)
+    colors = _colors(cmap, len(values))
+    ax.pie(values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    return fig
+
+
+def gauge_chart(value_text, status, color, figsize=(6, 6)):
+    """Circular score badge"""
+    fig, ax = _subplots(figsize)
+    ax.add_patch(Circle((0.5, 0.5), 0.4, color=color, alpha=0.3))
+    ax.text(0.5, 0.5, value_text, ha='center', va='center', fontsize=40, fontweight='bold')
+    ax.text(0.5, 0.15, status, ha='center', va='center', fontsize=10, fontweight='bold')
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+    return fig
+
+
+# ============================================================================
+# RENDER CACHE
+# ============================================================================
+
+def figure_png(fig, dpi=CHART_DPI):
+    """PNG bytes of a figure"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """Rendered PNGs keyed by chart, dataset version, column and parameters
+
+    One instance is shared by every session; the LRU and counters are
+    guarded by a lock, while rendering runs outside it.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_items=CHART_CACHE_ITEMS):
+        self.directory = Path(cache_dir) / 'charts' if cache_dir else None
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(chart, version, column=None, **params):
+        payload = json.dumps([chart.__name__, version, column, params], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def png(self, chart, version, column=None, **params):
+        """PNG bytes of ``chart(**params)``, rendered only on a cache miss"""
+        key = self.key(chart, version, column, **params)
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            count_cache(True)
+            return data
+
+        target = self.directory / version / f'{key}.png' if self.directory else None
+        hit = target is not None and target.exists()
+        if hit:
+            data = target.read_bytes()
+        else:
+            data = figure_png(chart(**params))
+            if target is not None:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # Sessions rendering the same chart at once each write their own file
+                tmp_path = target.with_name(f'{key}.{os.getpid()}.{threading.get_ident()}.tmp')
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, target)
+        count_cache(hit)
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+        return data
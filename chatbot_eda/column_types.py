@@ -0,0 +1,86 @@
+"""
+Column types from distinct ratios and words per value
+
+Storage types cannot tell a label column from free text: both are
+strings. Each column is classified instead as one of
+
+    id            (nearly) every value distinct, a single word each
+    categorical   few distinct values, short labels
+    short_text    free text of a few words per value (titles, questions)
+    long_text     free text of many words per value (answers, dialogues)
+    numeric       other numeric columns
+
+``classify`` needs only a column's non-null and distinct counts and its
+words per value. The snapshot takes those from the profile's sketches
+(a HyperLogLog distinct count once exact tallies are dropped, exact
+word-count histograms), so the types are stored with each dataset
+version. The fast preview classifies its sample the same way. The
+profiler also checks each text column's first chunk, and does not tally
+the values of IDs or free text exactly.
+"""
+
+import numpy as np
+
+ID_DISTINCT_RATIO = 0.95
+CATEGORICAL_DISTINCT_RATIO = 0.1
+CATEGORICAL_MAX_DISTINCT = 100
+CATEGORICAL_MAX_WORDS = 8
+SHORT_TEXT_MAX_WORDS = 20
+KINDS = ('id', 'categorical', 'short_text', 'long_text', 'numeric')
+FREE_TEXT = ('short_text', 'long_text')
+KIND_LABELS = {'id': "🆔 ID", 'categorical': "🏷️ Categorical", 'short_text': "✏️ Short text",
+               'long_text': "📄 Long text", 'numeric': "🔢 Numeric"}
+
+
+def classify(values, distinct, mean_words=0.0, p95_words=0.0, numeric=False, integer=False):
+    """Column type from its non-null count, distinct count and words per value"""
+    if values == 0:
+        return 'numeric' if numeric else 'categorical'
+    ratio = distinct / values
+    if numeric:
+        # Unique integers are keys; other numbers get numeric statistics, however few their values
+        return 'id' if integer and ratio >= ID_DISTINCT_RATIO and values > CATEGORICAL_MAX_DISTINCT else 'numeric'
+    if ratio >= ID_DISTINCT_RATIO and p95_words <= 1:
+        return 'id'
+    few = ratio <= CATEGORICAL_DISTINCT_RATIO or (distinct <= CATEGORICAL_MAX_DISTINCT and ratio <= 0.5)
+    if few and mean_words <= CATEGORICAL_MAX_WORDS:
+        return 'categorical'
+    return 'short_text' if mean_words <= SHORT_TEXT_MAX_WORDS else 'long_text'
+
+
+def worth_tallying(series, words, distinct):
+    """Whether one chunk of a text column looks like labels worth counting exactly
+
+    Takes the chunk's values, their word counts and distinct count. IDs
+    and values longer than a label are left to the sketches.
+    """
+    present = series.notna().to_numpy()
+    words = np.asarray(words)[present]
+    if not words.size:
+        return True
+    kind = classify(int(present.sum()), distinct, float(words.mean()), float(np.quantile(words, 0.95)))
+    return kind != 'id' and words.mean() <= CATEGORICAL_MAX_WORDS
+
+
+def profile_column_type(column):
+    """Type of a profiled column (``profiler.ColumnProfile``)"""
+    values = column.rows - column.nulls
+    distinct = column.distinct if column.distinct is not None else column.distinct_sketch.estimate()
+    if column.kind == 'numeric':
+        return classify(values, distinct, numeric=True, integer=column.dtype.lower().startswith(('int', 'uint')))
+    if values <= 0:
+        return classify(0, 0)
+    # Missing values were counted as empty strings: zero words at the bottom of the histogram
+    mean_words = column.word_counts.mean * column.word_counts.count / values
+    p95_words = column.word_hist.quantile((column.nulls + 0.95 * values) / column.rows)
+    return classify(values, distinct, mean_words, p95_words)
+
+
+def infer_column_types(profile):
+    """{column: type} for every column of a ``DatasetProfile``"""
+    return {name: profile_column_type(column) for name, column in profile.columns.items()}
+
+
+def columns_of(column_types, *kinds):
+    """Columns of the given types, in table order"""
+    return [name for name, kind in column_types.items() if kind in kinds]
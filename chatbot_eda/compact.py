@@ -0,0 +1,82 @@
+"""
+Memory-compact representation of the dataset
+
+Object text columns are the bulk of the in-memory footprint: every value
+is a separate Python string. Compact mode stores text as Arrow-backed
+strings, turns low-cardinality columns into ``category`` and downcasts
+numerics. ``memory_report`` compares the two layouts per column.
+"""
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+CATEGORY_RATIO = 0.5
+
+
+def arrow_string_dtype():
+    """Arrow-backed string dtype, or None when pyarrow is unavailable"""
+    return pd.StringDtype('pyarrow') if pa is not None else None
+
+
+def arrow_types_mapper(data_type):
+    """``Table.to_pandas`` mapper reading Arrow strings without Python objects"""
+    if pa is not None and (pa.types.is_string(data_type) or pa.types.is_large_string(data_type)):
+        return arrow_string_dtype()
+    return None
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def compact_series(series, category_ratio=CATEGORY_RATIO):
+    """Return the most compact dtype-equivalent copy of a column"""
+    if pd.api.types.is_integer_dtype(series):
+        unsigned = series.min() >= 0 if len(series) else False
+        return pd.to_numeric(series, downcast='unsigned' if unsigned else 'integer')
+    if pd.api.types.is_float_dtype(series):
+        return pd.to_numeric(series, downcast='float')
+    if isinstance(series.dtype, pd.CategoricalDtype) or not _is_text(series):
+        return series
+
+    non_null = series.dropna()
+    if len(non_null) and non_null.nunique() / len(non_null) < category_ratio:
+        return series.astype('category')
+    string_dtype = arrow_string_dtype()
+    return series.astype(string_dtype) if string_dtype is not None else series
+
+
+def compact_frame(frame, category_ratio=CATEGORY_RATIO):
+    """Compact every column of a DataFrame (see ``compact_series``)"""
+    return pd.DataFrame(
+        {name: compact_series(frame[name], category_ratio) for name in frame.columns},
+        index=frame.index,
+    )
+
+
+def memory_report(before, after):
+    """Per-column memory of two layouts of the same frame, plus a total row"""
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'Column': before.columns,
+        'Before Type': [str(before[name].dtype) for name in before.columns],
+        'After Type': [str(after[name].dtype) for name in before.columns],
+        'Before (MB)': (before_bytes.values / 1024**2).round(2),
+        'After (MB)': (after_bytes.reindex(before.columns).values / 1024**2).round(2),
+    })
+    total = pd.DataFrame([{
+        'Column': 'TOTAL',
+        'Before Type': '',
+        'After Type': '',
+        'Before (MB)': round(before_bytes.sum() / 1024**2, 2),
+        'After (MB)': round(after_bytes.sum() / 1024**2, 2),
+    }])
+    report = pd.concat([report, total], ignore_index=True)
+    saved = 1 - report['After (MB)'] / report['Before (MB)'].where(report['Before (MB)'] > 0)
+    report['Saved %'] = (saved * 100).round(1).fillna(0.0)
+    return report
@@ -0,0 +1,247 @@
+"""
+Columnar on-disk cache for the medical chatbot CSV
+
+The CSV is converted once into a Parquet file under CACHE_DIR. A manifest
+stores the source file's size, mtime and content hash; the cache is reused
+while they match and rebuilt as soon as the CSV changes. Later loads read
+only the requested columns.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+
+import pandas as pd
+
+from chatbot_eda.compact import arrow_types_mapper, compact_frame
+from chatbot_eda.instrumentation import count_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DATA_FILE = 'ai-medical-chatbot.csv'
+CACHE_DIR = '.eda_cache'
+CSV_CHUNK_ROWS = 50_000
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def hash_file(path):
+    """Return the blake2b hex digest of a file, read in fixed-size blocks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Return size, mtime and content hash of a file"""
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'blake2b': hash_file(path),
+    }
+
+
+def cache_paths(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Return the (parquet, manifest) paths used to cache a CSV file"""
+    stem = Path(path).stem
+    base = Path(cache_dir)
+    return base / f'{stem}.parquet', base / f'{stem}.manifest.json'
+
+
+def read_manifest(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Return the stored cache manifest, or None if there is none"""
+    _, manifest_path = cache_paths(path, cache_dir)
+    try:
+        with open(manifest_path, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_manifest(manifest, manifest_path):
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def is_cache_valid(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Check whether the Parquet cache still matches the source CSV
+
+    Size and mtime are compared first. If only the mtime moved (file
+    touched or copied) the content hash decides, and a matching hash
+    refreshes the stored mtime so the next check is cheap again.
+    """
+    parquet_path, manifest_path = cache_paths(path, cache_dir)
+    manifest = read_manifest(path, cache_dir)
+    if manifest is None or not parquet_path.exists():
+        return False
+
+    stat = os.stat(path)
+    if stat.st_size != manifest['size']:
+        return False
+    if stat.st_mtime_ns == manifest['mtime_ns']:
+        return True
+    if hash_file(path) != manifest['blake2b']:
+        return False
+
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    _write_manifest(manifest, manifest_path)
+    return True
+
+
+def _arrow_schema(first_chunk):
+    """Arrow schema for the CSV, with all-null columns widened to string"""
+    schema = pa.Schema.from_pandas(first_chunk, preserve_index=False)
+    fields = [
+        pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+        for field in schema
+    ]
+    return pa.schema(fields)
+
+
+def _write_parquet(path, target, chunksize):
+    """Stream the CSV into a Parquet file without loading it whole"""
+    writer = None
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if writer is None:
+                schema = _arrow_schema(chunk)
+                writer = pq.ParquetWriter(target, schema)
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            writer.write_table(table)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Column types drifted between chunks (e.g. ints gaining NaNs);
+        # let pandas infer the schema from the whole file instead.
+        if writer is not None:
+            writer.close()
+            writer = None
+        pd.read_csv(path).to_parquet(target, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def build_cache(path=DATA_FILE, cache_dir=CACHE_DIR, chunksize=CSV_CHUNK_ROWS):
+    """Convert the CSV into the Parquet cache and write its manifest"""
+    parquet_path, manifest_path = cache_paths(path, cache_dir)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Fingerprint before reading so a file changing mid-build is detected
+    # on the next validity check rather than silently cached.
+    manifest = file_fingerprint(path)
+    manifest['source'] = os.path.abspath(path)
+
+    tmp_path = parquet_path.with_suffix('.parquet.tmp')
+    _write_parquet(path, tmp_path, chunksize)
+    os.replace(tmp_path, parquet_path)
+
+    manifest['num_rows'] = pq.ParquetFile(parquet_path).metadata.num_rows
+    _write_manifest(manifest, manifest_path)
+    return parquet_path
+
+
+def build_directory(directory):
+    """Per-process scratch directory to build ``directory`` in before ``publish_directory``"""
+    directory = Path(directory)
+    tmp_directory = directory.with_name(f'{directory.name}.{os.getpid()}.tmp')
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    return tmp_directory
+
+
+def publish_directory(tmp_directory, directory):
+    """Move a finished build into place, or adopt the one another process published first
+
+    Concurrent builders (API workers, Streamlit processes) each write their
+    own scratch directory, so none reads another's half-written files. The
+    first rename wins; later builders find the directory taken, discard
+    their identical copy and return False.
+    """
+    try:
+        os.replace(tmp_directory, directory)
+        return True
+    except OSError:
+        if not Path(directory).is_dir():
+            raise
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        return False
+
+
+def ensure_cache(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Return the Parquet cache path, building it first if it is stale"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    valid = is_cache_valid(path, cache_dir)
+    count_cache(valid)
+    if not valid:
+        build_cache(path, cache_dir)
+    return cache_paths(path, cache_dir)[0]
+
+
+def load_dataset(path=DATA_FILE, columns=None, cache_dir=CACHE_DIR, compact=False):
+    """Load the dataset, reading only ``columns`` when given
+
+    Uses the Parquet cache when pyarrow is installed and falls back to
+    reading the CSV directly otherwise. ``compact=True`` returns the
+    memory-compact layout from ``chatbot_eda.compact``.
+    """
+    if pq is None:
+        frame = pd.read_csv(path, usecols=columns)
+    elif compact:
+        # Arrow strings go straight into the frame, never as Python objects
+        table = pq.read_table(ensure_cache(path, cache_dir), columns=columns)
+        frame = table.to_pandas(types_mapper=arrow_types_mapper)
+    else:
+        frame = pd.read_parquet(ensure_cache(path, cache_dir), columns=columns)
+    return compact_frame(frame) if compact else frame
+
+
+def dataset_version(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Short content hash identifying the current version of the dataset"""
+    if pq is None:
+        return file_fingerprint(path)['blake2b'][:16]
+    ensure_cache(path, cache_dir)
+    return read_manifest(path, cache_dir)['blake2b'][:16]
+
+
+def source_version(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Same value as ``dataset_version``, but never builds the cache
+
+    A cold start hashes the CSV (a sequential read, no parsing) instead of
+    converting it, so callers can key work on the version right away.
+    """
+    if pq is not None and is_cache_valid(path, cache_dir):
+        return read_manifest(path, cache_dir)['blake2b'][:16]
+    return hash_file(path)[:16]
+
+
+def dataset_info(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Column names, text/numeric split and row count without loading rows"""
+    if pq is None:
+        df = pd.read_csv(path)
+        return {
+            'columns': df.columns.tolist(),
+            'text_columns': df.select_dtypes(include=['object']).columns.tolist(),
+            'numeric_columns': df.select_dtypes(include='number').columns.tolist(),
+            'num_rows': len(df),
+        }
+
+    parquet_file = pq.ParquetFile(ensure_cache(path, cache_dir))
+    schema = parquet_file.schema_arrow
+    text_types = (pa.types.is_string, pa.types.is_large_string)
+    numeric_types = (pa.types.is_integer, pa.types.is_floating)
+    return {
+        'columns': schema.names,
+        'text_columns': [f.name for f in schema if any(t(f.type) for t in text_types)],
+        'numeric_columns': [f.name for f in schema if any(t(f.type) for t in numeric_types)],
+        'num_rows': parquet_file.metadata.num_rows,
+    }
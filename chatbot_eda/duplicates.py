@@ -0,0 +1,257 @@
+"""
+Exact and near-duplicate detection for the Patient/Doctor free text
+
+Exact duplicates are found by grouping vectorized 64-bit row hashes.
+Near-duplicates use MinHash signatures over word shingles and LSH banding:
+only rows that share a band bucket are compared, so the cost grows close
+to linearly with the corpus instead of with the number of row pairs.
+"""
+
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = r'\w+'
+NUM_PERM = 64
+SHINGLE_SIZE = 3
+MINHASH_BATCH_ROWS = 256
+DEFAULT_THRESHOLD = 0.8
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+_SHINGLE_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def row_hashes(frame, columns=None):
+    """Vectorized 64-bit hash of every row (or of the given columns)"""
+    if columns is not None:
+        frame = frame[list(columns)]
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def count_duplicates(hashes):
+    """Rows that repeat an earlier row, as ``DataFrame.duplicated().sum()``"""
+    hashes = np.asarray(hashes)
+    return int(hashes.size - np.unique(hashes).size)
+
+
+def exact_clusters(hashes):
+    """Groups of row positions sharing a hash, largest first"""
+    hashes = np.asarray(hashes)
+    order = np.argsort(hashes, kind='stable')
+    sorted_hashes = hashes[order]
+    boundaries = np.flatnonzero(sorted_hashes[1:] != sorted_hashes[:-1]) + 1
+    groups = np.split(order, boundaries)
+    clusters = [group for group in groups if group.size > 1]
+    clusters.sort(key=len, reverse=True)
+    return clusters
+
+
+def _permutations(num_perm, seed):
+    # Multiply-shift hashing: (a * h + b) >> 32 with odd 64-bit a, in
+    # wrapping uint64 arithmetic - no modulo, unlike the Mersenne-prime form
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def _shingle_hashes(texts, shingle_size):
+    """Hash of every word k-shingle and the row it came from
+
+    Token hashes are combined arithmetically, so no shingle strings are built.
+    Rows shorter than ``shingle_size`` fall back to their unigrams.
+    """
+    tokens = texts.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    if tokens.empty:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    rows = tokens.index.to_numpy(dtype=np.int64)
+    hashes = pd.util.hash_array(tokens.to_numpy(dtype=object))
+    if shingle_size <= 1 or hashes.size < shingle_size:
+        return hashes, rows
+
+    span = hashes.size - shingle_size + 1
+    shingles = hashes[:span].copy()
+    for offset in range(1, shingle_size):
+        shingles = shingles * _SHINGLE_MULTIPLIER + hashes[offset:offset + span]
+    same_row = rows[:span] == rows[shingle_size - 1:]
+    shingles, shingle_rows = shingles[same_row], rows[:span][same_row]
+
+    short_rows = np.setdiff1d(np.unique(rows), shingle_rows, assume_unique=True)
+    if short_rows.size:
+        fallback = np.isin(rows, short_rows)
+        shingles = np.concatenate([shingles, hashes[fallback]])
+        shingle_rows = np.concatenate([shingle_rows, rows[fallback]])
+        order = np.argsort(shingle_rows, kind='stable')
+        shingles, shingle_rows = shingles[order], shingle_rows[order]
+    return shingles, shingle_rows
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE,
+                       batch_rows=MINHASH_BATCH_ROWS, seed=1, progress=None):
+    """MinHash signature matrix (rows x num_perm, uint32) for a text Series
+
+    Identical texts are signed once. Rows without any token get an all-max
+    signature; callers should treat them as empty rather than similar.
+    ``progress(fraction)`` is called after each batch.
+    """
+    texts = pd.Series(texts).fillna('').astype(str).reset_index(drop=True)
+    _, first_rows, inverse = np.unique(row_hashes(texts), return_index=True, return_inverse=True)
+    unique_texts = texts.iloc[first_rows].reset_index(drop=True)
+
+    a, b = _permutations(num_perm, seed)
+    signatures = np.full((num_perm, len(unique_texts)), _MAX_HASH, dtype=np.uint32)
+    for start in range(0, len(unique_texts), batch_rows):
+        batch = unique_texts.iloc[start:start + batch_rows]
+        shingles, rows = _shingle_hashes(batch, shingle_size)
+        if shingles.size == 0:
+            continue
+        # (num_perm, shingles) keeps the per-row min-reduction contiguous
+        permuted = (a * shingles[None, :] + b) >> _SHIFT
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        signatures[:, rows[starts]] = np.minimum.reduceat(permuted, starts, axis=1)
+        if progress is not None:
+            progress(min(start + batch_rows, len(unique_texts)) / len(unique_texts))
+    return np.ascontiguousarray(signatures.T)[inverse.ravel()]
+
+
+def lsh_params(threshold, num_perm=NUM_PERM):
+    """Bands and rows per band whose S-curve midpoint is closest to ``threshold``"""
+    best = None
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        midpoint = (1 / bands) ** (1 / rows)
+        error = abs(midpoint - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = np.arange(size)
+
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, left, right):
+        left, right = self.find(left), self.find(right)
+        if left != right:
+            self.parent[max(left, right)] = min(left, right)
+
+
+@dataclass
+class NearDuplicateCluster:
+    """Rows whose MinHash signatures agree at or above the threshold"""
+
+    rows: np.ndarray
+    similarity: float
+
+
+@dataclass
+class DuplicateReport:
+    """Exact and near-duplicate clusters for one text column"""
+
+    column: str
+    num_rows: int
+    threshold: float
+    exact: list = field(default_factory=list)
+    near: list = field(default_factory=list)
+
+    @property
+    def exact_duplicate_rows(self):
+        return sum(len(cluster) - 1 for cluster in self.exact)
+
+    @property
+    def near_duplicate_rows(self):
+        return sum(len(cluster.rows) - 1 for cluster in self.near)
+
+
+def near_duplicate_clusters(signatures, threshold=DEFAULT_THRESHOLD, exclude=None):
+    """Cluster rows with LSH banding over a MinHash signature matrix
+
+    Each bucket member is verified against the bucket's first row, which
+    keeps the work linear in bucket size even for heavily templated text.
+    ``exclude`` is a boolean mask of rows to skip (e.g. empty text).
+    """
+    num_rows, num_perm = signatures.shape
+    bands, rows_per_band = lsh_params(threshold, num_perm)
+    candidates = np.arange(num_rows)
+    if exclude is not None:
+        candidates = candidates[~np.asarray(exclude)]
+    union_find = _UnionFind(num_rows)
+
+    for band in range(bands):
+        block = np.ascontiguousarray(
+            signatures[candidates, band * rows_per_band:(band + 1) * rows_per_band])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows_per_band))).ravel()
+        _, bucket, sizes = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = sizes[bucket] > 1
+        if not shared.any():
+            continue
+        members = candidates[shared]
+        order = np.argsort(bucket[shared], kind='stable')
+        members, member_buckets = members[order], bucket[shared][order]
+        starts = np.flatnonzero(np.r_[True, member_buckets[1:] != member_buckets[:-1]])
+        for group in np.split(members, starts[1:]):
+            representative = signatures[group[0]]
+            agreement = (signatures[group[1:]] == representative).mean(axis=1)
+            for row in group[1:][agreement >= threshold]:
+                union_find.union(group[0], row)
+
+    roots = np.array([union_find.find(row) for row in range(num_rows)])
+    clusters = []
+    for group in exact_clusters(roots):
+        agreement = (signatures[group[1:]] == signatures[group[0]]).mean(axis=1)
+        clusters.append(NearDuplicateCluster(rows=group, similarity=float(agreement.mean())))
+    return clusters
+
+
+def detect_duplicates(texts, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM,
+                      shingle_size=SHINGLE_SIZE, near=True, progress=None):
+    """Exact and (optionally) near-duplicate clusters for a text Series
+
+    ``progress(fraction, message, partial)`` receives the report with only
+    exact clusters filled in while near-duplicates are still being found.
+    """
+    texts = pd.Series(texts).reset_index(drop=True)
+    report = DuplicateReport(column=str(texts.name), num_rows=len(texts), threshold=threshold)
+    report.exact = exact_clusters(row_hashes(texts))
+    if near:
+        def signed(fraction):
+            progress(0.1 + 0.8 * fraction, "Signing rows with MinHash")
+
+        if progress is not None:
+            progress(0.1, "Signing rows with MinHash", report)
+        signatures = minhash_signatures(texts, num_perm=num_perm, shingle_size=shingle_size,
+                                        progress=signed if progress is not None else None)
+        if progress is not None:
+            progress(0.9, "Clustering LSH candidates")
+        empty = (signatures == _MAX_HASH).all(axis=1)
+        near_clusters = near_duplicate_clusters(signatures, threshold, exclude=empty)
+        report = replace(report, near=near_clusters)
+    return report
+
+
+def clusters_frame(clusters, texts, limit=50, preview_chars=120):
+    """Table of the largest clusters with a preview of their first row"""
+    texts = pd.Series(texts).reset_index(drop=True).fillna('').astype(str)
+    records = []
+    for number, cluster in enumerate(clusters[:limit], start=1):
+        rows = cluster.rows if isinstance(cluster, NearDuplicateCluster) else cluster
+        records.append({
+            'Cluster': number,
+            'Size': len(rows),
+            'Similarity': getattr(cluster, 'similarity', 1.0),
+            'First Row': int(rows[0]),
+            'Preview': texts.iloc[rows[0]][:preview_chars],
+        })
+    return pd.DataFrame(records, columns=['Cluster', 'Size', 'Similarity', 'First Row', 'Preview'])
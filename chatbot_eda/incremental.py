@@ -0,0 +1,264 @@
+"""
+Append-aware profiling for chat exports that grow by appended rows
+
+``update_profile_state`` remembers how far into the CSV the last run
+read (a byte offset at a record boundary) and the mergeable state built
+from those bytes: the ``DatasetProfile`` (counts, Welford moments, length
+histograms, category frequencies), the first rows, the sorted set of
+row hashes used to count duplicates and the values of numeric columns
+(up to EXACT_NUMERIC_ROWS each) for exact numeric statistics. The next
+run parses only the bytes appended since, folds them into the state and
+saves it again, so a daily refresh costs time proportional to the new
+rows.
+
+The state is only reused when the file was appended to: the header and
+the first and last blocks of the previously read range must hash the
+same as before, and the file must not have shrunk. Anything else (edits,
+truncation, a new export) triggers a full pass.
+
+Record boundaries are newlines outside quoted fields. The end of the
+file also ends the last record when it has no trailing newline; that
+record is counted in the result but left out of the saved state, whose
+offset stays at the record's start, so the next run parses it again
+together with whatever was appended to it.
+"""
+
+from dataclasses import dataclass, field
+import copy
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, HASH_BLOCK_BYTES, cache_paths
+from chatbot_eda.duplicates import row_hashes
+from chatbot_eda.profiler import (MAX_CATEGORIES, PROFILE_CHUNK_ROWS, DatasetProfile, collect_numeric_values,
+                                  json_safe_head)
+
+STATE_FORMAT = 5
+
+
+@dataclass
+class IncrementalState:
+    """Profile of the first ``offset`` bytes of a CSV and what is needed to extend it"""
+
+    offset: int = 0
+    header: str = ''
+    columns: list = field(default_factory=list)
+    head_hash: str = ''
+    tail_hash: str = ''
+    profile: DatasetProfile = field(default_factory=DatasetProfile)
+    head: list = field(default_factory=list)
+    hashes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint64))
+    # {column: every non-null value}, None for columns past EXACT_NUMERIC_ROWS
+    numeric: dict = field(default_factory=dict)
+    mode: str = 'full'
+    appended_rows: int = 0
+
+    @property
+    def rows(self):
+        return self.profile.rows
+
+    @property
+    def duplicate_rows(self):
+        """Rows identical to an earlier row (same count as ``count_duplicates``)"""
+        return self.profile.rows - len(self.hashes)
+
+    def to_dict(self):
+        return {
+            'format': STATE_FORMAT,
+            'offset': self.offset,
+            'header': self.header,
+            'columns': self.columns,
+            'head_hash': self.head_hash,
+            'tail_hash': self.tail_hash,
+            'profile': self.profile.to_dict(),
+            'head': self.head,
+            'unique_rows': len(self.hashes),
+            'numeric': {name: None if values is None else len(values) for name, values in self.numeric.items()},
+        }
+
+
+def state_paths(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """(JSON state, row-hash array, numeric values) files kept next to the columnar cache"""
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return (parquet_path.with_name(f'{parquet_path.stem}.incremental.json'),
+            parquet_path.with_name(f'{parquet_path.stem}.incremental-hashes.npy'),
+            parquet_path.with_name(f'{parquet_path.stem}.incremental-numeric.npz'))
+
+
+def _block_hash(fh, start, end):
+    fh.seek(start)
+    return hashlib.blake2b(fh.read(end - start), digest_size=16).hexdigest()
+
+
+def _fingerprint(fh, offset):
+    """Hashes of the first and last blocks before ``offset``"""
+    return (_block_hash(fh, 0, min(offset, HASH_BLOCK_BYTES)),
+            _block_hash(fh, max(0, offset - HASH_BLOCK_BYTES), offset))
+
+
+def _record_end(fh, start, size):
+    """Offset just past the last record-ending newline in [start, size), or ``start`` if there is none
+
+    ``start`` must be a record boundary. A newline ends a record only after
+    an even number of quote characters since ``start``; escaped quotes are
+    doubled and keep the parity.
+    """
+    end, position, quotes = start, start, 0
+    fh.seek(start)
+    while position < size:
+        block = np.frombuffer(fh.read(min(HASH_BLOCK_BYTES, size - position)), dtype=np.uint8)
+        if not block.size:
+            break
+        quoted = (np.cumsum(block == ord('"')) + quotes) % 2 == 1
+        newlines = np.flatnonzero((block == ord('\n')) & ~quoted)
+        if newlines.size:
+            end = position + int(newlines[-1]) + 1
+        quotes += int(np.count_nonzero(block == ord('"')))
+        position += block.size
+    return end
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of an open binary file"""
+
+    def __init__(self, fh, start, end):
+        self._fh = fh
+        self._remaining = end - start
+        fh.seek(start)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._fh.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def read_state(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """The saved state, or None if there is none or it is incomplete"""
+    state_path, hashes_path, numeric_path = state_paths(path, cache_dir)
+    try:
+        with open(state_path, encoding='utf-8') as fh:
+            data = json.load(fh)
+        hashes = np.load(hashes_path)
+        with np.load(numeric_path) as arrays:
+            stored = [arrays[f'arr_{position}'] for position in range(len(arrays.files))]
+    except (FileNotFoundError, ValueError, OSError, KeyError):
+        return None
+    # The JSON is written last; array files from another run do not match it
+    if data.get('format') != STATE_FORMAT or len(hashes) != data['unique_rows']:
+        return None
+    counts = [count for count in data['numeric'].values() if count is not None]
+    if [len(values) for values in stored] != counts:
+        return None
+    stored = iter(stored)
+    numeric = {name: None if count is None else next(stored) for name, count in data['numeric'].items()}
+    return IncrementalState(
+        offset=data['offset'], header=data['header'], columns=data['columns'],
+        head_hash=data['head_hash'], tail_hash=data['tail_hash'],
+        profile=DatasetProfile.from_dict(data['profile']), head=data['head'], hashes=hashes, numeric=numeric,
+    )
+
+
+def save_state(state, path=DATA_FILE, cache_dir=CACHE_DIR):
+    state_path, hashes_path, numeric_path = state_paths(path, cache_dir)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_hashes = hashes_path.with_suffix('.tmp.npy')
+    np.save(tmp_hashes, state.hashes)
+    os.replace(tmp_hashes, hashes_path)
+    tmp_numeric = numeric_path.with_suffix('.tmp.npz')
+    np.savez(tmp_numeric, *[values for values in state.numeric.values() if values is not None])
+    os.replace(tmp_numeric, numeric_path)
+    tmp_path = state_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(state.to_dict(), fh)
+    os.replace(tmp_path, state_path)
+
+
+def _is_append(state, fh, size):
+    if state is None or state.offset == 0 or size < state.offset:
+        return False
+    fh.seek(0)
+    if fh.readline().decode('utf-8', errors='replace') != state.header:
+        return False
+    return _fingerprint(fh, state.offset) == (state.head_hash, state.tail_hash)
+
+
+def _add_hashes(state, hashes):
+    """Merge a chunk's row hashes into the sorted unique set"""
+    new = np.unique(hashes)
+    positions = np.searchsorted(state.hashes, new)
+    inside = positions < len(state.hashes)
+    seen = np.zeros(len(new), dtype=bool)
+    seen[inside] = state.hashes[positions[inside]] == new[inside]
+    state.hashes = np.insert(state.hashes, positions[~seen], new[~seen])
+
+
+def _read_records(state, fh, start, end, chunksize, max_categories):
+    """Fold the records in bytes [start, end) into ``state``; parsing from 0 reads the header too"""
+    stream = io.BufferedReader(_ByteRange(fh, start, end), buffer_size=HASH_BLOCK_BYTES)
+    if start == 0:
+        chunks = pd.read_csv(stream, chunksize=chunksize)
+    else:
+        chunks = pd.read_csv(stream, header=None, names=state.columns, chunksize=chunksize)
+    for chunk in chunks:
+        if not state.columns:
+            state.columns = chunk.columns.tolist()
+        if not state.head:
+            state.head = json_safe_head(chunk)
+        for name, column in state.profile.columns.items():
+            # Keep each column's kind stable across runs
+            if column.kind == 'numeric' and name in chunk:
+                chunk[name] = pd.to_numeric(chunk[name], errors='coerce')
+        state.profile.update(chunk, max_categories)
+        collect_numeric_values(state.numeric, state.profile, chunk)
+        _add_hashes(state, row_hashes(chunk))
+        state.appended_rows += len(chunk)
+
+
+def update_profile_state(path=DATA_FILE, cache_dir=CACHE_DIR, chunksize=PROFILE_CHUNK_ROWS,
+                         max_categories=MAX_CATEGORIES, save=True):
+    """Bring the saved profile state up to date with ``path``, reading only appended rows
+
+    ``mode`` on the result is 'full' (state rebuilt from scratch), 'append'
+    or 'unchanged'; ``appended_rows`` is the number of rows processed.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    with open(path, 'rb') as fh:
+        size = os.fstat(fh.fileno()).st_size
+        state = read_state(path, cache_dir)
+        if _is_append(state, fh, size):
+            state.mode = 'append'
+        else:
+            fh.seek(0)
+            state = IncrementalState(header=fh.readline().decode('utf-8', errors='replace'))
+            state.mode = 'full'
+
+        end = _record_end(fh, state.offset, size)
+        if end > state.offset:
+            _read_records(state, fh, state.offset, end, chunksize, max_categories)
+            state.offset = end
+            state.head_hash, state.tail_hash = _fingerprint(fh, end)
+            if save:
+                save_state(state, path, cache_dir)
+        elif state.mode == 'append':
+            state.mode = 'unchanged'
+
+        if end < size:
+            # The last record has no trailing newline: count it, but only in a copy,
+            # so the saved offset stays at its start and the next run rereads it
+            state = copy.deepcopy(state)
+            _read_records(state, fh, end, size, chunksize, max_categories)
+    return state
@@ -0,0 +1,222 @@
+"""
+Hot-path instrumentation: per-page load, compute and render phases
+
+A ``PageTrace`` times the phases of one page run. Each phase records:
+
+- wall time, and CPU time of the page's own thread (work handed to
+  pools and background jobs shows up as wall time only)
+- peak traced memory, when tracing is on (``tracemalloc`` slows
+  allocation-heavy code and is process-wide, so concurrent sessions can
+  inflate each other's peaks)
+- cache hits and misses, reported by the cache layers themselves through
+  ``count_cache``: the columnar cache, the snapshot, keyword and index
+  files, rendered charts and background jobs
+
+Finished phases go to a ``MetricsRegistry``. The registry keeps the
+recent timings for the dashboard's Performance panel and per-(page,
+phase) latency histograms in the Prometheus text format. It logs every
+phase as one JSON line on the ``chatbot_eda.instrumentation`` logger.
+``serve_metrics`` exposes the registry over HTTP for scraping.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+import time
+import tracemalloc
+
+log = logging.getLogger(__name__)
+
+PHASES = ('load', 'compute', 'render')
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+RECENT_TIMINGS = 2_000
+
+_local = threading.local()
+
+
+@dataclass
+class PhaseTiming:
+    """One timed phase of a page run"""
+
+    page: str
+    phase: str
+    name: str = ''
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_bytes: int = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    started: float = field(default_factory=time.time)
+
+
+def _active():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def count_cache(hit):
+    """Record a cache hit (or miss) in every phase open on this thread"""
+    for timing, _ in _active():
+        if hit:
+            timing.cache_hits += 1
+        else:
+            timing.cache_misses += 1
+
+
+class PageTrace:
+    """Phases of one page run; ``finish`` records them in the registry"""
+
+    def __init__(self, page, registry, trace_memory=False):
+        self.page = page
+        self.registry = registry
+        self.trace_memory = trace_memory
+        self.timings = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._total = self._start('page', '')
+
+    def _start(self, phase, name):
+        timing = PhaseTiming(self.page, phase, name)
+        state = {'wall': time.perf_counter(), 'cpu': time.thread_time(), 'peak': 0}
+        if self.trace_memory and tracemalloc.is_tracing():
+            state['memory'] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        _active().append((timing, state))
+        return timing, state
+
+    def _stop(self, entry):
+        timing, state = entry
+        timing.wall_ms = (time.perf_counter() - state['wall']) * 1000
+        timing.cpu_ms = (time.thread_time() - state['cpu']) * 1000
+        stack = _active()
+        if entry in stack:
+            stack.remove(entry)
+        if 'memory' in state and tracemalloc.is_tracing():
+            # Inner phases reset the peak counter, so carry their peaks outwards
+            peak = max(tracemalloc.get_traced_memory()[1], state['peak'])
+            timing.peak_bytes = max(peak - state['memory'], 0)
+            for _, outer in stack:
+                outer['peak'] = max(outer['peak'], peak)
+        self.timings.append(timing)
+        return timing
+
+    @contextmanager
+    def phase(self, phase, name=''):
+        """Time a block as one phase (``load``, ``compute`` or ``render``)"""
+        entry = self._start(phase, name)
+        try:
+            yield entry[0]
+        finally:
+            self._stop(entry)
+
+    def finish(self):
+        """Close the whole-page timing and record every phase; returns the timings"""
+        self._stop(self._total)
+        for timing in self.timings:
+            self.registry.observe(timing)
+        return self.timings
+
+
+class MetricsRegistry:
+    """Recent phase timings and cumulative per-(page, phase) metrics, shared across sessions"""
+
+    def __init__(self, recent=RECENT_TIMINGS, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.recent = deque(maxlen=recent)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, timing):
+        seconds = timing.wall_ms / 1000
+        with self._lock:
+            self.recent.append(timing)
+            series = self._series.setdefault((timing.page, timing.phase), {
+                'count': 0, 'wall': 0.0, 'cpu': 0.0, 'hits': 0, 'misses': 0, 'peak': 0,
+                'buckets': [0] * len(self.buckets),
+            })
+            series['count'] += 1
+            series['wall'] += seconds
+            series['cpu'] += timing.cpu_ms / 1000
+            series['hits'] += timing.cache_hits
+            series['misses'] += timing.cache_misses
+            series['peak'] = max(series['peak'], timing.peak_bytes or 0)
+            for position, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series['buckets'][position] += 1
+        log.info(json.dumps(asdict(timing), ensure_ascii=False))
+
+    def timings(self, page=None):
+        """Recent timings, newest last, optionally for one page"""
+        with self._lock:
+            return [t for t in self.recent if page is None or t.page == page]
+
+    def prometheus_text(self):
+        """Cumulative metrics in the Prometheus text exposition format"""
+        lines = [
+            '# HELP eda_phase_seconds Wall time of dashboard page phases',
+            '# TYPE eda_phase_seconds histogram',
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+        for (page, phase), values in series:
+            labels = f'page="{_escape(page)}",phase="{phase}"'
+            for bound, count in zip(self.buckets, values['buckets']):
+                lines.append(f'eda_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'eda_phase_seconds_bucket{{{labels},le="+Inf"}} {values["count"]}')
+            lines.append(f'eda_phase_seconds_sum{{{labels}}} {values["wall"]:.6f}')
+            lines.append(f'eda_phase_seconds_count{{{labels}}} {values["count"]}')
+        for metric, key, kind, help_text in (
+            ('eda_phase_cpu_seconds_total', 'cpu', 'counter', 'CPU time of dashboard page phases'),
+            ('eda_cache_hits_total', 'hits', 'counter', 'Cache hits during page phases'),
+            ('eda_cache_misses_total', 'misses', 'counter', 'Cache misses during page phases'),
+            ('eda_phase_peak_bytes', 'peak', 'gauge', 'Largest traced memory peak of a phase'),
+        ):
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+            for (page, phase), values in series:
+                lines.append(f'{metric}{{page="{_escape(page)}",phase="{phase}"}} {values[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+def log_to_file(path):
+    """Append every phase timing to ``path`` as JSON lines"""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    return handler
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def serve_metrics(registry, port, host='0.0.0.0'):
+    """Serve ``/metrics`` (Prometheus) and ``/timings`` (recent JSON) on a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = registry.prometheus_text(), 'text/plain; version=0.0.4'
+            elif self.path == '/timings':
+                body, content_type = json.dumps([asdict(t) for t in registry.timings()]), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,163 @@
+"""
+In-process background job scheduler for expensive dashboard computations
+
+Streamlit runs the page script on the session's thread, so a heavy
+computation freezes the page and a second session repeats it. The
+``JobScheduler`` runs such work on a shared pool instead:
+
+- jobs are identified by a hashable key (e.g. ``('duplicates', version,
+  column, threshold)``); submitting a key that is pending, running or
+  finished returns the existing job, so identical work runs once for
+  every session
+- a job function that takes a ``progress`` argument receives a
+  ``JobProgress``; it can report a fraction, a message and a partial
+  result the page can render while the job is still running
+- finished jobs stay in the scheduler as the shared results cache
+  (least recently used jobs are evicted past ``max_results``)
+- failed jobs keep their exception and are retried on the next submit
+
+Job functions that fan out to worker processes create them with
+``process_pool``. It never forks: a fork of the threaded Streamlit server
+can copy a lock another thread holds (logging, tornado, the import lock)
+and leave the child deadlocked.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+
+from chatbot_eda.instrumentation import count_cache
+
+MAX_RESULTS = 64
+# Fork is never safe from a multi-threaded server; forkserver is unavailable on Windows
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def process_pool(max_workers):
+    """``ProcessPoolExecutor`` whose workers start from a fresh interpreter, never a fork"""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+
+
+@dataclass
+class JobProgress:
+    """Progress handle passed to job functions as ``progress``"""
+
+    fraction: float = 0.0
+    message: str = ''
+    partial: object = None
+
+    def __call__(self, fraction, message='', partial=None):
+        self.fraction = min(max(float(fraction), 0.0), 1.0)
+        if message:
+            self.message = message
+        if partial is not None:
+            self.partial = partial
+
+
+@dataclass
+class Job:
+    """A submitted computation and its progress"""
+
+    key: tuple
+    future: object
+    progress: JobProgress = field(default_factory=JobProgress)
+    submitted: float = field(default_factory=time.time)
+    finished: float = None
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def failed(self):
+        return self.future.done() and not self.future.cancelled() and self.future.exception() is not None
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return 'running' if self.future.running() else 'pending'
+        return 'failed' if self.failed else 'done'
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.submitted
+
+    def result(self):
+        """The job's result; raises its exception if it failed"""
+        return self.future.result()
+
+
+class JobScheduler:
+    """Deduplicating job runner backed by a thread (or process) pool
+
+    Thread pools suit the NumPy/Arrow/pandas work here, which releases the
+    GIL. With ``processes=True`` jobs run in a process pool; their
+    functions must be picklable and do not receive progress updates.
+    """
+
+    def __init__(self, max_workers=None, processes=False, max_results=MAX_RESULTS):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.processes = processes
+        self.max_results = max_results
+        pool = process_pool if processes else ThreadPoolExecutor
+        self._executor = pool(max_workers=self.max_workers)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, **kwargs):
+        """Start ``func(*args, **kwargs)`` under ``key`` unless it is already known"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.failed:
+                self._jobs.move_to_end(key)
+                count_cache(job.done)
+                return job
+            count_cache(False)
+
+            progress = JobProgress()
+            if not self.processes and 'progress' in inspect.signature(func).parameters:
+                kwargs['progress'] = progress
+            job = Job(key=key, future=self._executor.submit(func, *args, **kwargs), progress=progress)
+            job.future.add_done_callback(lambda _: self._finish(job))
+            self._jobs[key] = job
+            self._evict()
+            return job
+
+    def _finish(self, job):
+        job.finished = time.time()
+        if not job.failed:
+            job.progress.fraction = 1.0
+
+    def _evict(self):
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(0, len(self._jobs) - self.max_results)]:
+            del self._jobs[key]
+
+    def get(self, key):
+        """The job for ``key``, or None"""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def jobs(self):
+        """Snapshot of all known jobs, oldest first"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def pending(self):
+        """Jobs that have not finished yet"""
+        return [job for job in self.jobs() if not job.done]
+
+    def forget(self, key):
+        """Drop a finished job so the next submit recomputes it"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.done:
+                del self._jobs[key]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
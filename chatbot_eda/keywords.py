@@ -0,0 +1,298 @@
+"""
+Parallel map-reduce keyword and n-gram frequencies
+
+Map: each worker process tokenizes one chunk of a text column, drops
+stopwords, counts its unigrams/bigrams/trigrams exactly and returns only
+its top candidates plus a count-min sketch of *all* its n-grams.
+
+Reduce: sketches are summed (count-min sketches merge by addition) and
+the candidate sets are unioned. Candidates are ranked by their merged
+sketch estimate, which never undercounts and overcounts by at most
+``e / width`` of the total n-gram count with probability ``1 - e^-depth``.
+Memory stays bounded by the sketch size and ``candidates`` per n,
+whatever the corpus size.
+"""
+
+from functools import lru_cache
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, cache_paths, dataset_version, ensure_cache
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.jobs import process_pool
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+TOKEN_PATTERN = r'[a-z][a-z0-9]+'
+NGRAM_RANGE = (1, 3)
+KEYWORD_CHUNK_ROWS = 20_000
+SKETCH_WIDTH = 1 << 16
+SKETCH_DEPTH = 4
+CANDIDATES = 5_000
+CACHED_TOP_N = 200
+_NGRAM_MULTIPLIER = np.uint64(0x100000001B3)
+
+# Used when the NLTK stopword corpus is not installed and cannot be downloaded
+FALLBACK_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for
+from further had has have having he her here hers herself him himself his how i if in
+into is it its itself just me more most my myself no nor not now of off on once only or
+other our ours ourselves out over own same she should so some such than that the their
+theirs them themselves then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your
+yours yourself yourselves
+""".split())
+
+
+@lru_cache(maxsize=None)
+def load_stopwords(language='english'):
+    """NLTK stopwords, downloading the corpus on first use (see setup.py)"""
+    try:
+        import nltk
+        from nltk.corpus import stopwords
+    except ImportError:
+        return FALLBACK_STOPWORDS
+    try:
+        return frozenset(stopwords.words(language))
+    except LookupError:
+        pass
+    try:
+        nltk.download('stopwords', quiet=True)
+        return frozenset(stopwords.words(language))
+    except Exception:
+        return FALLBACK_STOPWORDS
+
+
+class CountMinSketch:
+    """Count-min sketch over 64-bit keys; sketches with equal shape and seed merge by addition
+
+    ``width`` must be a power of two.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, seed=0, table=None):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+        # Multiply-shift row hashes, as for the MinHash permutations
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, size=(depth, 1), dtype=np.uint64) | np.uint64(1)
+        self._shift = np.uint64(64 - int(np.log2(width)))
+
+    @property
+    def total(self):
+        return int(self.table[0].sum())
+
+    def _buckets(self, keys):
+        return ((self._a * np.asarray(keys, dtype=np.uint64)) >> self._shift).astype(np.int64)
+
+    def add(self, keys, counts):
+        """Add ``counts`` to the given keys (vectorized)"""
+        for row, buckets in enumerate(self._buckets(keys)):
+            self.table[row] += np.bincount(buckets, weights=counts, minlength=self.width).astype(np.int64)
+
+    def estimate(self, keys):
+        """Upper-bound count of each key"""
+        buckets = self._buckets(keys)
+        return np.take_along_axis(self.table, buckets, axis=1).min(axis=0)
+
+    def merge(self, other):
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Count-min sketches must share width, depth and seed to merge")
+        self.table += other.table
+        return self
+
+
+def _combine(hashes):
+    """Order-sensitive 64-bit hash of n token hashes (a list of equal-length arrays)"""
+    combined = hashes[0].copy()
+    for following in hashes[1:]:
+        combined = combined * _NGRAM_MULTIPLIER + following
+    return combined
+
+
+def ngram_hashes(ngrams):
+    """Sketch keys of space-joined n-gram strings"""
+    parts = pd.Series(list(ngrams), dtype=object).str.split(' ', expand=True)
+    if parts.empty:
+        return np.empty(0, dtype=np.uint64)
+    return _combine([pd.util.hash_array(parts[column].to_numpy(dtype=object)) for column in parts])
+
+
+def _ngram_table(texts, ngram_range, stopwords):
+    """Per n: unique n-gram keys, their counts and a decoder to strings
+
+    N-grams are identified by combined token hashes, so counting works on
+    uint64 arrays and only the n-grams that are reported become strings.
+    """
+    tokens = pd.Series(texts).fillna('').astype(str).reset_index(drop=True)
+    tokens = tokens.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    tokens = tokens[~tokens.isin(stopwords)]
+    codes, vocabulary = pd.factorize(tokens.to_numpy(dtype=object))
+    token_hashes = pd.util.hash_array(np.asarray(vocabulary, dtype=object))[codes]
+    docs = tokens.index.to_numpy(dtype=np.int64)
+
+    table = {}
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        span = len(codes) - n + 1
+        if span <= 0:
+            table[n] = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), lambda rows: [])
+            continue
+        # n-grams never cross document boundaries
+        starts = np.flatnonzero(docs[:span] == docs[n - 1:])
+        keys = _combine([token_hashes[starts + offset] for offset in range(n)])
+        keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        keys, first, counts = keys[order], starts[first[order]], counts[order]
+
+        def decode(rows, first=first, n=n):
+            words = [vocabulary[codes[first[rows] + offset]] for offset in range(n)]
+            return [' '.join(gram) for gram in zip(*words)]
+
+        table[n] = (keys, counts, decode)
+    return table
+
+
+def count_ngrams(texts, ngram_range=NGRAM_RANGE, stopwords=FALLBACK_STOPWORDS):
+    """Exact n-gram counts for a batch of texts, as {n: Series(count, index=ngram)}"""
+    return {
+        n: pd.Series(counts, index=decode(np.arange(len(keys))), dtype=np.int64)
+        for n, (keys, counts, decode) in _ngram_table(texts, ngram_range, stopwords).items()
+    }
+
+
+def _map_chunk(texts, ngram_range, stopwords, candidates, width, depth):
+    """Worker: top candidate n-grams and a sketch of every n-gram for one chunk"""
+    partial = {}
+    for n, (keys, counts, decode) in _ngram_table(texts, ngram_range, stopwords).items():
+        sketch = CountMinSketch(width, depth)
+        sketch.add(keys, counts.astype(np.float64))
+        partial[n] = (decode(np.arange(min(candidates, len(keys)))), sketch.table)
+    return partial
+
+
+def _reduce(merged, partial, candidates, width, depth):
+    for n, (terms, table) in partial.items():
+        sketch, pool = merged.setdefault(n, (CountMinSketch(width, depth), set()))
+        sketch.merge(CountMinSketch(width, depth, table=table))
+        pool.update(terms)
+        if len(pool) > 2 * candidates:
+            # Keep the pool bounded: drop candidates ranked low by the sketch
+            ranked = _rank(sketch, pool)
+            pool.intersection_update(ranked.index[:candidates])
+
+
+def _rank(sketch, pool):
+    terms = list(pool)
+    if not terms:
+        return pd.Series(dtype=np.int64)
+    estimates = sketch.estimate(ngram_hashes(terms))
+    return pd.Series(estimates, index=terms).sort_values(ascending=False, kind='stable')
+
+
+def _text_chunks(path, column, cache_dir, chunk_rows):
+    """(texts, rows read so far, total rows or None) per chunk"""
+    if pq is None:
+        read = 0
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=chunk_rows):
+            read += len(chunk)
+            yield chunk[column].tolist(), read, None
+        return
+    parquet_file = pq.ParquetFile(ensure_cache(path, cache_dir))
+    total, read = parquet_file.metadata.num_rows, 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=[column]):
+        read += batch.num_rows
+        yield batch.column(0).to_pylist(), read, total
+
+
+def _top_frames(merged, ngram_range, top_n, width, depth):
+    results = {}
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        sketch, pool = merged.get(n, (CountMinSketch(width, depth), set()))
+        ranked = _rank(sketch, pool).head(top_n)
+        results[n] = pd.DataFrame({'term': ranked.index, 'count': ranked.to_numpy(dtype=np.int64)})
+        results[n].attrs['total'] = sketch.total
+    return results
+
+
+def keyword_frequencies(path=DATA_FILE, column='Patient', ngram_range=NGRAM_RANGE, top_n=50,
+                        workers=None, cache_dir=CACHE_DIR, chunk_rows=KEYWORD_CHUNK_ROWS,
+                        candidates=CANDIDATES, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, stopwords=None,
+                        progress=None):
+    """Top-``top_n`` n-grams of a text column, as {n: DataFrame(term, count)}
+
+    Chunks are counted on a process pool of ``workers`` processes (default:
+    one per CPU; ``workers=1`` counts in-process). At most ``2 * workers``
+    chunks are in flight, so memory does not grow with the file size.
+    ``progress(fraction, message, partial)`` receives the running top terms
+    after each reduced chunk.
+    """
+    stopwords = frozenset(stopwords) if stopwords is not None else load_stopwords()
+    args = (ngram_range, stopwords, candidates, width, depth)
+    merged = {}
+    chunks = _text_chunks(path, column, cache_dir, chunk_rows)
+    workers = workers or os.cpu_count() or 1
+
+    def reduce(partial, read, total):
+        _reduce(merged, partial, candidates, width, depth)
+        if progress is not None:
+            progress(read / total if total else 0.0, f"{read:,} rows counted",
+                     _top_frames(merged, ngram_range, top_n, width, depth))
+
+    if workers == 1:
+        for texts, read, total in chunks:
+            reduce(_map_chunk(texts, *args), read, total)
+    else:
+        with process_pool(workers) as pool:
+            pending = []
+            for texts, read, total in chunks:
+                pending.append((pool.submit(_map_chunk, texts, *args), read, total))
+                if len(pending) >= 2 * workers:
+                    future, read, total = pending.pop(0)
+                    reduce(future.result(), read, total)
+            for future, read, total in pending:
+                reduce(future.result(), read, total)
+
+    return _top_frames(merged, ngram_range, top_n, width, depth)
+
+
+def keywords_path(column, path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """JSON file holding the cached keyword results for a column and dataset version"""
+    version = version or dataset_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.keywords-{column}-{version}.json')
+
+
+def load_or_compute_keywords(column, path=DATA_FILE, cache_dir=CACHE_DIR, workers=None, progress=None):
+    """Cached ``keyword_frequencies`` (top CACHED_TOP_N per n) for a column"""
+    target = keywords_path(column, path, cache_dir)
+    count_cache(target.exists())
+    if target.exists():
+        with open(target, encoding='utf-8') as fh:
+            stored = json.load(fh)
+    else:
+        results = keyword_frequencies(path, column, top_n=CACHED_TOP_N, workers=workers,
+                                      cache_dir=cache_dir, progress=progress)
+        stored = {
+            str(n): {'terms': frame['term'].tolist(), 'counts': frame['count'].tolist(),
+                     'total': frame.attrs['total']}
+            for n, frame in results.items()
+        }
+        tmp_path = target.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(stored, fh)
+        os.replace(tmp_path, target)
+
+    frames = {}
+    for n, entry in stored.items():
+        frame = pd.DataFrame({'term': entry['terms'], 'count': entry['counts']})
+        frame.attrs['total'] = entry['total']
+        frames[int(n)] = frame
+    return frames
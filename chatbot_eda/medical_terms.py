@@ -0,0 +1,792 @@
+"""
+Dictionary-based medical term extraction: diseases, symptoms and drugs
+
+Every text column of a row is scanned once against the whole term
+dictionary with a multi-pattern matcher, so the cost does not grow with
+the number of terms:
+
+    pyahocorasick installed   an Aho-Corasick automaton over the
+                              normalized text of each document
+    otherwise                 every token n-gram up to the longest term
+                              is hashed and joined against the
+                              dictionary's hashes (vectorized, one pass
+                              per n-gram length)
+
+Both find the same matches: every dictionary term on token boundaries,
+including terms nested in longer ones ("chest pain" also counts "pain").
+Synonyms count towards their canonical term.
+
+Chunks of rows are matched on a process pool (map); mention counts, row
+counts and term co-occurrence within a row are summed (reduce). Results
+are cached per dataset version and dictionary.
+"""
+
+import csv
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, cache_paths, dataset_info, dataset_version, ensure_cache
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.jobs import process_pool
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+TOKEN_PATTERN = r'[a-z0-9]+'
+TERM_CHUNK_ROWS = 20_000
+PAIR_BLOCK_ROWS = 4_096
+CACHED_PAIRS = 500
+# Bumped when matching changes, so cached results are recomputed
+TERMS_FORMAT = 2
+CATEGORIES = ('disease', 'symptom', 'drug')
+_TERM_MULTIPLIER = np.uint64(0x100000001B3)
+
+# One entry per line: canonical term first, then synonyms, separated by "|"
+DISEASES = """
+diabetes|diabetic|diabetes mellitus|type 1 diabetes|type 2 diabetes|high sugar|high blood sugar
+hypertension|high blood pressure|high bp|hypertensive
+hypotension|low blood pressure|low bp
+hypothyroidism|underactive thyroid|low thyroid
+hyperthyroidism|overactive thyroid|graves disease
+thyroid disorder|thyroid problem|thyroid disease|goitre|goiter
+asthma|asthmatic|bronchial asthma
+copd|chronic obstructive pulmonary disease|emphysema|chronic bronchitis
+bronchitis
+pneumonia
+tuberculosis|tb|koch disease
+covid 19|covid|coronavirus|sars cov 2
+influenza|flu
+common cold|cold
+sinusitis|sinus infection|sinus
+tonsillitis|tonsils
+pharyngitis|sore throat infection|strep throat
+otitis media|ear infection
+conjunctivitis|pink eye|eye infection
+cataract
+glaucoma
+migraine|migraines
+epilepsy|seizure disorder|epileptic
+stroke|brain stroke|cerebrovascular accident|paralysis
+parkinson disease|parkinsons|parkinson
+alzheimer disease|alzheimers|dementia
+multiple sclerosis
+meningitis
+vertigo|bppv
+bell palsy|facial palsy
+neuropathy|peripheral neuropathy|nerve damage
+sciatica
+cervical spondylosis|spondylosis
+slip disc|slipped disc|disc prolapse|herniated disc|disc bulge
+arthritis|osteoarthritis|joint arthritis
+rheumatoid arthritis|ra factor
+gout|high uric acid|uric acid
+osteoporosis|bone loss
+fracture|broken bone|hairline fracture
+ligament tear|acl tear|ligament injury
+coronary artery disease|heart disease|cad|blocked arteries|heart blockage
+heart attack|myocardial infarction|cardiac arrest
+heart failure|cardiac failure
+arrhythmia|irregular heartbeat|atrial fibrillation
+angina
+anemia|anaemia|low hemoglobin|low haemoglobin|iron deficiency
+thalassemia|thalassaemia
+leukemia|leukaemia|blood cancer
+lymphoma
+cancer|malignancy|carcinoma|tumor|tumour
+breast cancer
+cervical cancer
+lung cancer
+oral cancer|mouth cancer
+gastritis
+acid reflux|gerd|reflux|heartburn|hyperacidity
+peptic ulcer|stomach ulcer|ulcer|ulcers
+irritable bowel syndrome|ibs
+inflammatory bowel disease|crohn disease|ulcerative colitis|colitis
+gastroenteritis|stomach flu|food poisoning
+hemorrhoids|piles|haemorrhoids
+anal fissure|fissure
+fistula
+hernia|inguinal hernia|umbilical hernia
+appendicitis
+gallstones|gall stones|gallbladder stones|cholelithiasis
+fatty liver|fatty liver disease|nafld
+hepatitis|hepatitis b|hepatitis c|jaundice
+cirrhosis|liver cirrhosis
+pancreatitis
+kidney stones|kidney stone|renal stones|renal calculi|stone in kidney
+kidney disease|chronic kidney disease|ckd|renal failure|kidney failure
+urinary tract infection|uti|urine infection|bladder infection
+prostate enlargement|enlarged prostate|bph|prostatitis
+erectile dysfunction|impotence
+premature ejaculation
+male infertility|low sperm count|oligospermia
+infertility
+polycystic ovary syndrome|pcos|pcod|polycystic ovaries
+endometriosis
+fibroids|uterine fibroids|fibroid
+ovarian cyst|ovarian cysts|cyst in ovary
+menstrual disorder|irregular periods|irregular menses|menstrual irregularity
+amenorrhea|missed period|missed periods
+vaginal infection|yeast infection|candidiasis|vaginitis
+bacterial vaginosis
+sexually transmitted infection|std|sti
+hiv|aids
+herpes|genital herpes|cold sores
+genital warts|hpv
+syphilis
+gonorrhea
+chlamydia
+psoriasis
+eczema|atopic dermatitis|dermatitis
+acne|pimples|pimple|acne vulgaris
+fungal infection|ringworm|tinea|jock itch
+scabies
+urticaria|hives
+vitiligo|white patches
+hair loss|alopecia|hair fall|baldness
+dandruff|seborrheic dermatitis
+warts|wart
+cellulitis
+abscess|boil|boils
+allergy|allergies|allergic reaction|allergic
+allergic rhinitis|hay fever
+chickenpox|chicken pox|varicella
+shingles|herpes zoster
+measles
+mumps
+dengue|dengue fever
+malaria
+typhoid|typhoid fever|enteric fever
+cholera
+obesity|overweight
+malnutrition|underweight
+vitamin d deficiency|low vitamin d
+vitamin b12 deficiency|low b12|b12 deficiency
+high cholesterol|hypercholesterolemia|hyperlipidemia|high triglycerides
+depression|depressed|depressive disorder
+anxiety|anxiety disorder|panic attack|panic attacks|panic disorder
+bipolar disorder|bipolar
+schizophrenia
+obsessive compulsive disorder|ocd
+adhd|attention deficit
+autism|autistic
+insomnia|sleeplessness
+sleep apnea|sleep apnoea
+dental caries|tooth decay|cavity|cavities
+gingivitis|gum disease|periodontitis|bleeding gums
+wisdom tooth|impacted tooth
+"""
+
+SYMPTOMS = """
+pain|pains|ache|aches|painful
+headache|head ache|headaches|head pain
+chest pain|pain in chest|chest tightness
+back pain|backache|lower back pain|pain in back
+neck pain|stiff neck
+knee pain|pain in knee|knee ache
+joint pain|joint pains|arthralgia
+abdominal pain|stomach pain|stomach ache|pain in abdomen|tummy pain|abdomen pain
+pelvic pain
+muscle pain|body pain|body ache|body aches|myalgia
+toothache|tooth pain
+ear pain|earache
+eye pain
+painful urination|burning urination|burning micturition|pain while urinating
+fever|high temperature|temperature|feverish|pyrexia
+chills|shivering
+cough|coughing|dry cough|wet cough
+sore throat|throat pain|throat irritation
+runny nose|running nose|nasal discharge
+nasal congestion|blocked nose|stuffy nose
+sneezing
+shortness of breath|breathlessness|difficulty breathing|breathing difficulty|dyspnea
+wheezing
+palpitations|palpitation|racing heart|fast heartbeat
+fatigue|tiredness|tired|exhaustion
+weakness|weak
+dizziness|dizzy|lightheadedness|giddiness
+fainting|syncope|blackout
+nausea|nauseous|queasy
+vomiting|vomit|throwing up
+diarrhea|diarrhoea|loose motions|loose stools
+constipation|hard stools
+bloating|gas|flatulence|bloated
+indigestion|dyspepsia
+loss of appetite|poor appetite|no appetite
+weight loss|losing weight
+weight gain|gaining weight
+blood in stool|bloody stool|rectal bleeding
+blood in urine|hematuria
+frequent urination|urinating frequently|polyuria
+excessive thirst|polydipsia
+itching|itchy|itch|pruritus
+rash|rashes|skin rash
+redness|red spots
+swelling|swollen|edema|oedema
+lump|lumps|nodule
+bruising|bruises
+bleeding
+numbness|numb
+tingling|pins and needles
+tremor|tremors|shaking hands
+muscle cramps|cramps|cramping
+stiffness|stiff joints
+blurred vision|blurry vision|vision problem
+watery eyes|eye discharge
+ringing in ears|tinnitus
+hearing loss
+hoarseness|hoarse voice
+difficulty swallowing|dysphagia
+mouth ulcers|mouth ulcer|canker sores
+bad breath|halitosis
+hair thinning
+dry skin
+excessive sweating|sweating|hyperhidrosis|night sweats
+hot flashes|hot flushes
+irregular heartbeat
+high heart rate|tachycardia
+low heart rate|bradycardia
+memory loss|forgetfulness
+confusion
+mood swings
+irritability
+stress|stressed
+sleep problems|disturbed sleep|cannot sleep|not sleeping
+snoring
+heavy bleeding|heavy periods|menorrhagia
+painful periods|period pain|menstrual cramps|dysmenorrhea
+white discharge|vaginal discharge|leucorrhea
+spotting
+burning sensation|burning
+discharge
+inflammation|inflamed
+infection|infections|infected
+"""
+
+DRUGS = """
+paracetamol|acetaminophen|crocin|dolo|calpol|tylenol
+ibuprofen|brufen|advil|motrin
+diclofenac|voveran|voltaren
+aspirin|ecosprin|disprin
+naproxen
+aceclofenac
+nimesulide
+tramadol
+codeine
+morphine
+amoxicillin|amoxycillin|mox|novamox
+amoxicillin clavulanate|augmentin|amoxiclav|clavam
+azithromycin|azithral|zithromax|azee
+ciprofloxacin|ciplox|cipro
+ofloxacin|oflox
+levofloxacin|levoflox
+doxycycline|doxy
+metronidazole|flagyl|metrogyl
+cefixime|taxim o|zifi
+cephalexin|cefalexin
+clarithromycin
+nitrofurantoin
+linezolid
+fluconazole|forcan|diflucan
+itraconazole
+terbinafine
+clotrimazole
+ketoconazole
+acyclovir|aciclovir|zovirax
+valacyclovir|valtrex
+oseltamivir|tamiflu
+ivermectin
+albendazole|zentel
+mebendazole
+hydroxychloroquine|hcqs|plaquenil
+chloroquine
+metformin|glycomet|glucophage
+glimepiride|amaryl
+gliclazide
+sitagliptin|januvia
+vildagliptin|galvus
+insulin|insulin injection|mixtard|lantus
+amlodipine|amlong|norvasc
+telmisartan|telma
+losartan|losar|cozaar
+olmesartan
+atenolol|tenormin
+metoprolol|metolar|betaloc
+propranolol|inderal
+ramipril
+enalapril
+hydrochlorothiazide|hctz
+furosemide|lasix
+spironolactone|aldactone
+atorvastatin|atorva|lipitor
+rosuvastatin|rosuvas|crestor
+clopidogrel|clopilet|plavix
+warfarin
+heparin
+levothyroxine|thyroxine|thyronorm|eltroxin|synthroid
+carbimazole|methimazole
+omeprazole|omez|prilosec
+pantoprazole|pan 40|pantocid|pan d
+rabeprazole|razo|rabekind
+esomeprazole|nexium
+ranitidine|rantac|zantac
+famotidine
+domperidone|domstal
+ondansetron|emeset|zofran|ondem
+antacid|antacids|digene|gelusil|eno
+loperamide|imodium
+lactulose|duphalac
+bisacodyl|dulcolax
+isabgol|psyllium|ispaghula
+oral rehydration salts|ors|electral
+probiotic|probiotics
+cetirizine|cetzine|zyrtec|okacet
+levocetirizine|levocet|xyzal
+fexofenadine|allegra
+loratadine|claritin
+montelukast|montair|singulair
+chlorpheniramine|avil
+salbutamol|albuterol|asthalin|ventolin
+budesonide|budecort
+formoterol
+prednisolone|wysolone|omnacortil
+prednisone
+dexamethasone|decadron
+methylprednisolone|medrol
+hydrocortisone
+betamethasone|betnovate
+mometasone
+clobetasol|tenovate
+sertraline|zoloft
+escitalopram|nexito|lexapro
+fluoxetine|prozac
+paroxetine
+amitriptyline
+alprazolam|alprax|xanax
+clonazepam|clonotril|rivotril
+lorazepam|ativan
+diazepam|valium
+zolpidem|ambien
+quetiapine|seroquel
+olanzapine
+risperidone
+lithium
+gabapentin
+pregabalin|lyrica|pregalin
+levetiracetam|levipil|keppra
+sodium valproate|valproate|valparin
+phenytoin|dilantin|eptoin
+carbamazepine|tegretol
+sumatriptan
+flunarizine|sibelium
+betahistine|vertin
+cinnarizine|stugeron
+vitamin d3|cholecalciferol|calcirol|uprise d3
+vitamin b12|methylcobalamin|mecobalamin|cobalamin
+vitamin c|ascorbic acid|limcee
+folic acid|folate
+iron supplement|ferrous sulfate|iron tablets|ferrous ascorbate
+calcium supplement|calcium tablets|shelcal|calcium carbonate
+multivitamin|multivitamins|becosules|supradyn
+zinc|zinc supplement
+oral contraceptive|birth control pill|contraceptive pill|ocp|ocps
+emergency contraceptive|ipill|i pill|unwanted 72|morning after pill
+progesterone|duphaston|dydrogesterone
+letrozole|letroz
+clomiphene|clomid|siphene
+estrogen|estradiol
+sildenafil|viagra|manforce
+tadalafil|cialis|tadacip
+dapoxetine
+finasteride|propecia
+minoxidil|rogaine
+tamsulosin|urimax|flomax
+isotretinoin|isotroin|accutane
+tretinoin|retino a
+adapalene|adapen|differin
+benzoyl peroxide|persol
+clindamycin|clindac
+mupirocin|t bact|bactroban
+permethrin|permite|scabper
+calamine|calamine lotion
+hydroxyzine|atarax
+"""
+
+
+@dataclass
+class TermDictionary:
+    """Canonical terms with their categories, and the normalized surface forms that map to them"""
+
+    names: list
+    categories: list
+    surfaces: dict
+
+    @property
+    def fingerprint(self):
+        # Cached results are keyed by the dictionary as well as the dataset version
+        payload = json.dumps([self.names, self.categories, sorted(self.surfaces.items())])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def max_tokens(self):
+        return max((len(surface.split()) for surface in self.surfaces), default=0)
+
+
+def normalize(texts):
+    """Lowercased token strings joined by single spaces, as matched against the dictionary"""
+    series = pd.Series(texts, dtype=object).fillna('').astype(str)
+    return series.str.lower().str.findall(TOKEN_PATTERN).str.join(' ')
+
+
+def tokenize(texts):
+    """(document position, token code) of every token in ``texts``, and the token vocabulary"""
+    if pc is not None:
+        # Arrow's regex split runs in C++; same tokens as TOKEN_PATTERN
+        lists = pc.split_pattern_regex(pc.utf8_lower(pa.array(texts, type=pa.string())), r'[^a-z0-9]+')
+        tokens, docs = pc.list_flatten(lists), pc.list_parent_indices(lists)
+        nonempty = pc.not_equal(tokens, '')
+        encoded = pc.filter(tokens, nonempty).dictionary_encode()
+        return (pc.filter(docs, nonempty).to_numpy().astype(np.int64), encoded.indices.to_numpy(),
+                encoded.dictionary.to_numpy(zero_copy_only=False).astype(object))
+    tokens = pd.Series(texts, dtype=object).fillna('').astype(str).str.lower().str.findall(TOKEN_PATTERN)
+    tokens = tokens.reset_index(drop=True).explode().dropna()
+    codes, vocabulary = pd.factorize(tokens.to_numpy(dtype=object))
+    return tokens.index.to_numpy(dtype=np.int64), codes, np.asarray(vocabulary, dtype=object)
+
+
+def _add_entries(names, categories, surfaces, entries, category):
+    ids = {name: term_id for term_id, name in enumerate(names)}
+    for entry in entries:
+        forms = [form for form in normalize(entry.split('|')).tolist() if form]
+        if not forms:
+            continue
+        if forms[0] in ids:
+            term_id = ids[forms[0]]
+            categories[term_id] = category
+        else:
+            term_id = ids[forms[0]] = len(names)
+            names.append(forms[0])
+            categories.append(category)
+        for form in forms:
+            surfaces[form] = term_id
+
+
+def load_dictionary(terms_file=None, builtin=True):
+    """The built-in dictionary, extended (or overridden) by a CSV of ``term,category[,synonyms]``
+
+    ``synonyms`` are separated by "|". A surface form listed twice maps to
+    the last entry, so a terms file can recategorize built-in terms.
+    """
+    names, categories, surfaces = [], [], {}
+    if builtin:
+        for category, block in zip(CATEGORIES, (DISEASES, SYMPTOMS, DRUGS)):
+            _add_entries(names, categories, surfaces, block.strip().splitlines(), category)
+    if terms_file:
+        with open(terms_file, newline='', encoding='utf-8') as fh:
+            for row in csv.DictReader(fh):
+                entry = '|'.join([row['term']] + [s for s in (row.get('synonyms') or '').split('|') if s])
+                _add_entries(names, categories, surfaces, [entry], row['category'].strip().lower())
+    return TermDictionary(names, categories, surfaces)
+
+
+# ============================================================================
+# MATCHERS
+# ============================================================================
+# Both return (document position, term id) of every match in a batch of texts.
+# Nested synonyms of one term ("type 2 diabetes", "diabetes") overlap; each
+# span of overlapping matches of a term counts as one mention.
+
+
+def _one_per_span(docs, terms, starts, ends):
+    """Keep the leftmost (longest) match of each run of overlapping [start, end) matches of a term"""
+    if docs.size < 2:
+        return docs, terms
+    order = np.lexsort((-ends, starts, terms, docs))
+    docs, terms, starts, ends = docs[order], terms[order], starts[order], ends[order]
+    group = np.concatenate([[0], np.cumsum((docs[1:] != docs[:-1]) | (terms[1:] != terms[:-1]))])
+    # Offsetting by group keeps the running furthest end from leaking across (doc, term) groups
+    width = int(ends.max()) + 1
+    reach = np.maximum.accumulate(group * width + ends)
+    keep = np.ones(docs.size, dtype=bool)
+    keep[1:] = group[1:] * width + starts[1:] >= reach[:-1]
+    return docs[keep], terms[keep]
+
+
+class AhoCorasickMatcher:
+    """pyahocorasick automaton over space-padded surface forms (token boundaries)"""
+
+    name = 'Aho-Corasick'
+
+    def __init__(self, dictionary):
+        self.automaton = ahocorasick.Automaton()
+        for surface, term_id in dictionary.surfaces.items():
+            self.automaton.add_word(f' {surface} ', (term_id, len(surface)))
+        self.automaton.make_automaton()
+
+    def find(self, texts):
+        docs, terms, ends, lengths = [], [], [], []
+        for position, document in enumerate(normalize(texts)):
+            for end, (term_id, length) in self.automaton.iter(f' {document} '):
+                docs.append(position)
+                terms.append(term_id)
+                # ``end`` is the padding space after the surface form
+                ends.append(end)
+                lengths.append(length)
+        ends = np.asarray(ends, dtype=np.int64)
+        return _one_per_span(np.asarray(docs, dtype=np.int64), np.asarray(terms, dtype=np.int64),
+                             ends - np.asarray(lengths, dtype=np.int64), ends)
+
+
+def _combine(hashes):
+    combined = hashes[0].copy()
+    for following in hashes[1:]:
+        combined = combined * _TERM_MULTIPLIER + following
+    return combined
+
+
+class HashedNgramMatcher:
+    """Token n-gram hashes joined against the dictionary's, one vectorized pass per length"""
+
+    name = 'hashed n-grams'
+
+    def __init__(self, dictionary):
+        surfaces = pd.Series(list(dictionary.surfaces), dtype=object)
+        term_ids = np.fromiter(dictionary.surfaces.values(), dtype=np.int64, count=len(surfaces))
+        lengths = surfaces.str.count(' ').to_numpy() + 1
+        self.lookup = {}
+        for n in np.unique(lengths):
+            parts = surfaces[lengths == n].str.split(' ', expand=True)
+            keys = _combine([pd.util.hash_array(parts[column].to_numpy(dtype=object)) for column in parts])
+            order = np.argsort(keys)
+            self.lookup[int(n)] = (keys[order], term_ids[lengths == n][order])
+        self.term_tokens = pd.util.hash_array(np.unique(surfaces.str.split(' ').explode().to_numpy(dtype=object)))
+
+    def find(self, texts):
+        docs, codes, vocabulary = tokenize(texts)
+        vocabulary_hashes = pd.util.hash_array(vocabulary)
+        token_hashes = vocabulary_hashes[codes]
+        # Only n-grams made entirely of tokens that occur in some term can match
+        known = np.isin(vocabulary_hashes, self.term_tokens)[codes]
+        found_docs, found_terms, found_starts, found_ends = [], [], [], []
+        for n, (keys, term_ids) in self.lookup.items():
+            span = len(docs) - n + 1
+            if span <= 0:
+                continue
+            # n-grams never cross document boundaries
+            starts = np.flatnonzero(known[:span] & (docs[:span] == docs[n - 1:]))
+            for offset in range(1, n):
+                starts = starts[known[starts + offset]]
+            grams = _combine([token_hashes[starts + offset] for offset in range(n)])
+            slots = np.minimum(np.searchsorted(keys, grams), len(keys) - 1)
+            hits = keys[slots] == grams
+            found_docs.append(docs[starts[hits]])
+            found_terms.append(term_ids[slots[hits]])
+            found_starts.append(starts[hits])
+            found_ends.append(starts[hits] + n)
+        if not found_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return _one_per_span(np.concatenate(found_docs), np.concatenate(found_terms),
+                             np.concatenate(found_starts), np.concatenate(found_ends))
+
+
+def make_matcher(dictionary):
+    return AhoCorasickMatcher(dictionary) if ahocorasick is not None else HashedNgramMatcher(dictionary)
+
+
+# ============================================================================
+# MAP / REDUCE
+# ============================================================================
+
+_matchers = {}
+
+
+def _worker_matcher(dictionary):
+    # Built once per process and dictionary, not once per chunk
+    key = dictionary.fingerprint
+    if key not in _matchers:
+        _matchers.clear()
+        _matchers[key] = make_matcher(dictionary)
+    return _matchers[key]
+
+
+def _pair_counts(rows, term_ids, num_rows):
+    """Rows mentioning each pair of terms, as (a * 2**32 + b keys with a < b, counts)"""
+    present, local = np.unique(term_ids, return_inverse=True)
+    pairs = np.zeros((len(present), len(present)), dtype=np.int64)
+    # Row x term incidence, a block of rows at a time; its Gram matrix counts pairs
+    bounds = np.searchsorted(rows, np.arange(0, num_rows + PAIR_BLOCK_ROWS, PAIR_BLOCK_ROWS))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start == stop:
+            continue
+        incidence = np.zeros((rows[stop - 1] - rows[start] + 1, len(present)), dtype=np.float32)
+        incidence[rows[start:stop] - rows[start], local[start:stop]] = 1.0
+        pairs += (incidence.T @ incidence).astype(np.int64)
+    first, second = np.nonzero(np.triu(pairs, 1))
+    return (present[first] << 32) | present[second], pairs[first, second]
+
+
+def _map_chunk(columns, dictionary):
+    """Worker: per-column mentions, rows per term and pair counts for one chunk of rows"""
+    matcher = _worker_matcher(dictionary)
+    num_terms = len(dictionary.names)
+    num_rows = len(next(iter(columns.values()))) if columns else 0
+    mentions = np.zeros((len(columns), num_terms), dtype=np.int64)
+    all_docs, all_terms = [], []
+    for position, texts in enumerate(columns.values()):
+        docs, terms = matcher.find(texts)
+        mentions[position] = np.bincount(terms, minlength=num_terms)
+        all_docs.append(docs)
+        all_terms.append(terms)
+    # A row mentions a term once, whichever columns it appears in
+    incidence = np.unique((np.concatenate(all_docs or [[]]).astype(np.int64) << 32)
+                          | np.concatenate(all_terms or [[]]).astype(np.int64))
+    rows, term_ids = incidence >> 32, incidence & 0xFFFFFFFF
+    pair_keys, pair_counts = _pair_counts(rows, term_ids, num_rows)
+    return {'rows': num_rows, 'matched_rows': len(np.unique(rows)), 'mentions': mentions,
+            'term_rows': np.bincount(term_ids, minlength=num_terms),
+            'pairs': pd.Series(pair_counts, index=pair_keys, dtype=np.int64)}
+
+
+def _reduce(merged, partial):
+    if not merged:
+        merged.update(partial)
+        return
+    for key in ('rows', 'matched_rows', 'mentions', 'term_rows'):
+        merged[key] = merged[key] + partial[key]
+    merged['pairs'] = merged['pairs'].add(partial['pairs'], fill_value=0).astype(np.int64)
+
+
+@dataclass
+class MedicalTerms:
+    """Term frequencies and co-occurrence of a dictionary over the text columns"""
+
+    columns: list
+    num_rows: int
+    matched_rows: int
+    terms: pd.DataFrame
+    pairs: pd.DataFrame
+    matcher: str
+
+    def to_dict(self):
+        return {'columns': self.columns, 'num_rows': self.num_rows, 'matched_rows': self.matched_rows,
+                'terms': self.terms.to_dict('list'), 'pairs': self.pairs.to_dict('list'),
+                'matcher': self.matcher}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['columns'], data['num_rows'], data['matched_rows'], pd.DataFrame(data['terms']),
+                   pd.DataFrame(data['pairs']), data['matcher'])
+
+
+def _results(merged, columns, dictionary, matcher_name, max_pairs=CACHED_PAIRS):
+    """Terms found at least once (most rows first) and the ``max_pairs`` most frequent pairs"""
+    terms = pd.DataFrame({'term': dictionary.names, 'category': dictionary.categories,
+                          'rows': merged['term_rows'], 'mentions': merged['mentions'].sum(axis=0)})
+    for position, column in enumerate(columns):
+        terms[column] = merged['mentions'][position]
+    terms = terms[terms['mentions'] > 0].sort_values(['rows', 'mentions'], ascending=False, kind='stable')
+
+    pairs = merged['pairs'].sort_values(ascending=False, kind='stable').head(max_pairs)
+    keys = pairs.index.to_numpy(dtype=np.int64)
+    names = np.asarray(dictionary.names, dtype=object)
+    pairs = pd.DataFrame({'term_a': names[keys >> 32], 'term_b': names[keys & 0xFFFFFFFF],
+                          'rows': pairs.to_numpy(dtype=np.int64)})
+    return MedicalTerms(list(columns), int(merged['rows']), int(merged['matched_rows']),
+                        terms.reset_index(drop=True), pairs, matcher_name)
+
+
+def _row_chunks(path, columns, cache_dir, chunk_rows):
+    """({column: texts}, rows read so far, total rows or None) per chunk"""
+    if pq is None:
+        read = 0
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+            read += len(chunk)
+            yield {column: chunk[column].tolist() for column in columns}, read, None
+        return
+    parquet_file = pq.ParquetFile(ensure_cache(path, cache_dir))
+    total, read = parquet_file.metadata.num_rows, 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        read += batch.num_rows
+        yield {column: batch.column(column).to_pylist() for column in columns}, read, total
+
+
+def extract_terms(path=DATA_FILE, columns=None, dictionary=None, workers=None, cache_dir=CACHE_DIR,
+                  chunk_rows=TERM_CHUNK_ROWS, progress=None):
+    """Medical term frequencies and co-occurrence over ``columns`` (default: every text column)
+
+    Chunks are matched on a process pool of ``workers`` processes (default:
+    one per CPU; ``workers=1`` matches in-process), at most ``2 * workers``
+    in flight. ``progress(fraction, message, partial)`` receives the running
+    results after each reduced chunk.
+    """
+    columns = columns or dataset_info(path, cache_dir)['text_columns']
+    dictionary = dictionary or load_dictionary()
+    matcher_name = (AhoCorasickMatcher if ahocorasick is not None else HashedNgramMatcher).name
+    merged = {}
+    chunks = _row_chunks(path, columns, cache_dir, chunk_rows)
+    workers = workers or os.cpu_count() or 1
+
+    def reduce(partial, read, total):
+        _reduce(merged, partial)
+        if progress is not None:
+            progress(read / total if total else 0.0, f"{read:,} rows matched",
+                     _results(merged, columns, dictionary, matcher_name))
+
+    if workers == 1:
+        for texts, read, total in chunks:
+            reduce(_map_chunk(texts, dictionary), read, total)
+    else:
+        with process_pool(workers) as pool:
+            pending = []
+            for texts, read, total in chunks:
+                pending.append((pool.submit(_map_chunk, texts, dictionary), read, total))
+                if len(pending) >= 2 * workers:
+                    future, read, total = pending.pop(0)
+                    reduce(future.result(), read, total)
+            for future, read, total in pending:
+                reduce(future.result(), read, total)
+
+    if not merged:
+        merged = _map_chunk({column: [] for column in columns}, dictionary)
+    return _results(merged, columns, dictionary, matcher_name)
+
+
+def medical_terms_path(path=DATA_FILE, cache_dir=CACHE_DIR, version=None, fingerprint=None):
+    """JSON file holding cached term results for a dataset version and dictionary"""
+    version = version or dataset_version(path, cache_dir)
+    fingerprint = fingerprint or load_dictionary().fingerprint
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.medical-terms-{version}-{fingerprint}.v{TERMS_FORMAT}.json')
+
+
+def load_or_extract_terms(path=DATA_FILE, cache_dir=CACHE_DIR, terms_file=None, workers=None, progress=None):
+    """Cached ``extract_terms`` over every text column, with the dictionary of ``load_dictionary``"""
+    dictionary = load_dictionary(terms_file)
+    target = medical_terms_path(path, cache_dir, fingerprint=dictionary.fingerprint)
+    count_cache(target.exists())
+    if target.exists():
+        with open(target, encoding='utf-8') as fh:
+            return MedicalTerms.from_dict(json.load(fh))
+
+    results = extract_terms(path, dictionary=dictionary, workers=workers, cache_dir=cache_dir, progress=progress)
+    tmp_path = target.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(results.to_dict(), fh)
+    os.replace(tmp_path, target)
+    return results
@@ -0,0 +1,366 @@
+"""
+Single-pass streaming profiler for the medical chatbot CSV
+
+Reads the CSV in bounded-size chunks and folds every chunk into mergeable
+accumulators: null and row counts, character/word-count moments and
+histograms for text columns, moments for numeric columns and category
+frequencies. Peak memory is set by the chunk size, the histogram caps and
+``max_categories`` - not by the size of the file.
+
+Category frequencies are exact until a column has more than
+``max_categories`` distinct values, and are not kept at all for text
+columns whose first chunk looks like IDs or free text. Every column also
+feeds the sketches from ``chatbot_eda.sketches`` (HyperLogLog distinct
+count, Space-Saving heavy hitters and, for numeric columns, a KLL
+quantile sketch), which take over once exact counting is dropped.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.column_types import worth_tallying
+from chatbot_eda.data_cache import DATA_FILE
+from chatbot_eda.sketches import HyperLogLog, KLLSketch, SpaceSaving, hash_values
+from chatbot_eda.text_stats import compute_text_stats
+
+PROFILE_CHUNK_ROWS = 20_000
+MAX_CATEGORIES = 50_000
+HEAD_ROWS = 5
+CHAR_HIST_CAP = 20_000
+WORD_HIST_CAP = 4_000
+EXACT_NUMERIC_ROWS = 1_000_000
+
+
+@dataclass
+class RunningMoments:
+    """Count, mean, variance and range, merged with Chan's parallel update"""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = float('inf')
+    max: float = float('-inf')
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return self
+        batch_mean = values.mean()
+        batch = RunningMoments(
+            count=int(values.size),
+            mean=float(batch_mean),
+            m2=float(((values - batch_mean) ** 2).sum()),
+            min=float(values.min()),
+            max=float(values.max()),
+        )
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min if self.count else None,
+                'max': self.max if self.count else None}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            count=data['count'], mean=data['mean'], m2=data['m2'],
+            min=float('inf') if data['min'] is None else data['min'],
+            max=float('-inf') if data['max'] is None else data['max'],
+        )
+
+
+@dataclass
+class LengthHistogram:
+    """Exact unit-width histogram of non-negative integers below ``cap``
+
+    Values at or above ``cap`` share a single overflow bin, so quantiles
+    are exact up to the cap and reported as ``cap`` beyond it.
+    """
+
+    cap: int
+    counts: np.ndarray = None
+
+    def __post_init__(self):
+        if self.counts is None:
+            self.counts = np.zeros(self.cap + 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.minimum(np.asarray(values, dtype=np.int64), self.cap)
+        self.counts += np.bincount(values, minlength=self.cap + 1)
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        total = self.total
+        if total == 0:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        return float(np.searchsorted(cumulative, q * total, side='left'))
+
+    def rebin(self, bins=40, upper=None):
+        """Collapse the unit bins into ``bins`` equal-width bins up to ``upper``"""
+        if upper is None:
+            nonzero = np.flatnonzero(self.counts)
+            upper = int(nonzero[-1]) + 1 if nonzero.size else 1
+        edges = np.linspace(0, upper, bins + 1)
+        positions = np.arange(self.cap + 1)
+        counts, _ = np.histogram(positions, bins=edges, weights=self.counts)
+        return counts.astype(np.int64), edges
+
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.counts)
+        end = int(nonzero[-1]) + 1 if nonzero.size else 0
+        return {'cap': self.cap, 'counts': self.counts[:end].tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(cap=data['cap'])
+        stored = np.asarray(data['counts'], dtype=np.int64)
+        hist.counts[:stored.size] = stored
+        return hist
+
+
+@dataclass
+class ColumnProfile:
+    """Mergeable statistics for one column"""
+
+    name: str
+    kind: str
+    dtype: str = 'object'
+    rows: int = 0
+    nulls: int = 0
+    memory_bytes: int = 0
+    values: RunningMoments = field(default_factory=RunningMoments)
+    char_lengths: RunningMoments = field(default_factory=RunningMoments)
+    word_counts: RunningMoments = field(default_factory=RunningMoments)
+    char_hist: LengthHistogram = field(default_factory=lambda: LengthHistogram(CHAR_HIST_CAP))
+    word_hist: LengthHistogram = field(default_factory=lambda: LengthHistogram(WORD_HIST_CAP))
+    frequencies: Counter = field(default_factory=Counter)
+    frequencies_truncated: bool = False
+    distinct_sketch: HyperLogLog = field(default_factory=HyperLogLog)
+    heavy_hitters: SpaceSaving = field(default_factory=SpaceSaving)
+    quantiles: KLLSketch = field(default_factory=KLLSketch)
+
+    def update(self, series, max_categories=MAX_CATEGORIES):
+        self.rows += len(series)
+        self.nulls += int(series.isna().sum())
+        self.memory_bytes += int(series.memory_usage(deep=True, index=False))
+
+        if self.kind == 'numeric':
+            values = series.dropna().to_numpy()
+            self.values.update(values)
+            self.quantiles.update(values)
+        else:
+            stats = compute_text_stats(series.fillna('').astype(str), workers=1,
+                                       fields=('chars', 'words'))
+            chars, words = stats.chars, stats.words
+            self.char_lengths.update(chars)
+            self.word_counts.update(words)
+            self.char_hist.update(chars)
+            self.word_hist.update(words)
+
+        counts = series.value_counts(dropna=True)
+        # Labels are kept as strings, as they are stored, so saved state merges with new chunks
+        counts.index = counts.index.astype(str)
+        if not counts.index.is_unique:
+            counts = counts.groupby(level=0, sort=False).sum()
+        if self.kind == 'text' and self.rows == len(series) and not worth_tallying(series, words, len(counts)):
+            # IDs and free text (judged from the first chunk) are left to the sketches
+            self.frequencies_truncated = True
+        self._update_frequencies(counts, max_categories)
+        # Sketches see each distinct value of the chunk once
+        self.distinct_sketch.add_hashes(hash_values(counts.index))
+        self.heavy_hitters.merge(SpaceSaving.from_counts(counts, self.heavy_hitters.capacity))
+        return self
+
+    def _update_frequencies(self, counts, max_categories):
+        if self.frequencies_truncated:
+            return
+        self.frequencies.update(counts.to_dict())
+        if len(self.frequencies) > max_categories:
+            # Too many distinct values to count exactly in bounded memory
+            self.frequencies = Counter()
+            self.frequencies_truncated = True
+
+    def merge(self, other, max_categories=MAX_CATEGORIES):
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.memory_bytes += other.memory_bytes
+        self.values.merge(other.values)
+        self.char_lengths.merge(other.char_lengths)
+        self.word_counts.merge(other.word_counts)
+        self.char_hist.merge(other.char_hist)
+        self.word_hist.merge(other.word_hist)
+        self.distinct_sketch.merge(other.distinct_sketch)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.quantiles.merge(other.quantiles)
+        if other.frequencies_truncated:
+            self.frequencies = Counter()
+            self.frequencies_truncated = True
+        else:
+            self._update_frequencies(pd.Series(other.frequencies, dtype='int64'), max_categories)
+        return self
+
+    @property
+    def distinct(self):
+        """Exact number of distinct values, or None once counting was dropped"""
+        return None if self.frequencies_truncated else len(self.frequencies)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'dtype': self.dtype,
+            'rows': self.rows,
+            'nulls': self.nulls,
+            'memory_bytes': self.memory_bytes,
+            'values': self.values.to_dict(),
+            'char_lengths': self.char_lengths.to_dict(),
+            'word_counts': self.word_counts.to_dict(),
+            'char_hist': self.char_hist.to_dict(),
+            'word_hist': self.word_hist.to_dict(),
+            'frequencies': [[str(k), v] for k, v in self.frequencies.items()],
+            'frequencies_truncated': self.frequencies_truncated,
+            'distinct_sketch': self.distinct_sketch.to_dict(),
+            'heavy_hitters': self.heavy_hitters.to_dict(),
+            'quantiles': self.quantiles.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            name=data['name'],
+            kind=data['kind'],
+            dtype=data['dtype'],
+            rows=data['rows'],
+            nulls=data['nulls'],
+            memory_bytes=data['memory_bytes'],
+            values=RunningMoments.from_dict(data['values']),
+            char_lengths=RunningMoments.from_dict(data['char_lengths']),
+            word_counts=RunningMoments.from_dict(data['word_counts']),
+            char_hist=LengthHistogram.from_dict(data['char_hist']),
+            word_hist=LengthHistogram.from_dict(data['word_hist']),
+            frequencies=Counter(dict(data['frequencies'])),
+            frequencies_truncated=data['frequencies_truncated'],
+            distinct_sketch=HyperLogLog.from_dict(data['distinct_sketch']),
+            heavy_hitters=SpaceSaving.from_dict(data['heavy_hitters']),
+            quantiles=KLLSketch.from_dict(data['quantiles']),
+        )
+
+
+@dataclass
+class DatasetProfile:
+    """Per-column profiles plus the total row count"""
+
+    rows: int = 0
+    chunks: int = 0
+    columns: dict = field(default_factory=dict)
+
+    def update(self, chunk, max_categories=MAX_CATEGORIES):
+        self.rows += len(chunk)
+        self.chunks += 1
+        for name in chunk.columns:
+            column = self.columns.get(name)
+            if column is None:
+                kind = 'numeric' if pd.api.types.is_numeric_dtype(chunk[name]) else 'text'
+                column = self.columns[name] = ColumnProfile(
+                    name=name, kind=kind, dtype=str(chunk[name].dtype))
+            column.update(chunk[name], max_categories)
+        return self
+
+    def merge(self, other, max_categories=MAX_CATEGORIES):
+        self.rows += other.rows
+        self.chunks += other.chunks
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column, max_categories)
+            else:
+                self.columns[name] = column
+        return self
+
+    @property
+    def total_nulls(self):
+        return sum(column.nulls for column in self.columns.values())
+
+    @property
+    def memory_bytes(self):
+        return sum(column.memory_bytes for column in self.columns.values())
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'chunks': self.chunks,
+            'columns': [column.to_dict() for column in self.columns.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        columns = [ColumnProfile.from_dict(column) for column in data['columns']]
+        return cls(rows=data['rows'], chunks=data['chunks'],
+                   columns={column.name: column for column in columns})
+
+
+def json_safe_head(chunk, rows=HEAD_ROWS):
+    """First rows of a chunk as JSON-safe records (missing values become None)"""
+    head = chunk.head(rows).astype(object)
+    return head.where(head.notna(), None).to_dict('records')
+
+
+def collect_numeric_values(values, profile, chunk, limit=EXACT_NUMERIC_ROWS):
+    """Append a chunk's non-null numeric values to ``values`` ({column: array})
+
+    Call after ``profile.update(chunk)``. A column with more than ``limit``
+    values maps to None instead and is left to its KLL sketch.
+    """
+    for name, column in profile.columns.items():
+        if column.kind != 'numeric' or name not in chunk:
+            continue
+        if column.values.count > limit:
+            values[name] = None
+            continue
+        new = pd.to_numeric(chunk[name], errors='coerce').dropna().to_numpy(dtype=np.float64)
+        values[name] = np.concatenate([values[name], new]) if name in values else new
+    return values
+
+
+def stream_profile(path=DATA_FILE, chunksize=PROFILE_CHUNK_ROWS,
+                   max_categories=MAX_CATEGORIES, usecols=None):
+    """Profile a CSV in one pass without materializing the full DataFrame"""
+    profile = DatasetProfile()
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+        profile.update(chunk, max_categories)
+    return profile
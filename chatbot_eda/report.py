@@ -0,0 +1,258 @@
+"""
+Headless EDA report: the dashboard's analyses as independent sections
+
+Each section is a top-level function that reads the columnar cache
+itself and returns JSON-safe data, so ``build_report`` can run them in
+parallel on a process pool. The profile snapshot, the memory layouts and
+the per-column duplicate and keyword passes do not depend on each other.
+``render_html`` turns the collected report into one static HTML page
+with embedded charts.
+"""
+
+import base64
+from concurrent.futures import as_completed
+from datetime import datetime
+import html
+import os
+import time
+
+import pandas as pd
+
+from chatbot_eda import charts
+from chatbot_eda.compact import memory_report
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, dataset_info, dataset_version, ensure_cache, load_dataset
+from chatbot_eda.duplicates import DEFAULT_THRESHOLD, clusters_frame, detect_duplicates
+from chatbot_eda.jobs import process_pool
+from chatbot_eda.keywords import load_or_compute_keywords
+from chatbot_eda.shared_data import shared_column
+from chatbot_eda.snapshot import ProfileSnapshot, load_snapshot
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_TOP_N = 20
+REPORT_CLUSTERS = 10
+
+
+def peak_rss_mb(children=False):
+    """Peak resident memory of this process (or its finished children), if the OS reports it"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1024**2 if os.uname().sysname == 'Darwin' else 1024
+    return usage.ru_maxrss / scale
+
+
+# ============================================================================
+# FINDINGS
+# ============================================================================
+
+def readiness(snapshot):
+    """Completeness, uniqueness and overall readiness scores with their status"""
+    completeness = 100 - snapshot.missing_pct
+    uniqueness = 100 - snapshot.duplicate_pct
+    overall = (completeness + uniqueness) / 2
+    if overall >= 85:
+        status, color = "READY FOR PRODUCTION", '#27ae60'
+    elif overall >= 75:
+        status, color = "READY FOR TRAINING", '#f39c12'
+    else:
+        status, color = "REQUIRES PREPROCESSING", '#e74c3c'
+    return {'completeness': completeness, 'uniqueness': uniqueness, 'overall': overall,
+            'status': status, 'color': color}
+
+
+# ============================================================================
+# SECTIONS
+# ============================================================================
+
+def profile_section(path, cache_dir):
+    """Structure, missing values, row duplicates, text lengths and categories"""
+    return load_snapshot(path, cache_dir).to_dict()
+
+
+def memory_section(path, cache_dir):
+    """Per-column memory before and after the compact layout"""
+    report = memory_report(load_dataset(path, cache_dir=cache_dir),
+                           load_dataset(path, cache_dir=cache_dir, compact=True))
+    return report.to_dict('records')
+
+
+def duplicates_section(path, column, cache_dir, threshold=DEFAULT_THRESHOLD):
+    """Exact and near-duplicate cluster counts and the largest clusters of a text column"""
+    # Worker processes map the same Arrow file instead of each reading a copy
+    texts = shared_column(path, column, cache_dir)
+    report = detect_duplicates(texts, threshold=threshold)
+    return {
+        'threshold': threshold,
+        'exact_clusters': len(report.exact),
+        'exact_duplicate_rows': report.exact_duplicate_rows,
+        'near_clusters': len(report.near),
+        'near_duplicate_rows': report.near_duplicate_rows,
+        'top_exact': clusters_frame(report.exact, texts, REPORT_CLUSTERS).to_dict('records'),
+        'top_near': clusters_frame(report.near, texts, REPORT_CLUSTERS).to_dict('records'),
+    }
+
+
+def keywords_section(path, column, cache_dir, top_n=REPORT_TOP_N):
+    """Top unigrams, bigrams and trigrams of a text column"""
+    # Sections already run in parallel, so count in-process
+    frames = load_or_compute_keywords(column, path, cache_dir, workers=1)
+    return {
+        str(n): {'terms': frame['term'].head(top_n).tolist(),
+                 'counts': [int(c) for c in frame['count'].head(top_n)],
+                 'total': frame.attrs['total']}
+        for n, frame in frames.items()
+    }
+
+
+def report_tasks(path=DATA_FILE, cache_dir=CACHE_DIR, threshold=DEFAULT_THRESHOLD, top_n=REPORT_TOP_N):
+    """(section name, function, args) for every independent section"""
+    tasks = [('profile', profile_section, (path, cache_dir)),
+             ('memory', memory_section, (path, cache_dir))]
+    for column in dataset_info(path, cache_dir)['text_columns']:
+        tasks.append((f'duplicates/{column}', duplicates_section, (path, column, cache_dir, threshold)))
+        tasks.append((f'keywords/{column}', keywords_section, (path, column, cache_dir, top_n)))
+    return tasks
+
+
+def _run_section(name, func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    return name, result, time.perf_counter() - start, peak_rss_mb()
+
+
+def build_report(path=DATA_FILE, cache_dir=CACHE_DIR, workers=None, threshold=DEFAULT_THRESHOLD,
+                 top_n=REPORT_TOP_N, log=None):
+    """Run every section (in parallel unless ``workers=1``) and collect the report dict
+
+    ``log(name, seconds)`` is called as each section finishes.
+    """
+    start = time.perf_counter()
+    # Build the columnar cache once, before workers race to create it
+    ensure_cache(path, cache_dir)
+    tasks = report_tasks(path, cache_dir, threshold, top_n)
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+    sections, timings = {}, {}
+    if workers == 1:
+        finished = (_run_section(*task) for task in tasks)
+        pool = None
+    else:
+        pool = process_pool(workers)
+        futures = [pool.submit(_run_section, *task) for task in tasks]
+        finished = (future.result() for future in as_completed(futures))
+    try:
+        for name, result, seconds, worker_rss in finished:
+            sections[name] = result
+            timings[name] = {'seconds': round(seconds, 3), 'worker_peak_rss_mb': worker_rss}
+            if log is not None:
+                log(name, seconds)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    profile = sections.pop('profile')
+    text_columns = profile['text_columns']
+    return {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'dataset': os.path.basename(path),
+        'version': dataset_version(path, cache_dir),
+        'profile': profile,
+        'findings': readiness(ProfileSnapshot.from_dict(profile)),
+        'memory': sections.pop('memory'),
+        'duplicates': {c: sections[f'duplicates/{c}'] for c in text_columns},
+        'keywords': {c: sections[f'keywords/{c}'] for c in text_columns},
+        'run': {
+            'workers': workers,
+            'wall_seconds': round(time.perf_counter() - start, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'children_peak_rss_mb': peak_rss_mb(children=True) if pool is not None else None,
+            'sections': timings,
+        },
+    }
+
+
+# ============================================================================
+# HTML
+# ============================================================================
+
+def _image(fig):
+    data = base64.b64encode(charts.figure_png(fig)).decode('ascii')
+    return f'<img src="data:image/png;base64,{data}">'
+
+
+def _table(records):
+    frame = pd.DataFrame(records)
+    return frame.to_html(index=False, border=0, classes='table') if not frame.empty else '<p>None</p>'
+
+
+def render_html(report):
+    """A self-contained HTML page for a ``build_report`` dict"""
+    profile = report['profile']
+    snapshot = ProfileSnapshot.from_dict(profile)
+    findings = report['findings']
+    text_columns = profile['text_columns']
+    esc = html.escape
+
+    parts = [f"<h1>🏥 AI Medical Chatbot - EDA Report</h1>"
+             f"<p>{esc(report['dataset'])} · version {esc(report['version'])} · "
+             f"generated {esc(report['generated'])}</p>"]
+
+    parts.append("<h2>📊 Dataset Overview</h2>")
+    parts.append(_table([{'Records': f"{snapshot.num_rows:,}", 'Features': snapshot.num_columns,
+                          'Memory (MB)': f"{snapshot.total_memory_mb:.2f}"}]))
+    parts.append(_table([{'Column': c, 'Type': profile['dtypes'][c], 'Nulls': profile['nulls'][c]}
+                         for c in profile['columns']]))
+
+    parts.append("<h2>🔍 Data Quality</h2>")
+    parts.append(f"<p>Missing values: {snapshot.total_nulls:,} ({snapshot.missing_pct:.2f}%) · "
+                 f"Duplicate records: {snapshot.duplicate_rows:,} ({snapshot.duplicate_pct:.2f}%)</p>")
+    for column, duplicates in report['duplicates'].items():
+        parts.append(f"<h3>🧬 Duplicate Clusters: {esc(column)}</h3>")
+        parts.append(_table([{key: duplicates[key] for key in
+                              ('exact_clusters', 'exact_duplicate_rows', 'near_clusters', 'near_duplicate_rows')}]))
+        parts.append(_table(duplicates['top_near']))
+
+    if snapshot.numeric_columns:
+        parts.append("<h2>📈 Statistical Analysis</h2>")
+        parts.append(_table([{'Column': c, **profile['numeric_stats'][c]['describe']}
+                             for c in snapshot.numeric_columns]))
+
+    parts.append("<h2>📝 NLP & Text Analysis</h2>")
+    parts.append(_table([{'Column': c, **{key: round(value, 1) for key, value in profile['text_stats'][c].items()
+                                          if isinstance(value, (int, float))}}
+                         for c in text_columns]))
+    if text_columns:
+        parts.append(_image(charts.box_chart(
+            boxes=[profile['text_stats'][c]['char_box'] for c in text_columns], labels=text_columns,
+            colors=['#3498db', '#e74c3c', '#2ecc71', '#9b59b6'] * len(text_columns),
+            ylabel='Character Length', title='Text Length Comparison')))
+    for column, keywords in report['keywords'].items():
+        unigrams = keywords['1']
+        parts.append(_image(charts.barh_chart(
+            labels=unigrams['terms'], values=unigrams['counts'], colors='#3498db', invert=True,
+            xlabel='Frequency', title=f"Top {len(unigrams['terms'])} Terms ({column})",
+            figsize=(10, max(4, len(unigrams['terms']) * 0.3)))))
+
+    parts.append("<h2>🗜️ Memory Layout</h2>")
+    parts.append(_table(report['memory']))
+
+    parts.append("<h2>🎯 Key Findings</h2>")
+    parts.append(f"<p><b>Completeness:</b> {findings['completeness']:.1f}% · "
+                 f"<b>Uniqueness:</b> {findings['uniqueness']:.1f}% · "
+                 f"<b>Overall Readiness:</b> {findings['overall']:.1f}% - {esc(findings['status'])}</p>")
+
+    run = report['run']
+    parts.append(f"<hr><p><small>Generated in {run['wall_seconds']:.1f}s on {run['workers']} workers</small></p>")
+
+    return ("<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            "<title>AI Medical Chatbot - EDA Report</title><style>"
+            "body{font-family:sans-serif;max-width:1100px;margin:2rem auto;padding:0 1rem}"
+            ".table{border-collapse:collapse;margin:1rem 0}"
+            ".table td,.table th{border:1px solid #ddd;padding:4px 8px;font-size:13px}"
+            "img{max-width:100%}</style></head><body>"
+            + "\n".join(parts) + "</body></html>")
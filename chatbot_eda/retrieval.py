@@ -0,0 +1,240 @@
+"""
+Sparse inverted-index retrieval over the patient questions
+
+The index is a CSR-style postings layout (term -> sorted doc ids and term
+frequencies) built fully vectorized from (term, doc) pairs. It scores
+queries with BM25 or cosine TF-IDF, is saved as plain ``.npy`` arrays and
+is memory-mapped back in, so loading it costs almost nothing.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import (CACHE_DIR, DATA_FILE, build_directory, cache_paths, dataset_version,
+                                    publish_directory)
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.shared_data import shared_column
+
+TOKEN_PATTERN = r'[a-z0-9]+'
+BUILD_BATCH_ROWS = 20_000
+BM25_K1 = 1.5
+BM25_B = 0.75
+METHODS = ('bm25', 'tfidf')
+_ARRAYS = ('indptr', 'doc_ids', 'term_freqs', 'doc_lengths', 'doc_norms')
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens, as used for documents and queries"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def top_k(scores, k):
+    """Top-k positions along the last axis, highest score first"""
+    k = min(k, scores.shape[-1])
+    if k == 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(top, order, axis=-1)
+
+
+@dataclass
+class SearchResult:
+    """Top-k document positions and their scores for one query"""
+
+    doc_ids: np.ndarray
+    scores: np.ndarray
+
+
+class InvertedIndex:
+    """Postings lists in CSR form with BM25 and TF-IDF scoring"""
+
+    def __init__(self, vocabulary, indptr, doc_ids, term_freqs, doc_lengths,
+                 doc_norms, meta=None):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.doc_norms = doc_norms
+        self.meta = meta or {}
+        self.num_docs = len(doc_lengths)
+        self.avg_doc_length = float(doc_lengths.mean()) if self.num_docs else 0.0
+        doc_freqs = np.diff(indptr).astype(np.float64)
+        self.bm25_idf = np.log1p((self.num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        self.tfidf_idf = np.log((1 + self.num_docs) / (1 + doc_freqs)) + 1
+
+    @classmethod
+    def build(cls, texts, batch_rows=BUILD_BATCH_ROWS):
+        """Index a Series of documents; positions become the doc ids"""
+        start_time = time.perf_counter()
+        texts = pd.Series(texts).fillna('').astype(str).reset_index(drop=True)
+        num_docs = len(texts)
+        vocabulary = {}
+        keys = []
+        doc_lengths = np.zeros(num_docs, dtype=np.int32)
+
+        for start in range(0, num_docs, batch_rows):
+            tokens = texts.iloc[start:start + batch_rows].str.lower().str.findall(TOKEN_PATTERN)
+            tokens = tokens.explode().dropna()
+            if tokens.empty:
+                continue
+            docs = tokens.index.to_numpy(dtype=np.int64)
+            codes, uniques = pd.factorize(tokens.to_numpy(dtype=object))
+            # Map batch-local codes onto the global vocabulary
+            term_ids = np.fromiter(
+                (vocabulary.setdefault(term, len(vocabulary)) for term in uniques),
+                dtype=np.int64, count=len(uniques))
+            keys.append(term_ids[codes] * num_docs + docs)
+            doc_lengths += np.bincount(docs, minlength=num_docs).astype(np.int32)
+
+        all_keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+        pairs, term_freqs = np.unique(all_keys, return_counts=True)
+        terms, doc_ids = np.divmod(pairs, num_docs)
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=indptr[1:])
+
+        index = cls(vocabulary, indptr, doc_ids.astype(np.int32),
+                    term_freqs.astype(np.float32), doc_lengths,
+                    np.ones(num_docs, dtype=np.float32))
+        # Cosine TF-IDF needs each document's weight norm
+        weights = (1 + np.log(index.term_freqs)) * index.tfidf_idf[terms]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights ** 2, minlength=num_docs))
+        index.doc_norms = np.where(norms > 0, norms, 1).astype(np.float32)
+        index.meta = {
+            'num_docs': num_docs,
+            'num_terms': len(vocabulary),
+            'num_postings': int(len(doc_ids)),
+            'build_seconds': time.perf_counter() - start_time,
+        }
+        return index
+
+    def _term_ids(self, query):
+        ids = [self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary]
+        return np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+
+    def _posting_weights(self, term, method, k1, b):
+        """Documents containing ``term`` and their score per unit of query weight"""
+        start, end = self.indptr[term], self.indptr[term + 1]
+        docs = self.doc_ids[start:end]
+        tf = self.term_freqs[start:end]
+        if method == 'bm25':
+            norm = k1 * (1 - b + b * self.doc_lengths[docs] / self.avg_doc_length)
+            return docs, self.bm25_idf[term] * tf * (k1 + 1) / (tf + norm)
+        return docs, (1 + np.log(tf)) * self.tfidf_idf[term] / self.doc_norms[docs]
+
+    def _query_weights(self, term, query_counts, method):
+        if method == 'bm25':
+            return query_counts.astype(np.float64)
+        return (1 + np.log(query_counts)) * self.tfidf_idf[term]
+
+    def _accumulate(self, scores, query, method, k1, b):
+        term_ids, query_counts = self._term_ids(query)
+        for term, query_count in zip(term_ids, query_counts):
+            docs, weights = self._posting_weights(term, method, k1, b)
+            scores[docs] += self._query_weights(term, np.array([query_count]), method)[0] * weights
+        return scores
+
+    def scores(self, query, method='bm25', k1=BM25_K1, b=BM25_B):
+        """Score of every document for ``query``"""
+        if method not in METHODS:
+            raise ValueError(f"Unknown scoring method: {method!r} (expected one of {METHODS})")
+        return self._accumulate(np.zeros(self.num_docs, dtype=np.float32), query, method, k1, b)
+
+    def search(self, query, k=10, method='bm25'):
+        """Top-k matching documents for one query"""
+        return self.search_batch([query], k, method)[0]
+
+    def search_batch(self, queries, k=10, method='bm25'):
+        """Top-k for several queries, scored into one (queries x docs) matrix
+
+        Each distinct term's postings are weighted once and added to every
+        query row containing it, so shared terms cost one pass per batch.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown scoring method: {method!r} (expected one of {METHODS})")
+        scores = np.zeros((len(queries), self.num_docs), dtype=np.float32)
+        rows_by_term = defaultdict(list)
+        for row, query in enumerate(queries):
+            for term, count in zip(*self._term_ids(query)):
+                rows_by_term[term].append((row, count))
+        for term, entries in rows_by_term.items():
+            rows, counts = np.array(entries).T
+            docs, weights = self._posting_weights(term, method, BM25_K1, BM25_B)
+            query_weights = self._query_weights(term, counts, method)
+            scores[np.ix_(rows, docs)] += np.outer(query_weights, weights)
+        top = top_k(scores, k)
+        top_scores = np.take_along_axis(scores, top, axis=-1)
+        return [SearchResult(doc_ids=ids[s > 0], scores=s[s > 0]) for ids, s in zip(top, top_scores)]
+
+    def save(self, directory):
+        """Write the index as ``.npy`` arrays plus vocabulary and metadata JSON"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(directory / f'{name}.npy', getattr(self, name))
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(directory / 'vocabulary.json', 'w', encoding='utf-8') as fh:
+            json.dump(terms, fh)
+        with open(directory / 'meta.json', 'w', encoding='utf-8') as fh:
+            json.dump(self.meta, fh, indent=2)
+        return directory
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved index; arrays are memory-mapped unless ``mmap=False``"""
+        directory = Path(directory)
+        arrays = {name: np.load(directory / f'{name}.npy', mmap_mode='r' if mmap else None)
+                  for name in _ARRAYS}
+        with open(directory / 'vocabulary.json', encoding='utf-8') as fh:
+            vocabulary = {term: position for position, term in enumerate(json.load(fh))}
+        with open(directory / 'meta.json', encoding='utf-8') as fh:
+            meta = json.load(fh)
+        return cls(vocabulary, meta=meta, **arrays)
+
+
+def index_path(column, path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """Directory of the persisted index for a column and dataset version"""
+    version = version or dataset_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.index-{column}-{version}')
+
+
+def load_or_build_index(column, path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Memory-map the persisted index for ``column``, building it first if needed"""
+    directory = index_path(column, path, cache_dir)
+    count_cache((directory / 'meta.json').exists())
+    if (directory / 'meta.json').exists():
+        return InvertedIndex.load(directory)
+
+    texts = shared_column(path, column, cache_dir)
+    index = InvertedIndex.build(texts)
+    index.meta.update({'column': column, 'version': dataset_version(path, cache_dir)})
+    tmp_directory = build_directory(directory)
+    index.save(tmp_directory)
+    publish_directory(tmp_directory, directory)
+    return InvertedIndex.load(directory)
+
+
+def measure_latency(index, queries, k=10, method='bm25'):
+    """p50/p99 single-query latency in milliseconds over ``queries``"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k, method)
+        timings.append((time.perf_counter() - start) * 1000)
+    if not timings:
+        return {'p50_ms': 0.0, 'p99_ms': 0.0, 'queries': 0}
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p99_ms': float(np.percentile(timings, 99)),
+        'queries': len(timings),
+    }
@@ -0,0 +1,204 @@
+"""
+Fast-preview sampling with confidence intervals
+
+``stream_sample`` reads the CSV in chunks and keeps a fixed-size
+hash-priority reservoir: every row gets a pseudo-random priority derived
+from its content hash and the ``size`` lowest priorities are kept. Each
+row has the same inclusion probability, and all copies of a duplicated
+row share one priority, so duplicates are either all sampled or none are.
+The duplicate rate measured in the sample is then an estimate of the
+full-table rate, which a plain row reservoir cannot give.
+
+Because copies are sampled together, the sampling unit is a distinct
+row, not a row: the sample is a cluster sample. ``duplicate_interval``
+therefore estimates the variance of the duplicate share across distinct
+rows and widens the row-level Wilson interval by that design effect.
+
+``sample_snapshot`` turns the sample into a ``ProfileSnapshot`` scaled to
+the full row count, with confidence intervals for the sampled metrics, so
+the dashboard can render every page before the exact full pass finishes.
+"""
+
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.column_types import infer_column_types
+from chatbot_eda.data_cache import DATA_FILE, source_version
+from chatbot_eda.duplicates import count_duplicates, row_hashes
+from chatbot_eda.profiler import HEAD_ROWS, MAX_CATEGORIES, DatasetProfile, json_safe_head
+from chatbot_eda.snapshot import numeric_summary, snapshot_from_profile
+from chatbot_eda.text_stats import compute_text_stats
+
+SAMPLE_SIZE = 10_000
+SAMPLE_CHUNK_ROWS = 50_000
+CONFIDENCE = 0.95
+
+
+def _z(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def mean_interval(values, population=None, confidence=CONFIDENCE):
+    """Sample mean and the half-width of its normal-approximation interval
+
+    ``population`` applies the finite population correction.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    if n == 0:
+        return 0.0, 0.0
+    if n == 1:
+        return float(values[0]), 0.0
+    standard_error = values.std(ddof=1) / np.sqrt(n)
+    if population and population > 1:
+        standard_error *= np.sqrt(max(population - n, 0) / (population - 1))
+    return float(values.mean()), float(_z(confidence) * standard_error)
+
+
+def wilson_interval(successes, n, confidence=CONFIDENCE):
+    """Wilson score interval (low, high) for a proportion"""
+    if n == 0:
+        return 0.0, 1.0
+    z = _z(confidence)
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return float(max(0.0, centre - half_width)), float(min(1.0, centre + half_width))
+
+
+def duplicate_interval(hashes, confidence=CONFIDENCE):
+    """Interval (low, high) for the share of duplicate rows in a sample of row hashes
+
+    Each distinct hash is a cluster of ``m`` rows holding ``m - 1``
+    duplicates. The linearized variance of the ratio estimator across
+    clusters, over the variance a row-level sample of the same size
+    would have, is the design effect; the Wilson interval is taken at
+    the effective sample size ``n / deff`` (``deff`` at least 1).
+    """
+    _, sizes = np.unique(hashes, return_counts=True)
+    n, clusters = int(sizes.sum()), sizes.size
+    if n == 0:
+        return 0.0, 1.0
+    p = (n - clusters) / n
+    deff = 1.0
+    if clusters > 1 and 0 < p < 1:
+        residuals = (sizes - 1) - p * sizes
+        cluster_variance = clusters * residuals.var(ddof=1) / n ** 2
+        deff = max(cluster_variance / (p * (1 - p) / n), 1.0)
+    effective = n / deff
+    return wilson_interval(p * effective, effective, confidence)
+
+
+@dataclass
+class StreamSample:
+    """A hash-priority sample of rows and the size of the table it came from"""
+
+    frame: pd.DataFrame
+    hashes: np.ndarray
+    total_rows: int
+    head: pd.DataFrame
+
+    @property
+    def fraction(self):
+        return len(self.frame) / self.total_rows if self.total_rows else 0.0
+
+
+def _priorities(hashes, seed):
+    # Bijective mix of the content hash, so each seed gives a different sample
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, dtype=np.uint64)
+    return hashes * a + b
+
+
+def stream_sample(path=DATA_FILE, size=SAMPLE_SIZE, chunksize=SAMPLE_CHUNK_ROWS, seed=0):
+    """Sample about ``size`` rows in one streaming pass, never holding more than one chunk"""
+    kept, kept_priority, kept_hashes = None, np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64)
+    threshold = np.iinfo(np.uint64).max
+    total_rows = 0
+    head = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        if head is None:
+            head = chunk.head(HEAD_ROWS)
+        total_rows += len(chunk)
+        hashes = row_hashes(chunk)
+        priority = _priorities(hashes, seed)
+        candidates = priority <= threshold
+        kept = chunk[candidates] if kept is None else pd.concat([kept, chunk[candidates]])
+        kept_priority = np.concatenate([kept_priority, priority[candidates]])
+        kept_hashes = np.concatenate([kept_hashes, hashes[candidates]])
+        if len(kept) > size:
+            # Keep the lowest priorities; ties at the boundary are copies of one row
+            threshold = np.partition(kept_priority, size - 1)[size - 1]
+            selected = kept_priority <= threshold
+            kept, kept_priority, kept_hashes = kept[selected], kept_priority[selected], kept_hashes[selected]
+
+    if kept is None:
+        kept = pd.read_csv(path, nrows=0)
+        head = kept
+    order = np.argsort(kept.index.to_numpy(), kind='stable')
+    return StreamSample(kept.iloc[order], kept_hashes[order], total_rows, head)
+
+
+def sample_snapshot(path=DATA_FILE, size=SAMPLE_SIZE, confidence=CONFIDENCE, seed=0, version=None):
+    """A ``ProfileSnapshot`` estimated from a sample, with confidence intervals
+
+    Counts (rows, nulls, memory, duplicates, category tallies) are scaled to
+    the full table; ``intervals`` holds the interval of each sampled metric.
+    """
+    sample = stream_sample(path, size, seed=seed)
+    frame = sample.frame
+    n, total = len(frame), sample.total_rows
+    scale = total / n if n else 0.0
+
+    # Scale the category cap too, so columns too diverse to tally in the
+    # full pass are also left out of the preview
+    profile = DatasetProfile()
+    profile.update(frame, max_categories=max(1, int(MAX_CATEGORIES * sample.fraction)))
+    column_types = infer_column_types(profile)
+    profile.rows = total
+    duplicates = count_duplicates(sample.hashes)
+
+    intervals = {
+        'confidence': confidence,
+        'duplicate_pct': [100 * bound for bound in duplicate_interval(sample.hashes, confidence)],
+        'missing_pct': [100 * bound for bound in wilson_interval(
+            int(frame.isna().to_numpy().sum()), n * max(frame.shape[1], 1), confidence)],
+        'nulls': {},
+        'text': {},
+    }
+    for name, column in profile.columns.items():
+        intervals['nulls'][name] = [100 * bound for bound in
+                                    wilson_interval(column.nulls, n, confidence)]
+        column.nulls = int(round(column.nulls * scale))
+        column.memory_bytes = int(column.memory_bytes * scale)
+        for label in column.frequencies:
+            column.frequencies[label] = int(round(column.frequencies[label] * scale))
+        hitters = column.heavy_hitters
+        hitters.counts = (hitters.counts * scale).round().astype('int64')
+        hitters.errors = (hitters.errors * scale).round().astype('int64')
+        hitters.floor = int(round(hitters.floor * scale))
+        if column.kind == 'text':
+            # Same counting as the profiler: missing values are empty strings
+            stats = compute_text_stats(frame[name].fillna('').astype(str), workers=1,
+                                       fields=('chars', 'words'))
+            intervals['text'][name] = {
+                'char_mean': mean_interval(stats.chars, total, confidence)[1],
+                'word_mean': mean_interval(stats.words, total, confidence)[1],
+            }
+
+    numeric_columns = [c for c, column in profile.columns.items() if column.kind == 'numeric']
+    return snapshot_from_profile(
+        profile,
+        version or source_version(path),
+        int(round(duplicates * scale)),
+        json_safe_head(sample.head),
+        numeric_summary(frame, numeric_columns),
+        sample_rows=n,
+        intervals=intervals,
+        column_types=column_types,
+    )
@@ -0,0 +1,100 @@
+"""
+Zero-copy, read-only dataset shared by every session and process on a host
+
+The columnar cache is exported once per dataset version to an
+uncompressed Arrow IPC file next to it. Readers memory-map that file, so
+the table's buffers point straight into the OS page cache: dashboard
+sessions, worker threads and worker processes on one host all read the
+same physical pages, and another concurrent user adds no copy of the
+data. Each process opens the file once (``shared_table``); columns come
+out as pandas objects with ``pd.ArrowDtype`` over the mapped buffers.
+
+The data is read-only. Pandas operations that transform a column still
+allocate their result, as they would for any frame. Without pyarrow,
+``shared_frame`` falls back to ``load_dataset``.
+"""
+
+import os
+import threading
+
+import pandas as pd
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, cache_paths, dataset_version, ensure_cache, load_dataset
+from chatbot_eda.instrumentation import count_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SHARED_BATCH_ROWS = 64_000
+
+_tables = {}
+_lock = threading.Lock()
+
+
+def arrow_path(path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """Location of the shared Arrow IPC file for a dataset version"""
+    version = version or dataset_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.shared-{version}.arrow')
+
+
+def build_arrow(path=DATA_FILE, cache_dir=CACHE_DIR, batch_rows=SHARED_BATCH_ROWS):
+    """Export the columnar cache to an uncompressed Arrow IPC file, batch by batch"""
+    parquet_file = pq.ParquetFile(ensure_cache(path, cache_dir))
+    target = arrow_path(path, cache_dir)
+    tmp_path = target.with_suffix(f'.{os.getpid()}.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink, \
+            pa.ipc.new_file(sink, parquet_file.schema_arrow) as writer:
+        for batch in parquet_file.iter_batches(batch_size=batch_rows):
+            writer.write_batch(batch)
+    os.replace(tmp_path, target)
+
+    # Files of earlier versions; processes still mapping one keep their pages
+    for stale in target.parent.glob(f'{cache_paths(path, cache_dir)[0].stem}.shared-*.arrow'):
+        if stale != target:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    return target
+
+
+def ensure_arrow(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Return the shared Arrow file for the current version, exporting it first if missing"""
+    target = arrow_path(path, cache_dir)
+    count_cache(target.exists())
+    if not target.exists():
+        build_arrow(path, cache_dir)
+    return target
+
+
+def shared_table(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Memory-mapped Arrow table of the dataset, opened once per process and version"""
+    target = str(ensure_arrow(path, cache_dir))
+    with _lock:
+        table = _tables.get(target)
+        if table is None:
+            table = pa.ipc.open_file(pa.memory_map(target, 'r')).read_all()
+            # Only the current version stays mapped
+            _tables.clear()
+            _tables[target] = table
+    return table
+
+
+def shared_frame(path=DATA_FILE, columns=None, cache_dir=CACHE_DIR):
+    """DataFrame of ``columns`` backed by the memory-mapped table (no copy)"""
+    if pa is None:
+        return load_dataset(path, columns=columns, cache_dir=cache_dir)
+    table = shared_table(path, cache_dir)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def shared_column(path=DATA_FILE, column=None, cache_dir=CACHE_DIR):
+    """One column of ``shared_frame`` as a Series"""
+    return shared_frame(path, [column], cache_dir)[column]
@@ -0,0 +1,251 @@
+"""
+Mergeable probabilistic sketches for columns too large to count exactly
+
+- ``HyperLogLog``: distinct count in 2**precision one-byte registers.
+  Relative standard error is 1.04 / sqrt(2**precision) (0.81% at the
+  default precision 14); exact-ish below a few thousand values thanks to
+  the linear-counting correction.
+- ``KLLSketch``: quantiles of a numeric stream in O(k) retained items.
+  Exact until more than ``k`` values arrive; beyond that a reported
+  quantile's rank is off by about 2.3 / k**0.97 of the count (1.3% at
+  k=200) with 99% confidence.
+- ``SpaceSaving``: top-k heavy hitters in ``capacity`` counters. Every
+  reported count is an upper bound that overcounts by at most its
+  ``error``; values never reported occur at most ``floor`` times. Exact
+  while the stream has no more than ``capacity`` distinct values.
+
+All three are fed chunk by chunk, merge across chunks and processes
+(``merge`` is associative, the merged bounds are the same as for one
+stream) and round-trip through ``to_dict``/``from_dict`` as JSON.
+"""
+
+import base64
+
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 14
+KLL_K = 200
+HEAVY_HITTERS = 2_000
+
+
+def hash_values(values):
+    """64-bit hashes of values, equal for equal values across chunks and processes"""
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+class HyperLogLog:
+    """Distinct-count sketch; sketches with the same precision merge by register max"""
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        # The rank bits must fit a float64 mantissa for the exponent trick below
+        if not 11 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 11 and 18")
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        """Relative standard error of ``estimate``"""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return self
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = (hashes & np.uint64((1 << bits) - 1)).astype(np.float64)
+        # frexp's exponent is the bit length; rank = leading zeros + 1
+        rank = (bits + 1 - np.frexp(rest)[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def update(self, values):
+        return self.add_hashes(hash_values(values))
+
+    def merge(self, other):
+        if self.precision != other.precision:
+            raise ValueError("HyperLogLog sketches must share precision to merge")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+    def to_dict(self):
+        return {'precision': self.precision,
+                'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data):
+        registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return cls(data['precision'], registers)
+
+
+class KLLSketch:
+    """Quantile sketch; compactor levels hold items of weight 2**level"""
+
+    def __init__(self, k=KLL_K, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self):
+        """True while every value is still retained"""
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self):
+        """Normalized rank error of a quantile (99% confidence), 0 while exact"""
+        return 0.0 if self.exact else 2.296 / self.k ** 0.9723
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            # Keep a random half of the sorted pairs at twice the weight
+            items = np.sort(items)
+            paired = len(items) - len(items) % 2
+            promoted = items[self._rng.integers(2):paired:2]
+            self.levels[level] = items[paired:]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Capacities shrink as levels are added, so recheck from the bottom
+            level = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.count += int(values.size)
+            self._compress()
+        return self
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 1 << h, dtype=np.int64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        items, cumulative = self._weighted()
+        if items.size == 0:
+            return float('nan')
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(items[min(position, items.size - 1)])
+
+    def cdf(self, points):
+        """Estimated fraction of values <= each point"""
+        items, cumulative = self._weighted()
+        if items.size == 0:
+            return np.zeros(len(points))
+        positions = np.searchsorted(items, points, side='right')
+        ranks = np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0)
+        return ranks / cumulative[-1]
+
+    def to_dict(self):
+        return {'k': self.k, 'count': self.count, 'levels': [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.count = data['count']
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data['levels']]
+        return sketch
+
+
+class SpaceSaving:
+    """Heavy-hitter counters; summaries of any capacity merge by summing estimates"""
+
+    def __init__(self, capacity=HEAVY_HITTERS, counts=None, errors=None, floor=0):
+        self.capacity = capacity
+        self.counts = counts if counts is not None else pd.Series(dtype='int64')
+        self.errors = errors if errors is not None else pd.Series(dtype='int64')
+        self.floor = floor
+
+    @property
+    def exact(self):
+        """True while no value has been evicted"""
+        return self.floor == 0
+
+    @classmethod
+    def from_counts(cls, counts, capacity=HEAVY_HITTERS):
+        """Summary of exact counts (e.g. one chunk's ``value_counts``)"""
+        counts = counts.astype('int64')
+        summary = cls(capacity, counts, pd.Series(0, index=counts.index, dtype='int64'))
+        summary._truncate()
+        return summary
+
+    def update(self, values):
+        return self.merge(SpaceSaving.from_counts(pd.Series(values).value_counts(dropna=True),
+                                                  self.capacity))
+
+    def _truncate(self):
+        if len(self.counts) <= self.capacity:
+            return
+        order = self.counts.sort_values(ascending=False, kind='stable').index
+        self.floor = max(self.floor, int(self.counts[order[self.capacity]]))
+        self.counts = self.counts[order[:self.capacity]]
+        self.errors = self.errors[order[:self.capacity]]
+
+    def merge(self, other):
+        # A value missing from a summary occurred there at most ``floor`` times
+        index = self.counts.index.union(other.counts.index)
+        counts = (self.counts.reindex(index, fill_value=self.floor)
+                  + other.counts.reindex(index, fill_value=other.floor))
+        errors = (self.errors.reindex(index, fill_value=self.floor)
+                  + other.errors.reindex(index, fill_value=other.floor))
+        self.counts, self.errors = counts.astype('int64'), errors.astype('int64')
+        self.floor += other.floor
+        self._truncate()
+        return self
+
+    def top(self, n):
+        """The ``n`` largest (label, count, error) triples as JSON-safe lists"""
+        order = self.counts.sort_values(ascending=False, kind='stable').index[:n]
+        return self._items(self.counts[order], self.errors[order])
+
+    @staticmethod
+    def _items(counts, errors):
+        return [[str(label), int(count), int(error)]
+                for label, count, error in zip(counts.index, counts.to_numpy(), errors.to_numpy())]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'floor': self.floor,
+                'items': self._items(self.counts, self.errors)}
+
+    @classmethod
+    def from_dict(cls, data):
+        labels = [label for label, _, _ in data['items']]
+        return cls(data['capacity'],
+                   pd.Series([count for _, count, _ in data['items']], index=labels, dtype='int64'),
+                   pd.Series([error for _, _, error in data['items']], index=labels, dtype='int64'),
+                   data['floor'])
@@ -0,0 +1,283 @@
+"""
+Precomputed ProfileSnapshot shared by every dashboard page
+
+A snapshot holds each metric the pages display. It is computed once per
+dataset version in a single streaming pass and persisted as JSON next to
+the columnar cache, so a restarted server loads it instead of rescanning
+the table. When the export only grew, ``load_snapshot`` extends the saved
+incremental profile with the appended rows instead (see
+``chatbot_eda.incremental``). Pages only read from it.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.charts import five_number_summary, histogram_bins, top_n, value_summary
+from chatbot_eda.column_types import FREE_TEXT, columns_of, infer_column_types
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, cache_paths, dataset_version, source_version
+from chatbot_eda.duplicates import count_duplicates, row_hashes
+from chatbot_eda.incremental import update_profile_state
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.profiler import PROFILE_CHUNK_ROWS, DatasetProfile, collect_numeric_values, json_safe_head
+
+SNAPSHOT_FORMAT = 4
+TOP_CATEGORIES = 15
+NUMERIC_HIST_BINS = 30
+
+
+@dataclass
+class ProfileSnapshot:
+    """Every metric shown by the dashboard for one dataset version"""
+
+    version: str
+    created: str
+    num_rows: int
+    columns: list
+    dtypes: dict
+    nulls: dict
+    memory_bytes: dict
+    duplicate_rows: int
+    head: list
+    text_columns: list = field(default_factory=list)
+    numeric_columns: list = field(default_factory=list)
+    numeric_stats: dict = field(default_factory=dict)
+    text_stats: dict = field(default_factory=dict)
+    categories: dict = field(default_factory=dict)
+    column_types: dict = field(default_factory=dict)
+    sample_rows: int = None
+    intervals: dict = field(default_factory=dict)
+    format: int = SNAPSHOT_FORMAT
+
+    @property
+    def is_sample(self):
+        """True for a fast-preview snapshot estimated from a sample"""
+        return self.sample_rows is not None
+
+    @property
+    def free_text_columns(self):
+        """Text columns holding free text rather than IDs or labels"""
+        return columns_of(self.column_types, *FREE_TEXT) or self.text_columns
+
+    @property
+    def categorical_columns(self):
+        return columns_of(self.column_types, 'categorical')
+
+    @property
+    def num_columns(self):
+        return len(self.columns)
+
+    @property
+    def total_nulls(self):
+        return sum(self.nulls.values())
+
+    @property
+    def missing_pct(self):
+        cells = self.num_rows * self.num_columns
+        return self.total_nulls / cells * 100 if cells else 0.0
+
+    @property
+    def duplicate_pct(self):
+        return self.duplicate_rows / self.num_rows * 100 if self.num_rows else 0.0
+
+    @property
+    def total_memory_mb(self):
+        return sum(self.memory_bytes.values()) / 1024**2
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def _text_stats(column):
+    return {
+        'char_mean': column.char_lengths.mean,
+        'char_median': column.char_hist.quantile(0.5),
+        'char_max': int(column.char_lengths.max) if column.char_lengths.count else 0,
+        'word_mean': column.word_counts.mean,
+        'word_median': column.word_hist.quantile(0.5),
+        'char_hist': histogram_bins(column.char_hist),
+        'word_hist': histogram_bins(column.word_hist),
+        'char_box': five_number_summary(column.char_hist),
+        'word_box': five_number_summary(column.word_hist),
+    }
+
+
+def _category_stats(column):
+    if column.frequencies_truncated:
+        # Too diverse to tally: HyperLogLog distinct count, Space-Saving top values
+        top = column.heavy_hitters.top(TOP_CATEGORIES)
+        return {
+            'distinct': column.distinct_sketch.estimate(),
+            'approximate': True,
+            'distinct_error': column.distinct_sketch.relative_error,
+            'top': [[label, count] for label, count, _ in top],
+            'top_error': max((error for _, _, error in top), default=0),
+            'min_count': None,
+            'max_count': top[0][1] if top else None,
+            'count_box': None,
+        }
+    counts = np.fromiter(column.frequencies.values(), dtype=np.int64,
+                         count=len(column.frequencies))
+    return {
+        'distinct': len(column.frequencies),
+        'approximate': False,
+        'top': top_n(column.frequencies, TOP_CATEGORIES),
+        'min_count': int(counts.min()) if counts.size else 0,
+        'max_count': int(counts.max()) if counts.size else 0,
+        'count_box': value_summary(counts),
+    }
+
+
+def profile_numeric_stats(profile, values=None):
+    """Numeric column stats: exact where every value is at hand, sketched beyond
+
+    ``values`` are the columns' values from ``collect_numeric_values``, kept
+    up to EXACT_NUMERIC_ROWS per column while profiling, so no second read
+    of the table is needed. Without them only columns whose KLL sketch still
+    holds every value are exact.
+    """
+    values = values or {}
+    stats = {}
+    for name, column in profile.columns.items():
+        if column.kind != 'numeric':
+            continue
+        exact = values.get(name)
+        if exact is None and column.quantiles.exact:
+            exact = column.quantiles.levels[0]
+        if exact is None:
+            stats[name] = sketch_summary(column)
+        else:
+            stats[name] = numeric_summary(pd.DataFrame({name: exact}), [name])[name]
+    return stats
+
+
+def sketch_summary(column):
+    """``describe()``-style stats and a histogram from a column's moments and KLL sketch"""
+    values, quantiles = column.values, column.quantiles
+    if not values.count:
+        return numeric_summary(pd.DataFrame({column.name: []}, dtype='float64'), [column.name])
+    edges = np.linspace(values.min, values.max, NUMERIC_HIST_BINS + 1)
+    below = np.concatenate([[0.0], quantiles.cdf(edges[1:])])
+    return {
+        'describe': {'count': float(values.count), 'mean': values.mean, 'std': values.std,
+                     'min': values.min, '25%': quantiles.quantile(0.25),
+                     '50%': quantiles.quantile(0.5), '75%': quantiles.quantile(0.75),
+                     'max': values.max},
+        'hist': {'counts': np.round(np.diff(below) * values.count).astype(np.int64).tolist(),
+                 'edges': edges.tolist()},
+        'rank_error': quantiles.rank_error,
+    }
+
+
+def numeric_summary(frame, numeric_columns):
+    """``describe()`` and a histogram for each numeric column of ``frame``"""
+    stats = {}
+    for name in numeric_columns:
+        values = frame[name].dropna()
+        counts, edges = np.histogram(values, bins=NUMERIC_HIST_BINS) if len(values) else ([], [])
+        stats[name] = {
+            'describe': {k: float(v) for k, v in values.describe().items()},
+            'hist': {'counts': np.asarray(counts).tolist(), 'edges': np.asarray(edges).tolist()},
+            'rank_error': 0.0,
+        }
+    return stats
+
+
+def build_snapshot(path=DATA_FILE, cache_dir=CACHE_DIR, chunksize=PROFILE_CHUNK_ROWS):
+    """Compute a snapshot in one streaming pass over the CSV"""
+    profile = DatasetProfile()
+    hashes = []
+    head = []
+    numeric = {}
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        if not head:
+            head = json_safe_head(chunk)
+        profile.update(chunk)
+        collect_numeric_values(numeric, profile, chunk)
+        hashes.append(row_hashes(chunk))
+
+    duplicate_rows = count_duplicates(np.concatenate(hashes)) if hashes else 0
+    return snapshot_from_profile(profile, dataset_version(path, cache_dir), duplicate_rows, head,
+                                 profile_numeric_stats(profile, numeric))
+
+
+def snapshot_from_profile(profile, version, duplicate_rows, head, numeric_stats, **extra):
+    """Assemble a snapshot from a finished ``DatasetProfile``"""
+    columns = list(profile.columns)
+    # A preview passes the types of its sample in, classified before its counts were scaled
+    column_types = extra.pop('column_types', None) or infer_column_types(profile)
+    return ProfileSnapshot(
+        version=version,
+        created=datetime.now().isoformat(timespec='seconds'),
+        num_rows=profile.rows,
+        columns=columns,
+        dtypes={c: profile.columns[c].dtype for c in columns},
+        nulls={c: profile.columns[c].nulls for c in columns},
+        memory_bytes={c: profile.columns[c].memory_bytes for c in columns},
+        duplicate_rows=duplicate_rows,
+        head=head,
+        text_columns=[c for c in columns if profile.columns[c].kind == 'text'],
+        numeric_columns=[c for c in columns if profile.columns[c].kind == 'numeric'],
+        numeric_stats=numeric_stats,
+        text_stats={c: _text_stats(profile.columns[c]) for c in columns
+                    if profile.columns[c].kind == 'text'},
+        categories={c: _category_stats(profile.columns[c]) for c in columns},
+        column_types=column_types,
+        **extra,
+    )
+
+
+def snapshot_path(path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """Location of the persisted snapshot for a dataset version"""
+    version = version or source_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.snapshot-{version}.json')
+
+
+def save_snapshot(snapshot, path=DATA_FILE, cache_dir=CACHE_DIR):
+    target = snapshot_path(path, cache_dir, snapshot.version)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(snapshot.to_dict(), fh)
+    os.replace(tmp_path, target)
+    return target
+
+
+def read_snapshot(path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """The persisted snapshot for a dataset version, or None if there is none yet"""
+    try:
+        with open(snapshot_path(path, cache_dir, version), encoding='utf-8') as fh:
+            data = json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        count_cache(False)
+        return None
+    current = data.get('format') == SNAPSHOT_FORMAT
+    count_cache(current)
+    return ProfileSnapshot.from_dict(data) if current else None
+
+
+def load_snapshot(path=DATA_FILE, cache_dir=CACHE_DIR):
+    """Load the persisted snapshot for the current dataset, building it if needed
+
+    A missing snapshot is built from the incremental profile state, so
+    after an append only the new rows are parsed.
+    """
+    version = source_version(path, cache_dir)
+    snapshot = read_snapshot(path, cache_dir, version)
+    if snapshot is not None:
+        return snapshot
+
+    state = update_profile_state(path, cache_dir)
+    snapshot = snapshot_from_profile(state.profile, version, state.duplicate_rows, state.head,
+                                     profile_numeric_stats(state.profile, state.numeric))
+    save_snapshot(snapshot, path, cache_dir)
+    return snapshot
@@ -0,0 +1,132 @@
+"""
+Vectorized text statistics: characters, words, sentences and lines
+
+All four counts are computed with Arrow compute kernels, which scan the
+string buffers directly instead of building a Python list of Python
+strings per row the way ``.str.split().str.len()`` does. Large inputs are
+sliced into chunks and processed on a thread pool (the kernels release
+the GIL). Results are compact uint32 NumPy arrays.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# A sentence is a run of non-terminator text starting with a visible character
+SENTENCE_PATTERN = r'[^.!?\s][^.!?]*'
+TEXT_STATS_CHUNK_ROWS = 50_000
+FIELDS = ('chars', 'words', 'sentences', 'lines')
+
+
+@dataclass
+class TextStats:
+    """Per-row counts for a text column (missing values count as empty)
+
+    Counts that were not requested are None.
+    """
+
+    chars: np.ndarray = None
+    words: np.ndarray = None
+    sentences: np.ndarray = None
+    lines: np.ndarray = None
+
+    def __len__(self):
+        computed = [getattr(self, name) for name in FIELDS if getattr(self, name) is not None]
+        return len(computed[0]) if computed else 0
+
+    def summary(self):
+        """Mean, median and max of every computed count"""
+        summary = {}
+        for name in FIELDS:
+            values = getattr(self, name)
+            if values is None:
+                continue
+            summary[name] = {
+                'mean': float(values.mean()) if len(values) else 0.0,
+                'median': float(np.median(values)) if len(values) else 0.0,
+                'max': int(values.max()) if len(values) else 0,
+            }
+        return summary
+
+
+def _as_uint32(array):
+    return np.asarray(array.fill_null(0).to_numpy(zero_copy_only=False), dtype=np.uint32)
+
+
+def _arrow_word_counts(strings):
+    # Same semantics as len(str.split()): Unicode whitespace, runs collapse.
+    # Trimming first means the split yields no empty edge pieces.
+    trimmed = pc.utf8_trim_whitespace(strings)
+    pieces = _as_uint32(pc.list_value_length(pc.utf8_split_whitespace(trimmed)))
+    return np.where(_as_uint32(pc.utf8_length(trimmed)) > 0, pieces, 0).astype(np.uint32)
+
+
+def _arrow_counts(strings, fields):
+    counts = {}
+    if 'chars' in fields or 'lines' in fields:
+        counts['chars'] = _as_uint32(pc.utf8_length(strings))
+    if 'words' in fields:
+        counts['words'] = _arrow_word_counts(strings)
+    if 'sentences' in fields:
+        counts['sentences'] = _as_uint32(pc.count_substring_regex(strings, SENTENCE_PATTERN))
+    if 'lines' in fields:
+        newlines = _as_uint32(pc.count_substring(strings, '\n'))
+        counts['lines'] = np.where(counts['chars'] > 0, newlines + 1, 0).astype(np.uint32)
+    return {name: counts[name] for name in fields}
+
+
+def _python_counts(texts, fields):
+    """Fallback when pyarrow is not installed"""
+    texts = texts.fillna('').astype(str)
+    sentence_re = re.compile(SENTENCE_PATTERN)
+    chars = texts.str.len().to_numpy(dtype=np.uint32)
+    counts = {
+        'chars': lambda: chars,
+        'words': lambda: np.fromiter((len(t.split()) for t in texts), dtype=np.uint32, count=len(texts)),
+        'sentences': lambda: np.fromiter((sum(1 for _ in sentence_re.finditer(t)) for t in texts),
+                                         dtype=np.uint32, count=len(texts)),
+        'lines': lambda: np.where(chars > 0, texts.str.count('\n').to_numpy() + 1, 0).astype(np.uint32),
+    }
+    return {name: counts[name]() for name in fields}
+
+
+def _to_arrow(texts):
+    if isinstance(texts, (pa.Array, pa.ChunkedArray)):
+        return texts
+    return pa.array(pd.Series(texts), type=pa.string(), from_pandas=True)
+
+
+def compute_text_stats(texts, chunk_rows=TEXT_STATS_CHUNK_ROWS, workers=None, fields=FIELDS):
+    """Character, word, sentence and line counts for every row of ``texts``
+
+    ``texts`` may be a pandas Series (object or Arrow-backed strings) or an
+    Arrow array. Inputs longer than ``chunk_rows`` are split into slices
+    and counted on ``workers`` threads (default: one per CPU). ``fields``
+    limits which counts are computed.
+    """
+    fields = tuple(fields)
+    if pa is None:
+        return TextStats(**_python_counts(pd.Series(texts), fields))
+
+    strings = _to_arrow(texts)
+    slices = [strings.slice(start, chunk_rows) for start in range(0, len(strings), chunk_rows)]
+    if len(slices) <= 1 or workers == 1:
+        parts = [_arrow_counts(part, fields) for part in slices]
+    else:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            parts = list(pool.map(lambda part: _arrow_counts(part, fields), slices))
+
+    if not parts:
+        return TextStats(**{name: np.empty(0, dtype=np.uint32) for name in fields})
+    return TextStats(**{name: np.concatenate([part[name] for part in parts]) for name in fields})
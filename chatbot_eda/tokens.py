@@ -0,0 +1,368 @@
+"""
+Subword token counts and truncation rates against ``max_seq_length``
+
+Counts how many tokens a model's tokenizer would produce for each row,
+from local vocabulary files only (no network, no transformers install):
+
+    vocab.txt                  BERT-style WordPiece (lowercased and
+                               accent-stripped for uncased vocabularies)
+    vocab.json + merges.txt    GPT-2/RoBERTa-style byte-level BPE
+
+Only counts are needed. Texts are split into words with the tokenizer's
+own pre-tokenization. Each distinct word is tokenized once and cached,
+since the corpus repeats a small vocabulary of words. A row's count is
+the sum over its words, done as one ``bincount`` per chunk. WordPiece
+splits in Arrow's RE2. Each punctuation mark and CJK character is a
+token of its own there, so those are counted without a word lookup.
+
+Chunks run on a process pool and their exact length histograms are
+merged. Results are cached per vocabulary and dataset version.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE, cache_paths, dataset_info, dataset_version, ensure_cache
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.jobs import process_pool
+from chatbot_eda.profiler import LengthHistogram
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+TOKEN_CAP = 8_192
+SEQ_LENGTHS = (128, 256, 512)
+PERCENTILES = (50, 90, 95, 99)
+# [CLS] + [SEP] (WordPiece) or <s> + </s> (RoBERTa BPE), added to every sequence
+SPECIAL_TOKENS = 2
+TOKEN_CHUNK_ROWS = 20_000
+MAX_WORD_CHARS = 100
+
+# BERT's basic tokenizer: punctuation (Unicode or ASCII symbols) and CJK ideographs are
+# one-character words, whitespace and control characters separate words
+_SINGLES_RE2 = r'\p{P}!-/:-@\[-`{-~\p{Han}'
+WORDPIECE_SINGLES_RE2 = f'[{_SINGLES_RE2}]'
+WORDPIECE_SEPARATORS_RE2 = rf'[\s\p{{Z}}\p{{Cc}}\p{{Cf}}{_SINGLES_RE2}]+'
+# The same with re, used without pyarrow; non-ASCII symbols are split off like punctuation
+_CJK = '㐀-䶿一-鿿豈-﫿'
+WORDPIECE_PATTERN = rf'[{_CJK}]|[^\W_{_CJK}]+|[^\w\s]|_'
+# GPT-2's pre-tokenizer; without the regex module, \p{L} and \p{N} are approximated with re classes
+BPE_PATTERN = r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+"""
+BPE_PATTERN_RE = r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+"""
+
+
+def file_digest(*paths):
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        with open(path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class SubwordCounter(ABC):
+    """Token counts of texts through a cached per-word tokenizer"""
+
+    name = None
+
+    def __init__(self, pattern, fingerprint):
+        self.pattern = pattern
+        self.fingerprint = fingerprint
+        self.cache = {}
+
+    def prepare(self, texts):
+        """Whole-text normalization before splitting into words"""
+        return texts
+
+    @abstractmethod
+    def word_tokens(self, word):
+        """Number of subword tokens of one pre-tokenized word"""
+
+    def split(self, texts):
+        """(row of each word, word codes, distinct words, one-token words per row)"""
+        words = self.prepare(texts).map(self.pattern.findall).explode().dropna()
+        codes, uniques = pd.factorize(words.to_numpy(dtype=object))
+        return words.index.to_numpy(dtype=np.int64), codes, uniques, 0
+
+    def count(self, texts):
+        """Tokens per text, special tokens excluded; missing texts count 0"""
+        texts = pd.Series(texts, dtype=object).fillna('').astype(str).reset_index(drop=True)
+        rows, codes, uniques, singles = self.split(texts)
+        cache = self.cache
+        per_word = np.empty(len(uniques), dtype=np.int64)
+        for position, word in enumerate(uniques):
+            tokens = cache.get(word)
+            if tokens is None:
+                tokens = cache[word] = self.word_tokens(word)
+            per_word[position] = tokens
+        counts = np.bincount(rows, weights=per_word[codes], minlength=len(texts))
+        return counts.astype(np.int64) + singles
+
+
+class WordPieceCounter(SubwordCounter):
+    """Greedy longest-match-first WordPiece over a BERT ``vocab.txt``"""
+
+    name = 'WordPiece'
+
+    def __init__(self, vocab_file, lowercase=None):
+        with open(vocab_file, encoding='utf-8') as fh:
+            self.vocab = frozenset(line.rstrip('\n') for line in fh if line.strip())
+        if lowercase is None:
+            # Cased vocabularies (bert-base-cased) keep capitalized words
+            lowercase = not any(token[:1].isupper() for token in self.vocab if not token.startswith('['))
+        self.lowercase = lowercase
+        super().__init__(re.compile(WORDPIECE_PATTERN), f"wordpiece-{file_digest(vocab_file)}")
+
+    def prepare(self, texts):
+        return texts.str.lower() if self.lowercase else texts
+
+    def split(self, texts):
+        if pa is None:
+            return super().split(texts)
+        texts = pa.array(texts, type=pa.large_string())
+        if self.lowercase:
+            texts = pc.utf8_lower(texts)
+        runs = pc.split_pattern_regex(texts, WORDPIECE_SEPARATORS_RE2)
+        words = pc.dictionary_encode(pc.list_flatten(runs))
+        singles = pc.count_substring_regex(texts, WORDPIECE_SINGLES_RE2)
+        return (pc.list_parent_indices(runs).to_numpy(), words.indices.to_numpy(), words.dictionary.to_pylist(),
+                singles.to_numpy().astype(np.int64))
+
+    def word_tokens(self, word):
+        if self.lowercase:
+            word = ''.join(c for c in unicodedata.normalize('NFD', word) if unicodedata.category(c) != 'Mn')
+            if not word:
+                return 0
+        if len(word) > MAX_WORD_CHARS:
+            return 1
+        tokens, start = 0, 0
+        while start < len(word):
+            end = len(word)
+            while end > start:
+                piece = word[start:end] if start == 0 else '##' + word[start:end]
+                if piece in self.vocab:
+                    break
+                end -= 1
+            if end == start:
+                # No piece matches: the whole word becomes [UNK]
+                return 1
+            tokens += 1
+            start = end
+        return tokens
+
+
+def _bytes_to_unicode():
+    """GPT-2's reversible byte -> printable character table"""
+    printable = list(range(ord('!'), ord('~') + 1)) + list(range(ord('¡'), ord('¬') + 1)) + \
+        list(range(ord('®'), ord('ÿ') + 1))
+    chars = printable[:]
+    extra = 0
+    for byte in range(256):
+        if byte not in printable:
+            printable.append(byte)
+            chars.append(256 + extra)
+            extra += 1
+    return dict(zip(printable, map(chr, chars)))
+
+
+class BPECounter(SubwordCounter):
+    """Byte-level BPE over a GPT-2/RoBERTa ``vocab.json`` and ``merges.txt``"""
+
+    name = 'byte-level BPE'
+
+    def __init__(self, vocab_file, merges_file):
+        with open(merges_file, encoding='utf-8') as fh:
+            merges = [tuple(line.split()) for line in fh if line.strip() and not line.startswith('#version')]
+        self.ranks = {pair: rank for rank, pair in enumerate(merges) if len(pair) == 2}
+        self.byte_encoder = _bytes_to_unicode()
+        pattern = regex.compile(BPE_PATTERN) if regex is not None else re.compile(BPE_PATTERN_RE)
+        super().__init__(pattern, f"bpe-{file_digest(vocab_file, merges_file)}")
+
+    def word_tokens(self, word):
+        parts = [self.byte_encoder[byte] for byte in word.encode('utf-8')]
+        ranks = self.ranks
+        while len(parts) > 1:
+            pairs = {(parts[i], parts[i + 1]) for i in range(len(parts) - 1)}
+            best = min(pairs, key=lambda pair: ranks.get(pair, float('inf')))
+            if best not in ranks:
+                break
+            merged, position = [], 0
+            while position < len(parts):
+                if position < len(parts) - 1 and (parts[position], parts[position + 1]) == best:
+                    merged.append(parts[position] + parts[position + 1])
+                    position += 2
+                else:
+                    merged.append(parts[position])
+                    position += 1
+            parts = merged
+        return len(parts)
+
+
+def load_counter(vocabulary):
+    """Counter for a vocabulary file or a directory holding vocab.txt or vocab.json + merges.txt"""
+    vocabulary = Path(vocabulary)
+    if vocabulary.is_dir():
+        if (vocabulary / 'vocab.json').exists() and (vocabulary / 'merges.txt').exists():
+            return BPECounter(vocabulary / 'vocab.json', vocabulary / 'merges.txt')
+        vocabulary = vocabulary / 'vocab.txt'
+    if vocabulary.suffix == '.json':
+        return BPECounter(vocabulary, vocabulary.with_name('merges.txt'))
+    if not vocabulary.exists():
+        raise FileNotFoundError(vocabulary)
+    return WordPieceCounter(vocabulary)
+
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+_counters = {}
+
+
+def get_counter(vocabulary):
+    """The process's counter for ``vocabulary``, so its word cache outlives a chunk"""
+    key = str(vocabulary)
+    if key not in _counters:
+        _counters.clear()
+        _counters[key] = load_counter(vocabulary)
+    return _counters[key]
+
+
+def _map_chunk(columns, vocabulary, cap):
+    """Worker: token-length histogram counts per column for one chunk"""
+    counter = get_counter(vocabulary)
+    return {column: LengthHistogram(cap).update(counter.count(texts)).counts for column, texts in columns.items()}
+
+
+def _row_chunks(path, columns, cache_dir, chunk_rows):
+    """({column: texts}, rows read so far, total rows or None) per chunk"""
+    if pq is None:
+        read = 0
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+            read += len(chunk)
+            yield {column: chunk[column].tolist() for column in columns}, read, None
+        return
+    parquet_file = pq.ParquetFile(ensure_cache(path, cache_dir))
+    total, read = parquet_file.metadata.num_rows, 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        read += batch.num_rows
+        yield {column: batch.column(column).to_pylist() for column in columns}, read, total
+
+
+@dataclass
+class TokenLengths:
+    """Exact per-row token-length histograms of each text column for one tokenizer"""
+
+    tokenizer: str
+    fingerprint: str
+    histograms: dict = field(default_factory=dict)
+
+    def summary(self, column, seq_lengths=SEQ_LENGTHS, special_tokens=SPECIAL_TOKENS):
+        """Mean, percentiles and max of the token count, and the share of rows over each length
+
+        A row is truncated at ``L`` when its tokens plus ``special_tokens``
+        exceed ``L``. Counts at or above TOKEN_CAP are treated as TOKEN_CAP.
+        """
+        hist = self.histograms[column]
+        total = max(hist.total, 1)
+        nonzero = np.flatnonzero(hist.counts)
+        summary = {
+            'rows': hist.total,
+            'mean': float(np.arange(hist.cap + 1) @ hist.counts) / total,
+            **{f'p{q}': hist.quantile(q / 100) for q in PERCENTILES},
+            'max': int(nonzero[-1]) if nonzero.size else 0,
+            'capped': bool(hist.counts[-1]),
+            'truncated': {},
+        }
+        for length in seq_lengths:
+            limit = max(length - special_tokens, 0)
+            summary['truncated'][length] = float(hist.counts[limit + 1:].sum()) / total
+        return summary
+
+    def to_dict(self):
+        return {'tokenizer': self.tokenizer, 'fingerprint': self.fingerprint,
+                'histograms': {column: hist.to_dict() for column, hist in self.histograms.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['tokenizer'], data['fingerprint'],
+                   {column: LengthHistogram.from_dict(hist) for column, hist in data['histograms'].items()})
+
+
+def token_lengths(vocabulary, path=DATA_FILE, columns=None, workers=None, cache_dir=CACHE_DIR,
+                  chunk_rows=TOKEN_CHUNK_ROWS, cap=TOKEN_CAP, progress=None):
+    """Token-length histograms of ``columns`` (default: every text column) under a local vocabulary
+
+    Chunks are counted on a process pool of ``workers`` processes (default:
+    one per CPU; ``workers=1`` counts in-process), at most ``2 * workers``
+    in flight. ``progress(fraction, message, partial)`` receives the
+    running ``TokenLengths`` after each reduced chunk.
+    """
+    counter = get_counter(vocabulary)
+    columns = columns or dataset_info(path, cache_dir)['text_columns']
+    result = TokenLengths(counter.name, counter.fingerprint, {column: LengthHistogram(cap) for column in columns})
+    chunks = _row_chunks(path, columns, cache_dir, chunk_rows)
+    workers = workers or os.cpu_count() or 1
+
+    def reduce(partial, read, total):
+        for column, counts in partial.items():
+            result.histograms[column].counts += counts
+        if progress is not None:
+            progress(read / total if total else 0.0, f"{read:,} rows tokenized", result)
+
+    if workers == 1:
+        for texts, read, total in chunks:
+            reduce(_map_chunk(texts, vocabulary, cap), read, total)
+    else:
+        with process_pool(workers) as pool:
+            pending = []
+            for texts, read, total in chunks:
+                pending.append((pool.submit(_map_chunk, texts, vocabulary, cap), read, total))
+                if len(pending) >= 2 * workers:
+                    future, read, total = pending.pop(0)
+                    reduce(future.result(), read, total)
+            for future, read, total in pending:
+                reduce(future.result(), read, total)
+    return result
+
+
+def token_lengths_path(fingerprint, path=DATA_FILE, cache_dir=CACHE_DIR, version=None):
+    """JSON file holding cached token-length histograms for a vocabulary and dataset version"""
+    version = version or dataset_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.tokens-{fingerprint}-{version}.json')
+
+
+def load_or_count_tokens(vocabulary, path=DATA_FILE, cache_dir=CACHE_DIR, workers=None, progress=None):
+    """Cached ``token_lengths`` over every text column"""
+    target = token_lengths_path(get_counter(vocabulary).fingerprint, path, cache_dir)
+    count_cache(target.exists())
+    if target.exists():
+        with open(target, encoding='utf-8') as fh:
+            return TokenLengths.from_dict(json.load(fh))
+
+    result = token_lengths(vocabulary, path, workers=workers, cache_dir=cache_dir, progress=progress)
+    tmp_path = target.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(result.to_dict(), fh)
+    os.replace(tmp_path, target)
+    return result
@@ -0,0 +1,360 @@
+"""
+Dense vector retrieval: pluggable embedders and memory-mapped ANN indexes
+
+Embeddings are written batch by batch into a ``.npy`` file opened with
+``np.lib.format.open_memmap`` (float32 or float16), so the matrix never
+has to fit in memory and is memory-mapped back in for search.
+
+Two indexes share the same ``search`` interface:
+
+- ``BruteForceIndex``: exact inner-product search, the recall baseline
+- ``IVFIndex``: inverted-file index over spherical k-means cells; only the
+  ``nprobe`` closest cells are scanned, trading recall for latency
+
+Embedders expose ``name``, ``dim``, ``config()`` and ``embed(texts)``.
+``HashingEmbedder`` needs no model download; ``SentenceTransformerEmbedder``
+loads a bi-encoder lazily when sentence-transformers is installed.
+"""
+
+import json
+from pathlib import Path
+import time
+
+import numpy as np
+import pandas as pd
+
+from chatbot_eda.data_cache import (CACHE_DIR, DATA_FILE, build_directory, cache_paths, dataset_version,
+                                    publish_directory)
+from chatbot_eda.instrumentation import count_cache
+from chatbot_eda.retrieval import TOKEN_PATTERN, SearchResult, top_k
+from chatbot_eda.shared_data import shared_column
+
+EMBED_BATCH_ROWS = 4_096
+SEARCH_BLOCK_ROWS = 65_536
+KMEANS_SAMPLE_ROWS = 50_000
+KMEANS_ITERATIONS = 10
+DEFAULT_NPROBE = 8
+_BIGRAM_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+# ============================================================================
+# EMBEDDERS
+# ============================================================================
+
+class HashingEmbedder:
+    """Signed feature hashing of word unigrams and bigrams, L2-normalized
+
+    Deterministic and offline: the same text always maps to the same vector,
+    so indexes can be built and tested without any model files.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, dim=256, seed=0):
+        self.dim = dim
+        self.seed = seed
+
+    def config(self):
+        return {'name': self.name, 'dim': self.dim, 'seed': self.seed}
+
+    def embed(self, texts):
+        texts = pd.Series(texts).fillna('').astype(str).reset_index(drop=True)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        tokens = texts.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        if tokens.empty:
+            return vectors
+
+        docs = tokens.index.to_numpy(dtype=np.int64)
+        hashes = pd.util.hash_array(tokens.to_numpy(dtype=object)) ^ np.uint64(self.seed)
+        same_doc = docs[1:] == docs[:-1]
+        bigrams = (hashes[:-1] * _BIGRAM_MIX) ^ hashes[1:]
+        hashes = np.concatenate([hashes, bigrams[same_doc]])
+        docs = np.concatenate([docs, docs[1:][same_doc]])
+
+        buckets = (hashes % np.uint64(self.dim)).astype(np.int64)
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+        flat = np.bincount(docs * self.dim + buckets, weights=signs, minlength=len(texts) * self.dim)
+        vectors[:] = flat.reshape(len(texts), self.dim)
+        return _normalize(vectors).astype(np.float32)
+
+
+class SentenceTransformerEmbedder:
+    """Bi-encoder embeddings from sentence-transformers (loaded on first use)"""
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model_name='sentence-transformers/all-MiniLM-L6-v2', device=None):
+        self.model_name = model_name
+        self.device = device
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as exc:
+                raise ImportError(
+                    "sentence-transformers is required for this embedder; "
+                    "use HashingEmbedder to work offline") from exc
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    @property
+    def dim(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def config(self):
+        return {'name': self.name, 'model_name': self.model_name}
+
+    def embed(self, texts):
+        texts = pd.Series(texts).fillna('').astype(str).tolist()
+        vectors = self.model.encode(texts, batch_size=64, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+EMBEDDERS = {
+    HashingEmbedder.name: HashingEmbedder,
+    SentenceTransformerEmbedder.name: SentenceTransformerEmbedder,
+}
+
+
+def make_embedder(name='hashing', **kwargs):
+    """Instantiate a registered embedder by name"""
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown embedder: {name!r} (expected one of {tuple(EMBEDDERS)})")
+    return EMBEDDERS[name](**kwargs)
+
+
+def embedder_from_config(config):
+    """Recreate the embedder described by ``embedder.config()``"""
+    config = dict(config)
+    return make_embedder(config.pop('name'), **config)
+
+
+def write_embeddings(texts, embedder, target, dtype=np.float32, batch_rows=EMBED_BATCH_ROWS):
+    """Embed ``texts`` batch by batch straight into a memory-mapped ``.npy`` file"""
+    texts = pd.Series(texts).reset_index(drop=True)
+    first = embedder.embed(texts.iloc[:batch_rows])
+    matrix = np.lib.format.open_memmap(target, mode='w+', dtype=dtype,
+                                       shape=(len(texts), first.shape[1]))
+    matrix[:len(first)] = first
+    for start in range(batch_rows, len(texts), batch_rows):
+        matrix[start:start + batch_rows] = embedder.embed(texts.iloc[start:start + batch_rows])
+    matrix.flush()
+    del matrix
+    return np.load(target, mmap_mode='r')
+
+
+# ============================================================================
+# INDEXES
+# ============================================================================
+
+class BruteForceIndex:
+    """Exact inner-product search over (optionally memory-mapped) vectors"""
+
+    kind = 'exact'
+
+    def __init__(self, vectors, block_rows=SEARCH_BLOCK_ROWS):
+        self.vectors = vectors
+        self.block_rows = block_rows
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def search_vectors(self, queries, k=10):
+        """Top-k rows for each query vector, scanning the matrix in blocks"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        best_ids = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.vectors), self.block_rows):
+            block = np.asarray(self.vectors[start:start + self.block_rows], dtype=np.float32)
+            scores = np.concatenate([best_scores, queries @ block.T], axis=1)
+            ids = np.concatenate([best_ids, np.broadcast_to(
+                np.arange(start, start + len(block)), (len(queries), len(block)))], axis=1)
+            top = top_k(scores, k)
+            best_ids = np.take_along_axis(ids, top, axis=1)
+            best_scores = np.take_along_axis(scores, top, axis=1)
+        return [SearchResult(doc_ids=ids, scores=s) for ids, s in zip(best_ids, best_scores)]
+
+
+class IVFIndex:
+    """Inverted-file ANN index: vectors grouped by their nearest centroid
+
+    ``nprobe`` is the number of cells scanned per query. ``nprobe=nlist``
+    is exact search; smaller values are faster at some loss of recall.
+    """
+
+    kind = 'ivf'
+
+    def __init__(self, vectors, centroids, list_ptr, list_ids, nprobe=DEFAULT_NPROBE):
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_ptr = list_ptr
+        self.list_ids = list_ids
+        self.nprobe = nprobe
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, vectors, nlist=None, iterations=KMEANS_ITERATIONS,
+              sample_rows=KMEANS_SAMPLE_ROWS, seed=0):
+        """Train spherical k-means on a sample, then assign every vector"""
+        nlist = nlist or max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(seed)
+        sample_ids = np.sort(rng.choice(len(vectors), min(sample_rows, len(vectors)), replace=False))
+        sample = np.asarray(vectors[sample_ids], dtype=np.float32)
+        nlist = min(nlist, len(sample))
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            filled = np.bincount(assignment, minlength=nlist) > 0
+            # Empty cells keep their previous centroid
+            centroids[filled] = _normalize(sums[filled])
+
+        assignment = np.concatenate([
+            np.argmax(np.asarray(vectors[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+                      @ centroids.T, axis=1)
+            for start in range(0, len(vectors), SEARCH_BLOCK_ROWS)
+        ])
+        list_ids = np.argsort(assignment, kind='stable').astype(np.int64)
+        list_ptr = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=nlist), out=list_ptr[1:])
+        return cls(vectors, centroids.astype(np.float32), list_ptr, list_ids)
+
+    def search_vectors(self, queries, k=10, nprobe=None):
+        """Top-k rows for each query vector, scanning the ``nprobe`` nearest cells"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        cells = top_k(queries @ self.centroids.T, nprobe)
+        results = []
+        for query, probed in zip(queries, cells):
+            candidates = np.concatenate([
+                self.list_ids[self.list_ptr[cell]:self.list_ptr[cell + 1]] for cell in probed
+            ])
+            candidates.sort()
+            scores = np.asarray(self.vectors[candidates], dtype=np.float32) @ query
+            top = top_k(scores, k)
+            results.append(SearchResult(doc_ids=candidates[top], scores=scores[top]))
+        return results
+
+
+class VectorIndex:
+    """An embedder paired with an exact and an IVF index over the same vectors"""
+
+    def __init__(self, embedder, vectors, ivf, meta=None):
+        self.embedder = embedder
+        self.vectors = vectors
+        self.exact = BruteForceIndex(vectors)
+        self.ivf = ivf
+        self.meta = meta or {}
+
+    @property
+    def num_docs(self):
+        return len(self.vectors)
+
+    def search(self, query, k=10, approximate=True, nprobe=None):
+        """Top-k documents for one query text"""
+        return self.search_batch([query], k, approximate, nprobe)[0]
+
+    def search_batch(self, queries, k=10, approximate=True, nprobe=None):
+        """Top-k documents for several query texts, embedded in one batch"""
+        vectors = self.embedder.embed(queries)
+        if approximate:
+            return self.ivf.search_vectors(vectors, k, nprobe)
+        return self.exact.search_vectors(vectors, k)
+
+    @classmethod
+    def build(cls, texts, embedder, directory, dtype=np.float32, nlist=None):
+        """Embed ``texts`` into ``directory`` and train the IVF index"""
+        start_time = time.perf_counter()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        vectors = write_embeddings(texts, embedder, directory / 'vectors.npy', dtype=dtype)
+        embed_seconds = time.perf_counter() - start_time
+        ivf = IVFIndex.build(vectors, nlist=nlist)
+        np.save(directory / 'centroids.npy', ivf.centroids)
+        np.save(directory / 'list_ptr.npy', ivf.list_ptr)
+        np.save(directory / 'list_ids.npy', ivf.list_ids)
+        meta = {
+            'embedder': embedder.config(),
+            'num_docs': len(vectors),
+            'dim': int(vectors.shape[1]),
+            'dtype': np.dtype(dtype).name,
+            'nlist': ivf.nlist,
+            'embed_seconds': embed_seconds,
+            'build_seconds': time.perf_counter() - start_time,
+        }
+        with open(directory / 'meta.json', 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, indent=2)
+        return cls(embedder, vectors, ivf, meta)
+
+    @classmethod
+    def load(cls, directory, embedder=None):
+        """Memory-map a saved index; the embedder is rebuilt from its config"""
+        directory = Path(directory)
+        with open(directory / 'meta.json', encoding='utf-8') as fh:
+            meta = json.load(fh)
+        vectors = np.load(directory / 'vectors.npy', mmap_mode='r')
+        ivf = IVFIndex(vectors, np.load(directory / 'centroids.npy'),
+                       np.load(directory / 'list_ptr.npy'), np.load(directory / 'list_ids.npy'))
+        return cls(embedder or embedder_from_config(meta['embedder']), vectors, ivf, meta)
+
+
+def vector_index_path(column, embedder_name='hashing', path=DATA_FILE, cache_dir=CACHE_DIR,
+                      version=None):
+    """Directory of the persisted vector index for a column, embedder and dataset version"""
+    version = version or dataset_version(path, cache_dir)
+    parquet_path, _ = cache_paths(path, cache_dir)
+    return parquet_path.with_name(f'{parquet_path.stem}.vectors-{column}-{embedder_name}-{version}')
+
+
+def load_or_build_vector_index(column, embedder=None, path=DATA_FILE, cache_dir=CACHE_DIR,
+                               dtype=np.float32, nlist=None):
+    """Memory-map the persisted vector index for ``column``, building it first if needed"""
+    embedder = embedder or HashingEmbedder()
+    directory = vector_index_path(column, embedder.name, path, cache_dir)
+    count_cache((directory / 'meta.json').exists())
+    if (directory / 'meta.json').exists():
+        return VectorIndex.load(directory, embedder)
+
+    texts = shared_column(path, column, cache_dir)
+    tmp_directory = build_directory(directory)
+    VectorIndex.build(texts, embedder, tmp_directory, dtype=dtype, nlist=nlist)
+    publish_directory(tmp_directory, directory)
+    return VectorIndex.load(directory, embedder)
+
+
+def recall_at_k(index, queries, k=10, nprobe=None):
+    """Mean overlap of IVF and exact top-k, with per-query latency of each"""
+    vectors = index.embedder.embed(queries)
+    timings = {'exact': [], 'ivf': []}
+    overlaps = []
+    for vector in vectors:
+        start = time.perf_counter()
+        exact = index.exact.search_vectors(vector, k)[0]
+        timings['exact'].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        approx = index.ivf.search_vectors(vector, k, nprobe)[0]
+        timings['ivf'].append((time.perf_counter() - start) * 1000)
+        if len(exact.doc_ids):
+            overlaps.append(len(np.intersect1d(exact.doc_ids, approx.doc_ids)) / len(exact.doc_ids))
+    return {
+        'recall': float(np.mean(overlaps)) if overlaps else 0.0,
+        'exact_p50_ms': float(np.percentile(timings['exact'], 50)) if len(vectors) else 0.0,
+        'ivf_p50_ms': float(np.percentile(timings['ivf'], 50)) if len(vectors) else 0.0,
+        'queries': len(vectors),
+    }
@@ -0,0 +1,47 @@
+"""
+Dashboard page registry
+
+Each page lives in its own module with a ``render(ctx)`` function taking
+a ``PageContext``. ``render_page`` imports a page's module the first time
+it is selected, so a run only loads the code and libraries of the page on
+screen. Pages marked static never read the dataset.
+"""
+
+from dataclasses import dataclass
+import importlib
+
+
+@dataclass(frozen=True)
+class Page:
+    title: str
+    module: str
+    static: bool = False
+
+
+PAGES = (
+    Page("🏠 Home", 'home'),
+    Page("📊 Dataset Overview", 'overview'),
+    Page("🔍 Data Quality", 'quality'),
+    Page("📈 Statistical Analysis", 'statistics'),
+    Page("🏥 Medical Domain Analysis", 'medical'),
+    Page("📝 NLP Analysis", 'nlp'),
+    Page("🎯 Key Findings", 'findings'),
+    Page("🔧 Preprocessing Guide", 'preprocessing', static=True),
+    Page("🤖 Model Recommendations", 'models', static=True),
+    Page("🔎 Q&A Search", 'search'),
+)
+PAGE_TITLES = [page.title for page in PAGES]
+STATIC_PAGES = [page.title for page in PAGES if page.static]
+
+
+def get_page(title):
+    for page in PAGES:
+        if page.title == title:
+            return page
+    raise KeyError(title)
+
+
+def render_page(title, ctx):
+    """Import the page's module (once per process) and render it"""
+    module = importlib.import_module(f'{__name__}.{get_page(title).module}')
+    module.render(ctx)
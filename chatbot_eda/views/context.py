@@ -0,0 +1,251 @@
+"""
+Per-run page context and the cached loaders shared by dashboard pages
+
+Nothing here touches the dataset until a page asks for it: the snapshot,
+dataset version and every column, index or report are loaded on first
+access, so static pages render without reading the CSV. Heavy modules
+(pandas through the analysis engine, matplotlib through the charts) are
+imported inside the loaders for the same reason.
+"""
+
+import os
+
+import streamlit as st
+
+from chatbot_eda.instrumentation import MetricsRegistry, log_to_file, serve_metrics
+from chatbot_eda.jobs import JobScheduler
+
+# Same as chatbot_eda.data_cache.DATA_FILE; that module imports pandas
+DATA_FILE = 'ai-medical-chatbot.csv'
+
+
+@st.cache_resource
+def get_metrics():
+    # Process-wide; scraped from EDA_METRICS_PORT and logged to EDA_PERF_LOG when set
+    registry = MetricsRegistry()
+    if os.environ.get('EDA_METRICS_PORT'):
+        serve_metrics(registry, int(os.environ['EDA_METRICS_PORT']))
+    if os.environ.get('EDA_PERF_LOG'):
+        log_to_file(os.environ['EDA_PERF_LOG'])
+    return registry
+
+
+@st.cache_resource
+def get_scheduler():
+    # One job pool for every session, so identical computations run once
+    return JobScheduler()
+
+
+@st.cache_resource
+def get_snapshot(version):
+    # One shared, persisted snapshot per dataset version; pages only read it
+    from chatbot_eda.snapshot import load_snapshot
+    return load_snapshot(DATA_FILE)
+
+
+@st.cache_resource(show_spinner="⚡ Sampling rows for a fast preview...")
+def get_sample_snapshot(version, size):
+    from chatbot_eda.sampling import sample_snapshot
+    return sample_snapshot(DATA_FILE, size, version=version)
+
+
+@st.cache_resource
+def get_text_column(version, column, compact=False):
+    # Read-only column shared across sessions; the default layout maps the host-wide
+    # Arrow file, so other processes on this host share its pages too
+    if compact:
+        from chatbot_eda.data_cache import load_dataset
+        return load_dataset(DATA_FILE, columns=[column], compact=True)[column]
+    from chatbot_eda.shared_data import shared_column
+    return shared_column(DATA_FILE, column)
+
+
+@st.cache_data(show_spinner="🔄 Measuring memory layouts...")
+def get_memory_report(version):
+    from chatbot_eda.compact import memory_report
+    from chatbot_eda.data_cache import load_dataset
+    return memory_report(load_dataset(DATA_FILE), load_dataset(DATA_FILE, compact=True))
+
+
+@st.cache_data
+def get_sample_queries(version, column, n=200, compact=False):
+    # Question prefixes from the corpus, used to profile query latency
+    questions = get_text_column(version, column, compact).dropna()
+    sample = questions.sample(min(n, len(questions)), random_state=42).astype(str).str.slice(0, 120)
+    return sample.tolist()
+
+
+@st.cache_resource(show_spinner="🔄 Loading retrieval index...")
+def get_search_index(version, column, compact=False):
+    # Memory-mapped index, plus a latency profile over sampled real questions
+    from chatbot_eda.retrieval import METHODS, load_or_build_index, measure_latency
+    index = load_or_build_index(column, DATA_FILE)
+    queries = get_sample_queries(version, column, compact=compact)
+    latency = {method: measure_latency(index, queries, method=method) for method in METHODS}
+    return index, latency
+
+
+@st.cache_resource(show_spinner="🔄 Building vector index...")
+def get_vector_index(version, column, compact=False):
+    # Hashed-feature embeddings work offline; recall is measured against exact search
+    import pandas as pd
+    from chatbot_eda.vector_index import load_or_build_vector_index, recall_at_k
+    index = load_or_build_vector_index(column, path=DATA_FILE)
+    queries = get_sample_queries(version, column, 50, compact)
+    probes = sorted({n for n in (1, 4, 8, 16, 32, index.ivf.nlist) if n <= index.ivf.nlist})
+    tradeoff = pd.DataFrame([{'nprobe': n, **recall_at_k(index, queries, 10, n)} for n in probes])
+    return index, tradeoff
+
+
+@st.cache_resource
+def get_chart_cache():
+    from chatbot_eda.charts import ChartCache
+    return ChartCache()
+
+
+class PageContext:
+    """Sidebar settings and per-run state handed to a page's ``render``"""
+
+    def __init__(self, page, trace, compact_mode=False, fast_preview=True, sample_size=10_000):
+        self.page = page
+        self.trace = trace
+        self.compact_mode = compact_mode
+        self.fast_preview = fast_preview
+        self.sample_size = sample_size
+        # Jobs this run is waiting on; the page reruns until they finish
+        self.waiting_jobs = []
+        self._version = None
+        self._snapshot = None
+
+    @property
+    def loaded(self):
+        """True once this run has loaded the snapshot"""
+        return self._snapshot is not None
+
+    @property
+    def version(self):
+        if self._version is None:
+            from chatbot_eda.data_cache import source_version
+            try:
+                self._version = source_version(DATA_FILE)
+            except FileNotFoundError:
+                st.error("❌ Dataset not found. Please ensure 'ai-medical-chatbot.csv' is in the current directory.")
+                st.stop()
+        return self._version
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            with self.trace.phase('load', 'snapshot'):
+                self._snapshot = self._current_snapshot(self.version)
+            if self._snapshot.is_sample:
+                self._preview_banner()
+        return self._snapshot
+
+    def _current_snapshot(self, version):
+        from chatbot_eda.snapshot import load_snapshot, snapshot_path
+        if not self.fast_preview or snapshot_path(DATA_FILE, version=version).exists():
+            return get_snapshot(version)
+        preview = get_sample_snapshot(version, self.sample_size)
+        # Exact snapshot computed in the background, shared by every session
+        full_pass = get_scheduler().submit(('snapshot', version), load_snapshot, DATA_FILE)
+        if full_pass.done:
+            return full_pass.result()
+        self.waiting_jobs.append(full_pass)
+        return preview
+
+    def _preview_banner(self):
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            confidence = self._snapshot.intervals.get('confidence', 0.95)
+            st.info(f"⚡ **Fast preview** - estimated from a {self._snapshot.sample_rows:,}-row sample "
+                    f"(± = {confidence:.0%} confidence interval). Exact values are being computed in the background "
+                    f"and replace the estimates automatically.")
+        with col2:
+            st.button("🔄 Load exact values", help="Switches to exact values once the full pass has finished")
+
+    def run_job(self, label, key, func, *args, **kwargs):
+        """(result, True) of a background job, or (partial result or None, False) with a progress bar"""
+        job = get_scheduler().submit(key, func, *args, **kwargs)
+        if job.done:
+            return job.result(), True
+        self.waiting_jobs.append(job)
+        status = f"{label} {job.progress.message}".strip()
+        st.progress(job.progress.fraction, text=f"⏳ {status} ({job.elapsed:.0f}s)")
+        return job.progress.partial, False
+
+    # Loaders below are timed on every call, cache hits included, as phases of the page
+
+    def text_column(self, column):
+        with self.trace.phase('load', 'get_text_column'):
+            return get_text_column(self.version, column, self.compact_mode)
+
+    def duplicate_report(self, column, threshold):
+        from chatbot_eda.duplicates import detect_duplicates
+        with self.trace.phase('compute', 'get_duplicate_report'):
+            texts = self.text_column(column)
+            return self.run_job("🔄 Detecting duplicate clusters...",
+                                ('duplicates', self.version, column, threshold, self.compact_mode),
+                                detect_duplicates, texts, threshold=threshold)
+
+    def memory_report(self):
+        with self.trace.phase('compute', 'get_memory_report'):
+            return get_memory_report(self.version)
+
+    def keywords(self, column):
+        from chatbot_eda.keywords import load_or_compute_keywords
+        with self.trace.phase('compute', 'get_keywords'):
+            return self.run_job(f"🔄 Counting keywords and n-grams ({column})...",
+                                ('keywords', self.version, column),
+                                load_or_compute_keywords, column, DATA_FILE)
+
+    def boilerplate(self, column):
+        from chatbot_eda.boilerplate import load_or_detect_boilerplate
+        with self.trace.phase('compute', 'get_boilerplate'):
+            return self.run_job(f"🔄 Detecting boilerplate templates ({column})...",
+                                ('boilerplate', self.version, column),
+                                load_or_detect_boilerplate, column, DATA_FILE)
+
+    def medical_terms(self):
+        from chatbot_eda.medical_terms import load_or_extract_terms
+        # Extra or overriding dictionary entries: CSV of term,category[,synonyms]
+        terms_file = os.environ.get('EDA_MEDICAL_TERMS')
+        with self.trace.phase('compute', 'get_medical_terms'):
+            return self.run_job("🔄 Matching medical terms...", ('medical_terms', self.version, terms_file),
+                                load_or_extract_terms, DATA_FILE, terms_file=terms_file)
+
+    def token_lengths(self):
+        from chatbot_eda.tokens import get_counter, load_or_count_tokens
+        # Local tokenizer files: a vocab.txt (WordPiece), vocab.json + merges.txt (BPE) or their directory
+        vocabulary = os.environ.get('EDA_TOKENIZER_VOCAB')
+        if not vocabulary:
+            return None, True
+        with self.trace.phase('compute', 'get_token_lengths'):
+            # Loaded here so a missing or unreadable vocabulary fails on the page, not in a retried job
+            fingerprint = get_counter(vocabulary).fingerprint
+            return self.run_job("🔄 Counting subword tokens...", ('tokens', self.version, fingerprint),
+                                load_or_count_tokens, vocabulary, DATA_FILE)
+
+    def search_index(self, column):
+        with self.trace.phase('compute', 'get_search_index'):
+            return get_search_index(self.version, column, self.compact_mode)
+
+    def vector_index(self, column):
+        with self.trace.phase('compute', 'get_vector_index'):
+            return get_vector_index(self.version, column, self.compact_mode)
+
+    def show_chart(self, chart, column=None, **params):
+        # Rendered once per dataset version, column and parameters; reruns reuse the PNG bytes
+        with self.trace.phase('render', chart.__name__):
+            st.image(get_chart_cache().png(chart, self.snapshot.version, column, **params))
+
+    def ci_text(self, half_width, fmt):
+        # "± half-width" after a sampled metric in fast preview, nothing once values are exact
+        return f" ± {half_width:{fmt}}" if self.snapshot.is_sample else ""
+
+    def text_ci(self, column, metric):
+        return self.snapshot.intervals.get('text', {}).get(column, {}).get(metric, 0.0)
+
+    def pct_ci(self, metric):
+        low, high = self.snapshot.intervals.get(metric, (0.0, 0.0))
+        return (high - low) / 2
@@ -0,0 +1,60 @@
+"""🎯 Key Findings page: readiness score and recommendations"""
+
+import streamlit as st
+
+from chatbot_eda import charts
+from chatbot_eda.report import readiness
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("🎯 Key Findings & Recommendations")
+    
+    missing_pct_total = snapshot.missing_pct
+    duplicate_pct = snapshot.duplicate_pct
+    findings = readiness(snapshot)
+    completeness = findings['completeness']
+    uniqueness = findings['uniqueness']
+    overall_readiness = findings['overall']
+    
+    # Quality score
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Data Completeness", f"{completeness:.1f}%{ctx.ci_text(ctx.pct_ci('missing_pct'), '.1f')}")
+    with col2:
+        st.metric("Uniqueness", f"{uniqueness:.1f}%{ctx.ci_text(ctx.pct_ci('duplicate_pct'), '.1f')}")
+    with col3:
+        st.metric("Overall Readiness", f"{overall_readiness:.1f}%")
+    
+    st.markdown("---")
+    
+    readiness_status = findings['status']
+    
+    st.subheader(f"📌 Overall Status: {readiness_status}")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown(f"""
+        ### Dataset Assessment
+        
+        ✅ **Total Records:** {snapshot.num_rows:,}  
+        ✅ **Features:** {snapshot.num_columns}  
+        ✅ **Memory:** {snapshot.total_memory_mb:.2f} MB  
+        
+        ### Data Quality Summary
+        
+        - **Completeness Score:** {completeness:.1f}%
+        - **Duplicate Records:** {duplicate_pct:.2f}%
+        - **Missing Values:** {missing_pct_total:.2f}%
+        
+        ### Recommendation
+        
+        The dataset is **{readiness_status.lower()}**. 
+        Proceed with model development while maintaining data quality checks.
+        """)
+    
+    with col2:
+        readiness_text = f"{overall_readiness:.0f}%"
+        ctx.show_chart(charts.gauge_chart, value_text=readiness_text, status=readiness_status,
+                       color=findings['color'])
@@ -0,0 +1,55 @@
+"""🏠 Home page: headline metrics and a tour of the dashboard"""
+
+import streamlit as st
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("🏥 AI Medical Chatbot - EDA Dashboard")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(label="📦 Total Records", value=f"{snapshot.num_rows:,}")
+    with col2:
+        st.metric(label="🏷️ Features", value=snapshot.num_columns)
+    with col3:
+        st.metric(label="💾 Dataset Size", value="254.88 MB")
+    
+    st.markdown("---")
+    
+    st.markdown("""
+    ## Welcome to the EDA Dashboard 👋
+    
+    This comprehensive dashboard provides **Exploratory Data Analysis** for the AI Medical Chatbot dataset.
+    Navigate using the sidebar to explore different aspects of the data.
+    
+    ### 📚 What's Included:
+    
+    ✅ **Dataset Overview** - Structure, shape, and composition  
+    ✅ **Data Quality** - Missing values, duplicates, and integrity checks  
+    ✅ **Statistical Analysis** - Descriptive statistics and distributions  
+    ✅ **Medical Domain Analysis** - Disease/intent classification distribution  
+    ✅ **NLP Analysis** - Text length, keywords, and vocabulary analysis  
+    ✅ **Key Findings** - Summary of insights and recommendations  
+    ✅ **Preprocessing Guide** - Step-by-step data preparation pipeline  
+    ✅ **Model Recommendations** - Best practices for chatbot model training  
+    ✅ **Q&A Search** - BM25 / TF-IDF retrieval of similar patient questions  
+    
+    ### 🎯 Quick Stats:
+    """)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    missing_pct = snapshot.missing_pct
+    duplicates_pct = snapshot.duplicate_pct
+    text_cols = snapshot.free_text_columns
+    
+    with col1:
+        st.metric("Data Completeness", f"{100 - missing_pct:.1f}%{ctx.ci_text(ctx.pct_ci('missing_pct'), '.1f')}")
+    with col2:
+        st.metric("Unique Records", f"{(1 - duplicates_pct/100)*100:.1f}%{ctx.ci_text(ctx.pct_ci('duplicate_pct'), '.1f')}")
+    with col3:
+        st.metric("Text Columns", len(text_cols))
+    with col4:
+        st.metric("Categorical Cols", len(snapshot.categorical_columns))
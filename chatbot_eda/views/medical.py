@@ -0,0 +1,170 @@
+"""🏥 Medical Domain Analysis page: medical terms, category counts and balance"""
+
+import pandas as pd
+import streamlit as st
+
+from chatbot_eda import charts
+
+
+CATEGORY_LABELS = {'disease': "🦠 Diseases", 'symptom': "🤒 Symptoms", 'drug': "💊 Drugs"}
+
+
+def _terms_section(ctx, terms, complete):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Rows Mentioning a Term", f"{terms.matched_rows / max(terms.num_rows, 1) * 100:.1f}%")
+    with col2:
+        st.metric("Distinct Terms Found", f"{len(terms.terms):,}")
+    with col3:
+        st.metric("Rows Scanned", f"{terms.num_rows:,}")
+    
+    category = st.radio("Term category:", list(CATEGORY_LABELS), horizontal=True,
+                        format_func=CATEGORY_LABELS.get)
+    found = terms.terms[terms.terms['category'] == category].head(15)
+    
+    if found.empty:
+        st.info(f"ℹ️ No {CATEGORY_LABELS[category].split()[-1].lower()} found")
+        return
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        display_df = pd.DataFrame({
+            'Rank': range(1, len(found) + 1),
+            'Term': found['term'].values,
+            'Rows': found['rows'].values,
+            '% Rows': (found['rows'].values / max(terms.num_rows, 1) * 100).round(2),
+            **{f'{column} Mentions': found[column].values for column in terms.columns},
+        })
+        st.dataframe(display_df, use_container_width=True)
+    
+    with col2:
+        if complete:
+            ctx.show_chart(charts.barh_chart, f'terms/{category}', labels=found['term'].tolist(),
+                           values=found['rows'].tolist(), cmap='Set3', invert=True, label_chars=30,
+                           xlabel='Rows', title=f'Top 15 {CATEGORY_LABELS[category].split()[-1]}')
+        else:
+            # Running totals change every chunk; not worth rendering to the chart cache
+            st.caption("Partial counts - updating as chunks are matched")
+    
+    st.markdown("**🔗 Co-occurring terms** (mentioned in the same row)")
+    selected = st.selectbox("Term:", found['term'].tolist())
+    pairs = terms.pairs[(terms.pairs['term_a'] == selected) | (terms.pairs['term_b'] == selected)]
+    partners = pairs['term_b'].where(pairs['term_a'] == selected, pairs['term_a'])
+    selected_rows = int(found.loc[found['term'] == selected, 'rows'].iloc[0])
+    st.dataframe(pd.DataFrame({
+        'Term': partners.values,
+        'Category': partners.map(dict(zip(terms.terms['term'], terms.terms['category']))).values,
+        'Rows': pairs['rows'].values,
+        f'% of "{selected}" Rows': (pairs['rows'].values / max(selected_rows, 1) * 100).round(1),
+    }).head(15), use_container_width=True)
+    st.caption(f"Dictionary terms matched on token boundaries ({terms.matcher}); synonyms count towards "
+               f"their canonical term. Pairs are the {len(terms.pairs):,} most frequent in the corpus.")
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("🏥 Medical Domain Analysis")
+    
+    st.subheader("🩺 Medical Terms")
+    terms, complete = ctx.medical_terms()
+    if terms is None:
+        st.info("ℹ️ Term frequencies will appear here after the first chunk is matched")
+    else:
+        _terms_section(ctx, terms, complete)
+    
+    st.markdown("---")
+    
+    st.subheader("🗂️ Column Categories")
+    
+    # Only label-like columns are offered; free text and IDs have no meaningful categories
+    categorical_cols = snapshot.categorical_columns
+    
+    if categorical_cols:
+        selected_col = st.selectbox("Select a categorical column:", categorical_cols)
+        
+        category = snapshot.categories[selected_col]
+        n_categories = category['distinct']
+        approximate = category.get('approximate', False)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if approximate:
+                st.metric("Total Categories", f"≈{n_categories:,}",
+                          help=f"HyperLogLog estimate, ±{category['distinct_error'] * 100:.1f}% (1σ)")
+            else:
+                st.metric("Total Categories", n_categories)
+        with col2:
+            imbalance_ratio = category['max_count'] / category['min_count'] if category['min_count'] else 0
+            st.metric("Imbalance Ratio", "n/a" if approximate else f"{imbalance_ratio:.2f}:1")
+        
+        if approximate:
+            st.info(f"ℹ️ **{selected_col}** has too many distinct values to tally exactly; "
+                    f"counts below are Space-Saving upper bounds, each at most "
+                    f"{category['top_error']:,} too high")
+        
+        st.markdown("---")
+        
+        # Top categories
+        st.subheader(f"🏷️ Top 15 {selected_col} Categories")
+        
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            top_15 = pd.Series(dict(category['top']), dtype='int64')
+            display_df = pd.DataFrame({
+                'Rank': range(1, len(top_15) + 1),
+                'Category': [str(x)[:40] for x in top_15.index],
+                'Count': top_15.values,
+                'Percentage': (top_15.values / snapshot.num_rows * 100).round(2)
+            })
+            st.dataframe(display_df, use_container_width=True)
+        
+        with col2:
+            ctx.show_chart(charts.barh_chart, selected_col, labels=[str(x) for x in top_15.index],
+                           values=top_15.values.tolist(), cmap='Set3', invert=True, label_chars=30,
+                           xlabel='Frequency', title=f'Top 15 {selected_col} Distribution')
+        
+        st.markdown("---")
+        
+        # Category balance analysis
+        st.subheader("⚖️ Category Balance Analysis")
+        
+        if approximate:
+            balance_status = "UNKNOWN (sketched counts)"
+        else:
+            balance_status = "WELL-BALANCED" if imbalance_ratio < 2 else "MODERATELY IMBALANCED" if imbalance_ratio < 5 else "HIGHLY IMBALANCED"
+        coverage = "EXCELLENT" if n_categories > 50 else "GOOD" if n_categories > 20 else "MODERATE"
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write(f"""
+            **Balance Status:** {balance_status}
+            
+            **Category Diversity:** {coverage}
+            
+            **Total Categories:** {"≈" if approximate else ""}{n_categories}
+            
+            **Avg samples/category:** {snapshot.num_rows / n_categories:.0f}
+            """)
+        
+        with col2:
+            if category['count_box'] is not None:
+                ctx.show_chart(charts.box_chart, selected_col, boxes=[category['count_box']],
+                               labels=[selected_col], colors=['#3498db'], ylabel='Count',
+                               title='Category Count Distribution', figsize=(8, 6))
+            else:
+                st.info("ℹ️ Count distribution needs exact tallies")
+    else:
+        st.info("ℹ️ No categorical columns found")
+    
+    free_text = [column for column in snapshot.free_text_columns if column not in categorical_cols]
+    if free_text:
+        summaries = []
+        for column in free_text:
+            category = snapshot.categories[column]
+            summaries.append(f"{column} ({'≈' if category['approximate'] else ''}{category['distinct']:,} distinct)")
+        st.caption("Free-text columns, not tallied as categories (terms above; lengths and keywords on the "
+                   "NLP page): " + ", ".join(summaries))
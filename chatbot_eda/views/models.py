@@ -0,0 +1,159 @@
+"""🤖 Model Recommendations page (static)"""
+
+import pandas as pd
+import streamlit as st
+
+
+def render(ctx):
+    st.title("🤖 Model Architecture Recommendations")
+    
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "Intent Classification",
+        "Q&A Matching",
+        "Hyperparameters",
+        "Deployment"
+    ])
+    
+    with tab1:
+        st.subheader("Intent Classification Models")
+        
+        models = [
+            {
+                "Name": "BERT + Classification Head",
+                "Accuracy": "90-95%",
+                "Training Time": "2-4 hours",
+                "Framework": "Hugging Face",
+                "Recommendation": "⭐⭐⭐⭐⭐ BEST FOR MEDICAL"
+            },
+            {
+                "Name": "RoBERTa",
+                "Accuracy": "92-96%",
+                "Training Time": "3-5 hours",
+                "Framework": "Hugging Face",
+                "Recommendation": "⭐⭐⭐⭐⭐ HIGHLY RECOMMENDED"
+            },
+            {
+                "Name": "DistilBERT",
+                "Accuracy": "88-93%",
+                "Training Time": "1-2 hours",
+                "Framework": "Hugging Face",
+                "Recommendation": "⭐⭐⭐⭐ FAST INFERENCE"
+            },
+            {
+                "Name": "Random Forest (Baseline)",
+                "Accuracy": "80-85%",
+                "Training Time": "Minutes",
+                "Framework": "Scikit-learn",
+                "Recommendation": "⭐⭐⭐ FOR BASELINE"
+            }
+        ]
+        
+        models_df = pd.DataFrame(models)
+        st.dataframe(models_df, use_container_width=True)
+    
+    with tab2:
+        st.subheader("Q&A Matching & Retrieval Models")
+        
+        retrieval_models = [
+            {
+                "Name": "Bi-Encoder (Sentence-BERT)",
+                "MRR Score": "0.85-0.92",
+                "Speed": "Fast",
+                "Use Case": "Semantic similarity search",
+                "Status": "⭐⭐⭐⭐⭐ RECOMMENDED"
+            },
+            {
+                "Name": "Cross-Encoder",
+                "MRR Score": "0.90-0.95",
+                "Speed": "Slower",
+                "Use Case": "Ranking verification",
+                "Status": "⭐⭐⭐⭐ FOR ACCURACY"
+            },
+            {
+                "Name": "Dense Passage Retrieval",
+                "MRR Score": "0.88-0.93",
+                "Speed": "Fast",
+                "Use Case": "Large corpus retrieval",
+                "Status": "⭐⭐⭐⭐ FOR SCALE"
+            }
+        ]
+        
+        retrieval_df = pd.DataFrame(retrieval_models)
+        st.dataframe(retrieval_df, use_container_width=True)
+    
+    with tab3:
+        st.subheader("Recommended Hyperparameters")
+        
+        st.markdown("""
+        ```python
+        # Training Configuration
+        learning_rate = 2e-5  # Start with this
+        batch_size = 16       # Adjust based on GPU memory
+        epochs = 10           # With early stopping
+        optimizer = 'AdamW'   # Best for transformers
+        warmup_steps = 500    # 10% of training
+        weight_decay = 0.01   # L2 regularization
+        dropout_rate = 0.1    # Prevent overfitting
+        max_seq_length = 512  # BERT standard
+        
+        # Learning Rate Scheduler
+        # Use: Linear decay with warmup
+        # or: Cosine annealing
+        ```
+        """)
+        
+        st.markdown("---")
+        
+        st.subheader("📊 Evaluation Metrics")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            **Classification Metrics:**
+            - Accuracy
+            - Precision / Recall
+            - F1-Score
+            - ROC-AUC
+            - Confusion Matrix
+            """)
+        
+        with col2:
+            st.markdown("""
+            **Retrieval Metrics:**
+            - MRR (Mean Reciprocal Rank)
+            - NDCG (Normalized Discounted Cumulative Gain)
+            - MAP (Mean Average Precision)
+            - Recall@k
+            """)
+    
+    with tab4:
+        st.subheader("🚀 Deployment Architecture")
+        
+        st.markdown("""
+        ### Recommended Stack
+        
+        **Frontend:**
+        - React/Vue.js for web UI
+        - Mobile apps for iOS/Android
+        
+        **API Layer:**
+        - FastAPI or Flask
+        - Docker containerization
+        - NGINX load balancing
+        
+        **Model Layer:**
+        - Primary: BERT classifier
+        - Secondary: Sentence-BERT retriever
+        - Fallback: TF-IDF similarity
+        
+        **Data Layer:**
+        - Vector database: FAISS / Pinecone
+        - Cache: Redis
+        - Logging: ELK Stack
+        
+        **Monitoring:**
+        - Prometheus + Grafana
+        - Sentry for error tracking
+        - CloudWatch/ELK for logs
+        """)
@@ -0,0 +1,204 @@
+"""📝 NLP Analysis page: Q&A lengths, subword token counts, boilerplate and keyword frequencies"""
+
+import pandas as pd
+import streamlit as st
+
+from chatbot_eda import charts
+from chatbot_eda.tokens import SEQ_LENGTHS, SPECIAL_TOKENS
+
+
+def _tokens_section(ctx, tokens, complete, question_col, answer_col):
+    summaries = {column: tokens.summary(column) for column in tokens.histograms}
+    st.dataframe(pd.DataFrame({
+        'Column': list(summaries),
+        'Mean': [round(summary['mean'], 1) for summary in summaries.values()],
+        **{f'p{q}': [summary[f'p{q}'] for summary in summaries.values()] for q in (50, 90, 95, 99)},
+        'Max': [f"{summary['max']:,}{'+' if summary['capped'] else ''}" for summary in summaries.values()],
+        **{f'% > {length}': [round(summary['truncated'][length] * 100, 2) for summary in summaries.values()]
+           for length in SEQ_LENGTHS},
+    }), use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    for col, column, color, label in ((col1, question_col, '#3498db', 'Questions'),
+                                      (col2, answer_col, '#e74c3c', 'Answers')):
+        with col:
+            summary = summaries[column]
+            st.metric(f"{label} Truncated at 512", f"{summary['truncated'][512] * 100:.1f}%",
+                      help=f"Rows longer than 512 tokens including {SPECIAL_TOKENS} special tokens")
+            if complete:
+                ctx.show_chart(charts.hist_chart, column, hist=charts.histogram_bins(tokens.histograms[column]),
+                               title=f'{label} Token Count ({column})', xlabel='Tokens', color=color,
+                               mean=summary['mean'], mean_label=f"Mean: {summary['mean']:.0f}")
+    
+    if not complete:
+        # Running totals change every chunk; not worth rendering to the chart cache
+        st.caption("Partial counts - updating as chunks are tokenized")
+    st.caption(f"{tokens.tokenizer} token counts from the local vocabulary. A row is truncated at a "
+               f"max_seq_length when its tokens plus {SPECIAL_TOKENS} special tokens exceed it.")
+
+
+def _boilerplate_section(ctx, boilerplate, complete):
+    rows = max(boilerplate.rows, 1)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Rows With Boilerplate", f"{boilerplate.boilerplate_rows / rows * 100:.1f}%")
+    with col2:
+        st.metric("Boilerplate Share of Words", f"{boilerplate.covered_share * 100:.1f}%")
+    with col3:
+        st.metric("Templates Found", len(boilerplate.templates))
+    
+    strip = st.toggle("✂️ Strip boilerplate from the length statistics")
+    hist = boilerplate.stripped_hist if strip else boilerplate.word_hist
+    stripped_words = boilerplate.words - boilerplate.covered_words if strip else boilerplate.words
+    
+    col1, col2, col3 = st.columns(3)
+    for col, label, value, before in (
+            (col1, "Mean Words", stripped_words / rows, boilerplate.words / rows),
+            (col2, "Median Words", hist.quantile(0.5), boilerplate.word_hist.quantile(0.5)),
+            (col3, "p90 Words", hist.quantile(0.9), boilerplate.word_hist.quantile(0.9))):
+        with col:
+            st.metric(label, f"{value:.1f}", delta=f"{value - before:.1f}" if strip else None, delta_color="off")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        templates = boilerplate.templates
+        if templates.empty:
+            st.success(f"✅ No 5-word phrase repeats in 1% of {boilerplate.column} rows")
+        else:
+            st.dataframe(pd.DataFrame({
+                'Template': templates['template'].values,
+                'Words': templates['words'].values,
+                'Rows': templates['rows'].values,
+                '% Rows': (templates['rows'].values / rows * 100).round(2),
+            }), use_container_width=True)
+    
+    with col2:
+        if complete:
+            ctx.show_chart(charts.hist_chart, boilerplate.column, hist=charts.histogram_bins(hist),
+                           title=f"{'Stripped ' if strip else ''}Word Count ({boilerplate.column})", xlabel='Words',
+                           color='#2ecc71' if strip else '#e74c3c', mean=stripped_words / rows,
+                           mean_label=f"Mean: {stripped_words / rows:.0f}")
+        else:
+            # Running totals change every chunk; not worth rendering to the chart cache
+            st.caption("Partial counts - updating as chunks are shingled")
+    
+    st.caption("Templates are runs of 5-word shingles found in at least 1% of rows; row counts are "
+               "Space-Saving upper bounds. Stripping removes every word such a shingle covers.")
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("📝 NLP & Text Analysis")
+    
+    text_cols = snapshot.free_text_columns
+    
+    if len(text_cols) >= 2:
+        col1, col2 = st.columns(2)
+        with col1:
+            question_col = st.selectbox("Question/Query Column:", text_cols)
+        with col2:
+            answer_col = st.selectbox("Answer/Response Column:", text_cols, index=min(1, len(text_cols)-1))
+        
+        q_stats = snapshot.text_stats[question_col]
+        a_stats = snapshot.text_stats[answer_col]
+        
+        st.markdown("---")
+        
+        st.subheader("📊 Q&A Length Comparison")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Avg Q Length", f"{q_stats['char_mean']:.0f}{ctx.ci_text(ctx.text_ci(question_col, 'char_mean'), '.0f')}")
+        with col2:
+            st.metric("Avg A Length", f"{a_stats['char_mean']:.0f}{ctx.ci_text(ctx.text_ci(answer_col, 'char_mean'), '.0f')}")
+        with col3:
+            st.metric("Avg Q Words", f"{q_stats['word_mean']:.1f}{ctx.ci_text(ctx.text_ci(question_col, 'word_mean'), '.1f')}")
+        with col4:
+            st.metric("Avg A Words", f"{a_stats['word_mean']:.1f}{ctx.ci_text(ctx.text_ci(answer_col, 'word_mean'), '.1f')}")
+        
+        st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            ctx.show_chart(charts.box_chart, f'{question_col}/{answer_col}',
+                           boxes=[q_stats['char_box'], a_stats['char_box']], labels=['Questions', 'Answers'],
+                           colors=['#3498db', '#e74c3c'], ylabel='Character Length',
+                           title='Q&A Length Comparison')
+        
+        with col2:
+            ctx.show_chart(charts.box_chart, f'{question_col}/{answer_col}',
+                           boxes=[q_stats['word_box'], a_stats['word_box']], labels=['Questions', 'Answers'],
+                           colors=['#3498db', '#e74c3c'], ylabel='Word Count',
+                           title='Q&A Word Count Comparison')
+        
+        st.markdown("---")
+        
+        st.subheader("🧮 Subword Tokens vs max_seq_length")
+        
+        try:
+            tokens, complete = ctx.token_lengths()
+        except (OSError, ValueError) as error:
+            st.error(f"❌ Could not load the tokenizer vocabulary: {error}")
+        else:
+            if tokens is None and complete:
+                st.info("ℹ️ Set EDA_TOKENIZER_VOCAB to a local tokenizer (a vocab.txt, or vocab.json + "
+                        "merges.txt, or their directory) to count tokens and truncation rates")
+            elif tokens is None:
+                st.info("ℹ️ Token counts will appear here after the first chunk is tokenized")
+            else:
+                _tokens_section(ctx, tokens, complete, question_col, answer_col)
+        
+        st.markdown("---")
+        
+        st.subheader("🧹 Boilerplate Templates")
+        
+        boilerplate_col = st.selectbox("Boilerplate column:", text_cols, index=text_cols.index(answer_col))
+        boilerplate, complete = ctx.boilerplate(boilerplate_col)
+        if boilerplate is None:
+            st.info("ℹ️ Templates will appear here after the first chunk is shingled")
+        else:
+            _boilerplate_section(ctx, boilerplate, complete)
+        
+        st.markdown("---")
+        
+        st.subheader("🔑 Keyword Analysis")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            ngram = st.radio("N-gram size:", [1, 2, 3], horizontal=True,
+                             format_func=lambda n: {1: "Unigrams", 2: "Bigrams", 3: "Trigrams"}[n])
+        with col2:
+            top_n = st.slider("Top-N terms:", 5, 50, 20)
+        
+        col1, col2 = st.columns(2)
+        
+        for col, column, color, label in ((col1, question_col, '#3498db', 'Questions'),
+                                          (col2, answer_col, '#e74c3c', 'Answers')):
+            with col:
+                keywords, complete = ctx.keywords(column)
+                if keywords is None:
+                    st.info(f"ℹ️ {label} terms will appear here after the first chunk is counted")
+                    continue
+                keywords = keywords[ngram].head(top_n)
+                if complete:
+                    ctx.show_chart(charts.barh_chart, column, labels=keywords['term'].tolist(),
+                                   values=keywords['count'].tolist(), colors=color, invert=True,
+                                   xlabel='Frequency', title=f'Top {top_n} {label} Terms ({column})',
+                                   figsize=(10, max(4, top_n * 0.3)))
+                else:
+                    # Running totals change every chunk; not worth rendering to the chart cache
+                    st.caption("Partial counts - updating as chunks are merged")
+                
+                total = keywords.attrs.get('total', 0)
+                table = keywords.rename(columns={'term': 'Term', 'count': 'Count'})
+                table['Share %'] = (table['Count'] / max(total, 1) * 100).round(3)
+                st.dataframe(table, use_container_width=True)
+        
+        st.caption("Stopwords removed (NLTK English list). Counts are merged from per-chunk "
+                   "count-min sketches and never undercount.")
+    else:
+        st.info("ℹ️ Need at least 2 text columns for Q&A analysis")
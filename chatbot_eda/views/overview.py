@@ -0,0 +1,60 @@
+"""📊 Dataset Overview page: columns, types, first rows and memory"""
+
+import pandas as pd
+import streamlit as st
+
+from chatbot_eda import charts
+from chatbot_eda.column_types import KIND_LABELS
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("📊 Dataset Overview")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📋 Column Information")
+        info_data = []
+        for col in snapshot.columns:
+            info_data.append({
+                "Column": col,
+                "Type": snapshot.dtypes[col],
+                "Kind": KIND_LABELS.get(snapshot.column_types.get(col), ""),
+                "Non-Null": snapshot.num_rows - snapshot.nulls[col],
+                "Null": snapshot.nulls[col]
+            })
+        info_df = pd.DataFrame(info_data)
+        st.dataframe(info_df, use_container_width=True)
+    
+    with col2:
+        st.subheader("📈 Data Type Distribution")
+        dtype_counts = pd.Series(snapshot.dtypes).value_counts()
+        ctx.show_chart(charts.pie_chart, values=dtype_counts.values.tolist(),
+                       labels=dtype_counts.index.tolist(), title='Data Type Distribution')
+    
+    st.markdown("---")
+    
+    st.subheader("👀 First Few Rows")
+    st.dataframe(pd.DataFrame(snapshot.head, columns=snapshot.columns), use_container_width=True)
+    
+    st.markdown("---")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Rows", f"{snapshot.num_rows:,}")
+    with col2:
+        st.metric("Total Columns", snapshot.num_columns)
+    with col3:
+        if ctx.compact_mode:
+            report = ctx.memory_report()
+            compact_mb = report['After (MB)'].iloc[-1]
+            st.metric("Memory Usage", f"{compact_mb:.2f} MB",
+                      delta=f"{compact_mb - snapshot.total_memory_mb:.2f} MB", delta_color="inverse")
+        else:
+            st.metric("Memory Usage", f"{snapshot.total_memory_mb:.2f} MB")
+    
+    if ctx.compact_mode:
+        st.markdown("---")
+        st.subheader("🗜️ Memory Before / After Compact Mode")
+        st.dataframe(report, use_container_width=True)
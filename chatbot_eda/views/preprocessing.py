@@ -0,0 +1,147 @@
+"""🔧 Preprocessing Guide page (static): the guide, the pipeline command and its last manifest"""
+
+import json
+import os
+
+import streamlit as st
+
+# Same as chatbot_eda.preprocessing's defaults; that module imports pandas
+OUTPUT_DIR = 'preprocessed'
+MANIFEST_FILE = 'manifest.json'
+PIPELINE_COMMAND = "python preprocess.py ai-medical-chatbot.csv --output-dir preprocessed"
+
+
+def _read_manifest():
+    try:
+        with open(os.path.join(OUTPUT_DIR, MANIFEST_FILE), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _pipeline_section():
+    st.subheader("▶️ Run the Pipeline")
+    st.markdown("Phases 1 and 2 below run as a streaming pipeline: chunks of the export go through "
+                "`drop_missing → drop_duplicates → strip_html → lowercase → strip_special → tokenize` "
+                "on a process pool and are written as cleaned Parquet shards.")
+    st.code(PIPELINE_COMMAND, language="bash")
+    
+    manifest = _read_manifest()
+    if manifest is None:
+        st.info(f"ℹ️ No pipeline output in `{OUTPUT_DIR}/` yet - run the command above")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Rows In", f"{manifest['rows_in']:,}")
+    with col2:
+        st.metric("Rows Out", f"{manifest['rows_out']:,}", f"-{manifest['rows_in'] - manifest['rows_out']:,}",
+                  delta_color="off")
+    with col3:
+        st.metric("Shards", len(manifest['shards']))
+    with col4:
+        st.metric("Wall Time", f"{manifest['wall_seconds']:.1f}s", help=f"{manifest['workers']} workers")
+    
+    st.dataframe([{
+        'Stage': entry['stage'],
+        'Rows In': entry['rows_in'],
+        'Dropped': entry['dropped'],
+        'Seconds': entry['seconds'],
+        'Rows/s': entry['rows_per_second'],
+    } for entry in manifest['stage_stats']], use_container_width=True)
+    st.caption(f"Dataset version {manifest['version']}, run {manifest['created']}. Seconds are summed "
+               f"over workers, so rows/s is the throughput of one worker.")
+
+
+def render(ctx):
+    st.title("🔧 Data Preprocessing Guide")
+    
+    _pipeline_section()
+    
+    st.markdown("---")
+    
+    st.markdown("""
+    ## Step-by-Step Preprocessing Pipeline
+    
+    ### Phase 1: Data Cleaning
+    
+    **1.1 Handle Missing Values**
+    - Review missing value patterns
+    - Apply appropriate imputation strategy
+    - Drop or fill based on data type
+    
+    **1.2 Remove Duplicates**
+    ```python
+    df.drop_duplicates(inplace=True)
+    ```
+    
+    **1.3 Text Normalization**
+    - Convert to lowercase
+    - Remove extra whitespace
+    - Remove special characters
+    
+    ### Phase 2: Text Processing
+    
+    **2.1 Tokenization**
+    - Break text into tokens
+    - Use NLTK or spaCy
+    
+    **2.2 Stopword Removal**
+    - Remove common words
+    - Keep medical domain terms
+    
+    **2.3 Lemmatization**
+    - Reduce words to base form
+    - Improve vocabulary consistency
+    
+    ### Phase 3: Feature Engineering
+    
+    **3.1 Text Vectorization**
+    - TF-IDF: Weighted term frequency
+    - Word2Vec: Dense embeddings
+    - BERT: Contextual embeddings
+    
+    **3.2 Feature Creation**
+    - Text length features
+    - Word count features
+    - Category encoding
+    
+    ### Phase 4: Train/Test Split
+    
+    **4.1 Data Splitting**
+    ```python
+    from sklearn.model_selection import train_test_split
+    train_data, test_data = train_test_split(
+        df, test_size=0.2, random_state=42
+    )
+    ```
+    
+    **4.2 Stratified Sampling**
+    - Maintain class distribution
+    - Use for imbalanced data
+    
+    ### Code Example
+    
+    ```python
+    import pandas as pd
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    
+    # Load data
+    df = pd.read_csv('ai-medical-chatbot.csv')
+    
+    # Remove duplicates
+    df = df.drop_duplicates()
+    
+    # Handle missing values
+    df = df.dropna()
+    
+    # Split data
+    train, test = train_test_split(df, test_size=0.2, random_state=42)
+    
+    # Normalize numeric features
+    scaler = StandardScaler()
+    train_scaled = scaler.fit_transform(train)
+    ```
+    """)
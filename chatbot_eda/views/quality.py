@@ -0,0 +1,113 @@
+"""🔍 Data Quality page: missing values, duplicates and duplicate clusters"""
+
+import pandas as pd
+import streamlit as st
+
+from chatbot_eda import charts
+from chatbot_eda.duplicates import DEFAULT_THRESHOLD, clusters_frame
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("🔍 Data Quality Assessment")
+    
+    col1, col2 = st.columns(2)
+    
+    # Missing Values
+    with col1:
+        st.subheader("❌ Missing Values")
+        missing_data = pd.Series(snapshot.nulls)
+        missing_pct = (missing_data / snapshot.num_rows) * 100
+        missing_summary = pd.DataFrame({
+            'Column': missing_data.index,
+            'Missing Count': missing_data.values,
+            'Missing %': missing_pct.values
+        })
+        st.dataframe(missing_summary[missing_summary['Missing Count'] > 0], use_container_width=True)
+        
+        if missing_data.sum() == 0:
+            st.success("✅ No missing values detected!")
+    
+    # Duplicates
+    with col2:
+        st.subheader("🔄 Duplicate Records")
+        duplicate_count = snapshot.duplicate_rows
+        duplicate_pct = snapshot.duplicate_pct
+        st.metric("Duplicate Records", f"{duplicate_count:,} ({duplicate_pct:.2f}%{ctx.ci_text(ctx.pct_ci('duplicate_pct'), '.2f')})")
+        if duplicate_count == 0:
+            st.success("✅ No duplicate records found!")
+        else:
+            st.warning(f"⚠️ {duplicate_count:,} duplicate records detected")
+    
+    st.markdown("---")
+    
+    # Missing values visualization
+    if missing_data.sum() > 0:
+        st.subheader("📊 Missing Values by Column")
+        colors = ['#27ae60' if x == 0 else '#f39c12' if x < 5 else '#e74c3c' for x in missing_pct]
+        ctx.show_chart(charts.barh_chart, labels=missing_data.index.tolist(),
+                       values=missing_data.values.tolist(), colors=colors,
+                       xlabel='Count of Missing Values', title='Missing Values Distribution',
+                       figsize=(12, 6))
+    
+    st.markdown("---")
+    
+    st.subheader("📈 Data Quality Score")
+    missing_pct_total = snapshot.missing_pct
+    completeness = 100 - missing_pct_total
+    uniqueness = 100 - (duplicate_pct if duplicate_count > 0 else 0)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Data Completeness", f"{completeness:.2f}%{ctx.ci_text(ctx.pct_ci('missing_pct'), '.2f')}")
+    with col2:
+        st.metric("Uniqueness Score", f"{uniqueness:.2f}%{ctx.ci_text(ctx.pct_ci('duplicate_pct'), '.2f')}")
+    with col3:
+        overall_quality = (completeness + uniqueness) / 2
+        st.metric("Overall Quality", f"{overall_quality:.2f}%")
+    
+    st.markdown("---")
+    
+    # Duplicate clusters (exact hashes + MinHash/LSH near-duplicates)
+    st.subheader("🧬 Duplicate Clusters")
+    
+    if snapshot.free_text_columns:
+        col1, col2 = st.columns(2)
+        with col1:
+            dup_col = st.selectbox("Text column:", snapshot.free_text_columns,
+                                   index=len(snapshot.free_text_columns) - 1)
+        with col2:
+            threshold = st.slider("Near-duplicate Jaccard threshold:", 0.5, 1.0, DEFAULT_THRESHOLD, 0.05)
+        
+        # Exact clusters show up first; near-duplicates follow when MinHash/LSH finishes
+        report, complete = ctx.duplicate_report(dup_col, threshold)
+        texts = ctx.text_column(dup_col)
+        
+        if report is None:
+            st.info("ℹ️ Duplicate clusters will appear here as soon as they are found")
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Exact Clusters", f"{len(report.exact):,}")
+            with col2:
+                st.metric("Exact Duplicate Rows", f"{report.exact_duplicate_rows:,}")
+            with col3:
+                st.metric("Near-Duplicate Clusters", f"{len(report.near):,}" if complete else "…")
+            with col4:
+                st.metric("Near-Duplicate Rows", f"{report.near_duplicate_rows:,}" if complete else "…")
+            
+            tab1, tab2 = st.tabs(["Near-Duplicates", "Exact Duplicates"])
+            for tab, kind, clusters in ((tab1, "near", report.near), (tab2, "exact", report.exact)):
+                with tab:
+                    if kind == "near" and not complete:
+                        st.info("⏳ Near-duplicate clusters are still being computed")
+                        continue
+                    if not clusters:
+                        st.success("✅ No clusters found!")
+                        continue
+                    st.dataframe(clusters_frame(clusters, texts), use_container_width=True)
+                    number = st.number_input("Show members of cluster:", 1, min(len(clusters), 50), 1,
+                                             key=f"{kind}_members")
+                    cluster = clusters[number - 1]
+                    rows = getattr(cluster, 'rows', cluster)
+                    st.dataframe(texts.iloc[rows[:20]].to_frame(), use_container_width=True)
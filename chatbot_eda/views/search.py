@@ -0,0 +1,99 @@
+"""🔎 Q&A Search page: BM25 / TF-IDF / dense retrieval over patient questions"""
+
+import streamlit as st
+
+from chatbot_eda.retrieval import METHODS
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("🔎 Q&A Search")
+    
+    text_cols = snapshot.free_text_columns
+    
+    if len(text_cols) >= 2:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            question_col = st.selectbox("Question Column:", text_cols,
+                                        index=text_cols.index('Patient') if 'Patient' in text_cols else 0)
+        with col2:
+            answer_col = st.selectbox("Answer Column:", text_cols,
+                                      index=text_cols.index('Doctor') if 'Doctor' in text_cols else min(1, len(text_cols)-1))
+        with col3:
+            method = st.radio("Scoring:", METHODS + ('dense',), format_func=str.upper, horizontal=True)
+        with col4:
+            top_k = st.slider("Top-k results:", 1, 20, 5)
+        
+        if method == 'dense':
+            index, tradeoff = ctx.vector_index(question_col)
+            col1, col2 = st.columns(2)
+            with col1:
+                nprobe = st.select_slider("IVF cells probed (nprobe):", tradeoff['nprobe'].tolist(),
+                                          value=tradeoff['nprobe'].iloc[min(2, len(tradeoff)-1)])
+            with col2:
+                exact_search = st.checkbox("Exact (brute-force) search", value=False)
+            point = tradeoff.set_index('nprobe').loc[nprobe]
+            
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("Indexed Questions", f"{index.num_docs:,}")
+            with col2:
+                st.metric("Dimensions", f"{index.meta['dim']} ({index.meta['dtype']})")
+            with col3:
+                st.metric("Build Time", f"{index.meta.get('build_seconds', 0):.2f} s")
+            with col4:
+                st.metric("IVF p50 Latency", f"{point['ivf_p50_ms']:.1f} ms",
+                          delta=f"exact {point['exact_p50_ms']:.1f} ms", delta_color="off")
+            with col5:
+                st.metric("Recall@10", f"{point['recall']:.1%}")
+            
+            with st.expander("📈 Recall / latency trade-off"):
+                st.dataframe(tradeoff.rename(columns={
+                    'recall': 'Recall@10', 'exact_p50_ms': 'Exact p50 (ms)',
+                    'ivf_p50_ms': 'IVF p50 (ms)', 'queries': 'Queries'}),
+                    use_container_width=True)
+                st.caption(f"{index.ivf.nlist} IVF cells · embedder: {index.embedder.name} · "
+                           f"recall measured against exact search over sampled questions")
+        else:
+            index, latency = ctx.search_index(question_col)
+            
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("Indexed Questions", f"{index.num_docs:,}")
+            with col2:
+                st.metric("Vocabulary", f"{len(index.vocabulary):,}")
+            with col3:
+                st.metric("Build Time", f"{index.meta.get('build_seconds', 0):.2f} s")
+            with col4:
+                st.metric("p50 Latency", f"{latency[method]['p50_ms']:.1f} ms")
+            with col5:
+                st.metric("p99 Latency", f"{latency[method]['p99_ms']:.1f} ms")
+            st.caption(f"Latency measured over {latency[method]['queries']} sampled questions from the corpus")
+        
+        st.markdown("---")
+        
+        query = st.text_input("🧑 Patient question:", placeholder="e.g. I have a headache and fever since two days")
+        
+        if query:
+            with ctx.trace.phase('compute', f'search_{method}') as timing:
+                if method == 'dense':
+                    result = index.search(query, top_k, approximate=not exact_search, nprobe=nprobe)
+                else:
+                    result = index.search(query, top_k, method)
+            elapsed_ms = timing.wall_ms
+            st.caption(f"{len(result.doc_ids)} matches in {elapsed_ms:.1f} ms")
+            
+            if len(result.doc_ids) == 0:
+                st.info("ℹ️ No matching questions found")
+            
+            questions = ctx.text_column(question_col)
+            answers = ctx.text_column(answer_col)
+            for rank, (doc, score) in enumerate(zip(result.doc_ids, result.scores), start=1):
+                question = str(questions.iloc[doc])
+                with st.expander(f"#{rank} · score {score:.2f} · {question[:90]}", expanded=rank == 1):
+                    st.markdown("**🧑 Patient:**")
+                    st.write(question)
+                    st.markdown("**👨‍⚕️ Doctor:**")
+                    st.write(str(answers.iloc[doc]))
+    else:
+        st.info("ℹ️ Need at least 2 text columns for Q&A search")
@@ -0,0 +1,67 @@
+"""📈 Statistical Analysis page: numeric and text column distributions"""
+
+import pandas as pd
+import streamlit as st
+
+from chatbot_eda import charts
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    st.title("📈 Statistical Analysis")
+    
+    # Numeric columns analysis
+    numeric_cols = snapshot.numeric_columns
+    
+    if numeric_cols:
+        st.subheader("📊 Numeric Columns Statistics")
+        stats_df = pd.DataFrame({col: snapshot.numeric_stats[col]['describe'] for col in numeric_cols}).T
+        st.dataframe(stats_df, use_container_width=True)
+        rank_error = max(snapshot.numeric_stats[col].get('rank_error', 0.0) for col in numeric_cols)
+        if rank_error:
+            st.caption(f"≈ Quartiles and distributions of large columns come from KLL sketches "
+                       f"(rank error ±{rank_error * 100:.1f}% at 99% confidence)")
+        
+        st.markdown("---")
+        
+        # Distribution plots
+        st.subheader("📉 Distribution Plots")
+        for col in numeric_cols[:4]:  # Limit to first 4 numeric columns
+            ctx.show_chart(charts.hist_chart, col, hist=snapshot.numeric_stats[col]['hist'],
+                           xlabel=col, title=f'Distribution of {col}', figsize=(10, 4))
+    else:
+        st.info("ℹ️ No numeric columns found in dataset")
+    
+    # Text column statistics
+    st.markdown("---")
+    st.subheader("📝 Text Column Statistics")
+    
+    text_cols = snapshot.free_text_columns
+    
+    if text_cols:
+        selected_col = st.selectbox("Select a text column:", text_cols)
+        
+        stats = snapshot.text_stats[selected_col]
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Mean Length (chars)", f"{stats['char_mean']:.0f}{ctx.ci_text(ctx.text_ci(selected_col, 'char_mean'), '.0f')}")
+        with col2:
+            st.metric("Median Length (chars)", f"{stats['char_median']:.0f}")
+        with col3:
+            st.metric("Mean Words", f"{stats['word_mean']:.1f}{ctx.ci_text(ctx.text_ci(selected_col, 'word_mean'), '.1f')}")
+        with col4:
+            st.metric("Max Length", f"{stats['char_max']}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            ctx.show_chart(charts.hist_chart, selected_col, hist=stats['char_hist'],
+                           mean=stats['char_mean'], mean_label=f"Mean: {stats['char_mean']:.0f}",
+                           xlabel='Character Length', title=f'Length Distribution - {selected_col}')
+        
+        with col2:
+            ctx.show_chart(charts.hist_chart, selected_col, hist=stats['word_hist'], color='#e74c3c',
+                           mean=stats['word_mean'], mean_label=f"Mean: {stats['word_mean']:.1f}",
+                           mean_color='blue', xlabel='Word Count',
+                           title=f'Word Count Distribution - {selected_col}')
@@ -0,0 +1,64 @@
+"""
+AI Medical Chatbot - Headless EDA Report
+
+Runs the dashboard's analyses without a browser or notebook kernel and
+writes a machine-readable JSON profile plus a static HTML report.
+Independent sections run in parallel, one process per core by default.
+Wall-clock time and peak memory are logged, so the report can run
+nightly on new chat exports:
+
+    python generate_report.py ai-medical-chatbot.csv --output-dir reports
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import time
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE
+from chatbot_eda.duplicates import DEFAULT_THRESHOLD
+from chatbot_eda.report import REPORT_TOP_N, build_report, render_html
+
+log = logging.getLogger('generate_report')
+
+
+def write_report(report, output_dir):
+    """Write ``eda_report-<version>.json`` and ``.html``; returns both paths"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = output_dir / f"eda_report-{report['version']}"
+    json_path, html_path = stem.with_suffix('.json'), stem.with_suffix('.html')
+    with open(json_path, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2, default=str)
+    with open(html_path, 'w', encoding='utf-8') as fh:
+        fh.write(render_html(report))
+    return json_path, html_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the AI Medical Chatbot EDA report")
+    parser.add_argument('path', nargs='?', default=DATA_FILE, help="chat export CSV")
+    parser.add_argument('--output-dir', default='reports')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="parallel sections (default: one per CPU)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="near-duplicate Jaccard threshold")
+    parser.add_argument('--top-n', type=int, default=REPORT_TOP_N, help="keywords per n-gram size")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    start = time.perf_counter()
+    report = build_report(args.path, args.cache_dir, args.workers, args.threshold, args.top_n,
+                          log=lambda name, seconds: log.info("section %s done in %.2fs", name, seconds))
+    json_path, html_path = write_report(report, args.output_dir)
+
+    run = report['run']
+    peaks = [mb for mb in (run['peak_rss_mb'], run['children_peak_rss_mb']) if mb is not None]
+    log.info("report written: %s, %s", json_path, html_path)
+    log.info("wall time %.2fs on %d workers; peak RSS %s", time.perf_counter() - start, run['workers'],
+             f"{max(peaks):.1f} MB" if peaks else "unavailable")
+
+
+if __name__ == "__main__":
+    main()
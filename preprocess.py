@@ -0,0 +1,48 @@
+"""
+AI Medical Chatbot - Preprocessing Pipeline
+
+Runs the Preprocessing Guide's cleaning steps over the chat export in
+streaming chunks on a process pool and writes cleaned, sharded Parquet
+plus a manifest with per-stage drop counts and throughput. Reruns on an
+unchanged export are skipped (``--force`` to rebuild):
+
+    python preprocess.py ai-medical-chatbot.csv --output-dir preprocessed
+    python preprocess.py --stages drop_missing drop_duplicates lowercase
+"""
+
+import argparse
+import logging
+
+from chatbot_eda.data_cache import CACHE_DIR, DATA_FILE
+from chatbot_eda.preprocessing import DEFAULT_STAGES, OUTPUT_DIR, PREPROCESS_CHUNK_ROWS, STAGES, run_pipeline
+
+log = logging.getLogger('preprocess')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocess the AI Medical Chatbot export into Parquet shards")
+    parser.add_argument('path', nargs='?', default=DATA_FILE, help="chat export CSV")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(DEFAULT_STAGES),
+                        help="stages to run, in order (default: all)")
+    parser.add_argument('--columns', nargs='+', default=None, help="text columns to clean (default: all)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-rows', type=int, default=PREPROCESS_CHUNK_ROWS)
+    parser.add_argument('--force', action='store_true', help="rerun even if the output is up to date")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    manifest = run_pipeline(args.path, args.output_dir, args.stages, args.columns, args.workers,
+                            args.cache_dir, args.chunk_rows, args.force,
+                            progress=lambda fraction, message, _: log.info("%s (%.0f%%)", message, fraction * 100))
+
+    for entry in manifest['stage_stats']:
+        log.info("stage %-16s %9d in %9d dropped %12s rows/s", entry['stage'], entry['rows_in'],
+                 entry['dropped'], f"{entry['rows_per_second']:,}" if entry['rows_per_second'] else "-")
+    log.info("%d of %d rows written to %d shards in %s (%.2fs, %s)", manifest['rows_out'], manifest['rows_in'],
+             len(manifest['shards']), args.output_dir, manifest['wall_seconds'], manifest['created'])
+
+
+if __name__ == "__main__":
+    main()
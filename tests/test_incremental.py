@@ -0,0 +1,64 @@
+"""Incremental profiling at the end of the export: unterminated and multi-line last records"""
+
+import pandas as pd
+
+from chatbot_eda.incremental import update_profile_state
+from chatbot_eda.snapshot import build_snapshot
+
+
+def _export(tmp_path, rows, last_answer='Take rest', newline=True):
+    frame = pd.DataFrame({
+        'Patient': [f'question {i}' for i in range(rows)],
+        'Doctor': [f'answer {i}' for i in range(rows - 1)] + [last_answer],
+        'Age': range(rows),
+    })
+    path = tmp_path / 'export.csv'
+    text = frame.to_csv(index=False, lineterminator='\n')
+    path.write_text(text if newline else text.rstrip('\n'), encoding='utf-8')
+    return path
+
+
+def _append(path, text):
+    with open(path, 'a', encoding='utf-8', newline='') as fh:
+        fh.write(text)
+
+
+def test_last_row_without_newline_is_counted(tmp_path):
+    path = _export(tmp_path, 300, newline=False)
+    cache_dir = tmp_path / 'cache'
+
+    state = update_profile_state(path, cache_dir, chunksize=64)
+    assert state.rows == 300
+    assert state.rows == build_snapshot(path, cache_dir, chunksize=64).num_rows
+    # Counted again, not dropped, when nothing was appended
+    assert update_profile_state(path, cache_dir, chunksize=64).rows == 300
+
+    # The unterminated record is reread together with the appended rows
+    _append(path, '\nquestion 300,answer 300,300\n')
+    state = update_profile_state(path, cache_dir, chunksize=64)
+    assert state.mode == 'append'
+    assert state.rows == 301
+    assert state.profile.columns['Age'].values.count == 301
+
+
+def test_multiline_quoted_last_record(tmp_path):
+    answer = 'Hi, thanks for your query.\nTake rest.\n"Regards"'
+    path = _export(tmp_path, 300, last_answer=answer, newline=False)
+    cache_dir = tmp_path / 'cache'
+
+    state = update_profile_state(path, cache_dir, chunksize=64)
+    assert state.rows == 300
+    assert state.profile.columns['Doctor'].nulls == 0
+    assert state.profile.columns['Age'].values.max == 299
+
+    _append(path, '\nquestion 300,"line one\nline two",300\n')
+    state = update_profile_state(path, cache_dir, chunksize=64)
+    assert state.mode == 'append'
+    assert state.rows == 301
+    assert state.duplicate_rows == 0
+    assert state.profile.columns['Age'].values.max == 300
+
+    full = update_profile_state(path, tmp_path / 'fresh', chunksize=64)
+    assert full.mode == 'full'
+    assert full.rows == 301
+    assert (full.hashes == state.hashes).all()